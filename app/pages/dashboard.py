@@ -1,14 +1,16 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import sqlite3
 from datetime import datetime, timedelta
 
+from src.db_manager import get_connection
+from app.ui_components.stored_job_search import render_stored_job_search
+
 # --------------------------------------------------
 # DB Helper
 # --------------------------------------------------
 def load_feedback_data(db_path="data/career_agent.db"):
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     df = pd.read_sql_query("""
         SELECT f.timestamp, f.feedback_value, f.match_score,
                f.comment, j.title, j.company, j.location
@@ -16,7 +18,6 @@ def load_feedback_data(db_path="data/career_agent.db"):
         LEFT JOIN jobs j ON f.job_id = j.id
         ORDER BY f.timestamp DESC
     """, conn)
-    conn.close()
     return df
 
 
@@ -27,6 +28,8 @@ def render():
     st.title("📊 Dashboard – Lernstatus & Feedbackanalyse")
     st.caption("Überblick über deine bisherigen Bewertungen, Scores und den Lernverlauf.")
 
+    render_stored_job_search("data/career_agent.db", key="dashboard_job_search")
+
     df = load_feedback_data()
     if df.empty:
         st.info("Noch keine Feedbackdaten vorhanden.")
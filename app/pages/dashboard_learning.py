@@ -1,14 +1,15 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
 
+from src.db_manager import get_connection
+
 # --------------------------------------------------
 # Daten laden
 # --------------------------------------------------
 def load_learning_data(db_path="data/career_agent.db"):
-    conn = sqlite3.connect(db_path)
+    conn = get_connection(db_path)
     df = pd.read_sql_query("""
         SELECT 
             f.id AS feedback_id,
@@ -27,7 +28,6 @@ def load_learning_data(db_path="data/career_agent.db"):
         LEFT JOIN jobs j ON f.job_id = j.id
         ORDER BY f.timestamp DESC
     """, conn)
-    conn.close()
 
     # NaN-Werte ersetzen
     for col in ["base_score", "feedback_score", "match_score"]:
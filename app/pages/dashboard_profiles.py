@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
 from pathlib import Path
 import plotly.express as px
 
+from src.db_manager import get_connection
+from app.ui_components.stored_job_search import render_stored_job_search
+
 DB_PATH = Path(__file__).resolve().parents[2] / "data" / "career_agent.db"
 
 # --------------------------------------------------
 # Daten laden
 # --------------------------------------------------
 def load_profile_feedback():
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(DB_PATH)
     query = """
         SELECT 
             p.id AS profile_id,
@@ -28,7 +30,6 @@ def load_profile_feedback():
         ORDER BY f.timestamp DESC
     """
     df = pd.read_sql_query(query, conn)
-    conn.close()
     return df
 
 
@@ -56,6 +57,8 @@ def render():
     st.title("👤 Profil-Übersicht & Job-Portfolio")
     st.caption("Vergleicht deine Profile nach Erfolg, Bewertung und Lernstatus.")
 
+    render_stored_job_search(DB_PATH, key="profiles_job_search")
+
     df = load_profile_feedback()
     if df.empty:
         st.info("Noch keine Feedbackdaten vorhanden.")
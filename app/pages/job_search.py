@@ -1,5 +1,5 @@
 import streamlit as st
-import sqlite3, json, os, sys
+import json, os, sys
 from datetime import datetime
 from pathlib import Path
 
@@ -13,17 +13,23 @@ if str(ROOT_DIR) not in sys.path:
 # --------------------------------------------------
 # Imports aus src
 # --------------------------------------------------
-from src.ba_source import BAJobSource
+from src.job_aggregator import get_aggregator
 from src.ba_classification import BAClassification
+from src.config import query_terms
 from src.db_manager import (
     save_feedback,
     ensure_job_exists,
-    migrate_schema,
+    get_connection,
     load_feedback_for_profile,
+    load_job_profile_scores,
+    load_latest_run_results,
 )
-from src.research_agent import compute_basescore
-from src.learning_engine import store_feedback, predict_fit_score
-from app.ui_components.job_cards import render_job_card
+from src.scoring import apply_scores
+from src.research_agent import build_scoring_profile, map_job_fields
+from src.learning_engine import store_feedback, predict_fit_scores
+from src.near_dupes import dedupe_near_duplicates
+from src.detail_prefetch import DEFAULT_TOP_N, get_detail_prefetcher
+from app.ui_components.job_cards import fill_pending_details, render_job_card
 
 
 # --------------------------------------------------
@@ -33,12 +39,9 @@ def load_active_user_profile(db_path=None):
     """Lädt aktives Benutzerprofil aus SQLite."""
     if db_path is None:
         db_path = os.path.abspath(os.path.join(ROOT_DIR, "data", "career_agent.db"))
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    cur = get_connection(db_path).cursor()
     cur.execute("SELECT * FROM user_profile WHERE is_active = 1;")
     row = cur.fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
@@ -46,29 +49,9 @@ def load_profiles_for_user(db_path=None):
     """Lädt alle gespeicherten Berufsprofile."""
     if db_path is None:
         db_path = os.path.abspath(os.path.join(ROOT_DIR, "data", "career_agent.db"))
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    cur = get_connection(db_path).cursor()
     cur.execute("SELECT * FROM profiles;")
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
-
-
-def _map_job_fields(job: dict) -> dict:
-    job["title"] = job.get("titel", job.get("title", "")) or ""
-    job["company"] = job.get("arbeitgeber", job.get("company", "")) or ""
-    job["location"] = job.get("ort", job.get("location", "")) or ""
-    return job
-
-
-def _build_profile_for_scoring(selected_profile: dict, all_terms: list, region_from_user_profile: str) -> dict:
-    """Bereitet Profiltext für Scoring vor."""
-    p = dict(selected_profile)
-    p["skills"] = selected_profile.get("skills") or ", ".join(all_terms)
-    p["summary"] = selected_profile.get("description_text", "") or selected_profile.get("name", "")
-    p["region"] = region_from_user_profile or selected_profile.get("region", "")
-    return p
+    return [dict(r) for r in cur.fetchall()]
 
 
 def _persist_feedback_and_job(ba, job, profile, refnr, fit_score, feedback_value, comment=None):
@@ -112,6 +95,57 @@ def _persist_feedback_and_job(ba, job, profile, refnr, fit_score, feedback_value
     return ok
 
 
+def _render_results(jobs, selected_profile, ba):
+    """Jobkarten inkl. vorhandenem Feedback und Speichern-Callback."""
+    # Lade vorhandenes Feedback
+    feedback_entries = load_feedback_for_profile(selected_profile["id"])
+    feedback_by_job = {f["job_id"]: f for f in feedback_entries}
+
+    # Details der obersten Karten parallel vorladen (geteilter Speicher, überlebt Reruns)
+    details_store = get_detail_prefetcher(ba)
+    details_store.prefetch(j.get("refnr") for j in jobs[:DEFAULT_TOP_N])
+    pending = []
+
+    # Anzeige pro Job
+    for job in jobs:
+        # Callback für Speichern
+        def on_save(job_obj, feedback_value, comment):
+            ok = _persist_feedback_and_job(
+                ba,
+                job_obj,
+                selected_profile,
+                job_obj.get("refnr"),
+                job_obj.get("fit_score", 0),
+                feedback_value,
+                comment
+            )
+            if ok:
+                st.success(f"✅ Feedback gespeichert für {job_obj.get('titel','(ohne Titel)')}")
+
+        # Bestehendes Feedback prüfen
+        existing = None
+        f = feedback_by_job.get(job.get("id"))
+        if f:
+            existing = {
+                "value": f.get("feedback_value"),
+                "comment": f.get("comment"),
+                "timestamp": f.get("timestamp")
+            }
+
+        # Jobkarte rendern
+        pending.append(render_job_card(
+            job=job,
+            profile=selected_profile,
+            ba=ba,
+            existing_feedback=existing,
+            on_save=on_save,
+            details_store=details_store,
+        ))
+
+    # Platzhalter füllen, sobald die jeweiligen Details eintreffen
+    fill_pending_details(pending, details_store)
+
+
 # --------------------------------------------------
 # Hauptfunktion: render()
 # --------------------------------------------------
@@ -120,9 +154,6 @@ def render():
     st.title("🔍 Job- & Karriere-Suche")
     st.caption("Suche passende Stellen über die Bundesagentur für Arbeit und gib direkt Feedback.")
 
-    # DB-Schema prüfen
-    migrate_schema()
-
     profiles = load_profiles_for_user()
     if not profiles:
         st.error("❌ Keine Profile gefunden.")
@@ -136,6 +167,16 @@ def render():
         st.warning("Kein gültiges Profil ausgewählt.")
         st.stop()
 
+    # Vorberechnete BaseScores (compute_basescore.py --all-profiles): Profilwechsel = Lookup
+    stored_scores = load_job_profile_scores(selected_profile["id"], limit=10)
+    if stored_scores:
+        with st.expander(f"📦 Gespeicherte Top-Jobs für dieses Profil ({len(stored_scores)})"):
+            for row in stored_scores:
+                st.caption(
+                    f"{row['base_score']:.2f} · {row['title'] or '(ohne Titel)'} – "
+                    f"{row['company'] or '–'}, {row['location'] or '–'} · {row['why_base'] or ''}"
+                )
+
     # Benutzerprofil laden (Region etc.)
     user_profile = load_active_user_profile()
     region = (user_profile.get("region") or "").strip()
@@ -150,6 +191,21 @@ def render():
     if st.button("🚀 Jobsuche starten"):
         st.session_state["search_started"] = True
 
+    # --------------------------------------------------
+    # Ergebnisse der Hintergrundsuche (src/discovery_daemon.py)
+    # --------------------------------------------------
+    if not st.session_state.get("search_started"):
+        run, ready_jobs = load_latest_run_results(selected_profile["id"])
+        if run:
+            st.subheader("⚡ Ergebnisse der Hintergrundsuche")
+            partial = " · ⚠️ Teilergebnis" if run["status"] == "partial" else ""
+            st.caption(f"Stand: {run['finished_at']} · {len(ready_jobs)} Stellen{partial} · "
+                       f"„Jobsuche starten“ fragt live bei der BA nach.")
+            for job in ready_jobs:
+                # Feldnamen wie bei BA-Treffern, damit die Jobkarte sie anzeigen kann
+                job.update(id=job["job_id"], titel=job["title"], arbeitgeber=job["company"], ort=job["location"])
+            _render_results(ready_jobs, selected_profile, get_aggregator())
+
     # --------------------------------------------------
     # Suche starten
     # --------------------------------------------------
@@ -161,42 +217,50 @@ def render():
         st.markdown(f"## 👤 {profile_title}")
         st.caption(desc)
 
-        # Query-Erweiterung
-        title_map = {
-            "KI-Enablement Manager": ["Datenanalyst", "Projektleiter KI", "Data Scientist"],
-            "Office & CRM Coordinator": ["Bürokaufmann", "Verwaltung", "Sachbearbeiter"],
-            "Marketing Operations & Content Manager": ["Marketing Manager", "Online-Marketing", "Kommunikation"]
-        }
-        query_list = title_map.get(profile_title, [profile_title])
-
-        classifier = BAClassification()
-        expanded_terms = []
-        for q in query_list:
-            similar = classifier.classify_term(q)
-            expanded_terms.extend([s["bezeichnung"] for s in similar if s.get("bezeichnung")])
-        all_terms = list({*query_list, *expanded_terms})
+        # Query-Erweiterung (Klassifikation kommt aus dem persistenten Cache,
+        # vorwärmen mit `python -m src.ba_classification`)
+        query_list = query_terms(profile_title)
+        all_terms = BAClassification().expand_terms(query_list)
 
         st.write(f"🔎 Suchbegriffe: {', '.join(all_terms)}")
         st.write(f"📍 Region: {region or '–'} | 🔁 Radius: {radius} km")
 
-        # Jobs abrufen
-        ba = BAJobSource()
-        profile_for_scoring = _build_profile_for_scoring(selected_profile, all_terms, region)
+        # Jobs abrufen (alle registrierten Quellen, JOB_AGENT_SOURCES; BA zuerst)
+        ba = get_aggregator()
+        profile_for_scoring = build_scoring_profile(selected_profile, all_terms, region)
         jobs_collected = []
 
-        for term in all_terms:
-            jobs_found = ba.search(term, region or "Deutschland", radius, size=10)
-            for job in jobs_found:
-                _map_job_fields(job)
-                base_score, why = compute_basescore(job, profile_for_scoring)
-                fit_score = predict_fit_score(job, base_score)
-                job["base_score"] = base_score
-                job["fit_score"] = fit_score
-                job["why_base"] = why
-            jobs_collected.extend(jobs_found)
-
-        unique_jobs = {job["refnr"]: job for job in jobs_collected}.values()
-        unique_jobs = sorted(unique_jobs, key=lambda j: j.get("fit_score", 0), reverse=True)
+        # Alle Suchbegriffe parallel abfragen (begrenzte Parallelität)
+        queries = [(term, region or "Deutschland", radius) for term in all_terms]
+        jobs_found, search_report = ba.search_many(queries, size=10, max_workers=6)
+
+        # Dubletten über Begriffe/Quellen hinweg vor Scoring + Embedding entfernen
+        jobs_found, n_duplicates = dedupe_near_duplicates(jobs_found)
+
+        # BaseScore für alle Jobs in einem Durchlauf (Profil wird nur einmal vorbereitet)
+        for job in jobs_found:
+            map_job_fields(job)
+        apply_scores(jobs_found, profile_for_scoring, preset="research")
+
+        # Fit-Scores für alle Jobs in einem Batch (ein encode-Aufruf)
+        fit_scores = predict_fit_scores(jobs_found, [j["base_score"] for j in jobs_found])
+        for job, fit_score in zip(jobs_found, fit_scores):
+            job["fit_score"] = fit_score
+        jobs_collected.extend(jobs_found)
+
+        with st.expander("⏱️ Suchdauer je Begriff"):
+            for entry in search_report:
+                status = f"⚠️ {entry['error']}" if entry["error"] else f"{entry['count']} Treffer ({entry['cache']})"
+                per_source = ", ".join(f"{k}: {n}" for k, n in entry.get("sources", {}).items())
+                if per_source:
+                    status += f" · {per_source}"
+                if entry.get("partial"):
+                    status += " · ⚠️ Teilergebnis"
+                st.caption(f"{entry['query']}: {entry['seconds']:.2f} s – {status}")
+            if n_duplicates:
+                st.caption(f"🧹 {n_duplicates} Dubletten (gleiche Stelle unter mehreren Begriffen/Quellen) entfernt")
+
+        unique_jobs = sorted(jobs_collected, key=lambda j: j.get("fit_score", 0), reverse=True)
 
         if not unique_jobs:
             st.info("Keine Treffer gefunden.")
@@ -207,46 +271,7 @@ def render():
         # --------------------------------------------------
         st.subheader("📋 Gefundene Stellen")
 
-        # Lade vorhandenes Feedback
-        feedback_entries = load_feedback_for_profile(selected_profile["id"])
-        feedback_by_job = {f["job_id"]: f for f in feedback_entries}
-
-        # Anzeige pro Job
-        for idx, job in enumerate(unique_jobs):
-            refnr = job.get("refnr")
-
-            # Callback für Speichern
-            def on_save(job_obj, feedback_value, comment):
-                ok = _persist_feedback_and_job(
-                    ba,
-                    job_obj,
-                    selected_profile,
-                    job_obj.get("refnr"),
-                    job_obj.get("fit_score", 0),
-                    feedback_value,
-                    comment
-                )
-                if ok:
-                    st.success(f"✅ Feedback gespeichert für {job_obj.get('titel','(ohne Titel)')}")
-
-            # Bestehendes Feedback prüfen
-            existing = None
-            for f in feedback_by_job.values():
-                if f["job_id"] == job.get("id"):
-                    existing = {
-                        "value": f.get("feedback_value"),
-                        "comment": f.get("comment"),
-                        "timestamp": f.get("timestamp")
-                    }
-
-            # Jobkarte rendern
-            render_job_card(
-                job=job,
-                profile=selected_profile,
-                ba=ba,
-                existing_feedback=existing,
-                on_save=on_save
-            )
+        _render_results(unique_jobs, selected_profile, ba)
 
         if st.button("🔄 Neue Suche starten"):
             st.session_state["search_started"] = False
@@ -1,14 +1,55 @@
 import streamlit as st
 
-def render_job_card(job, profile, ba, existing_feedback=None, on_save=None):
+def _render_details(details, job, refnr):
+    beschreibung = (details.get("beschreibung") or "").strip()
+    if beschreibung and beschreibung.lower() != "keine details verfügbar.":
+        st.markdown(beschreibung)
+    else:
+        st.caption("Keine Details verfügbar.")
+    job_url = details.get("url") or job.get("url") or (
+        f"https://www.arbeitsagentur.de/jobsuche/suche?id={refnr}" if refnr else None
+    )
+    if job_url:
+        st.markdown(f"[🌐 Zur Jobseite auf der BA]({job_url})")
+
+
+def fill_pending_details(pending, details_store, timeout=20):
+    """
+    Füllt die Platzhalter der Karten, deren Details beim Rendern noch unterwegs waren –
+    in der Reihenfolge, in der die Anfragen fertig werden.
+    - pending: Liste der Rückgabewerte von render_job_card (None-Einträge werden ignoriert)
+    """
+    slots = {}
+    for item in pending:
+        if item:
+            slot, job, refnr = item
+            slots.setdefault(refnr, []).append((slot, job))
+    for refnr, details in details_store.iter_completed(list(slots), timeout=timeout):
+        for slot, job in slots.pop(refnr, []):
+            with slot.container():
+                _render_details(details, job, refnr)
+    # Zeitüberschreitung: Hinweis statt Endlos-Spinner
+    for refnr, entries in slots.items():
+        for slot, job in entries:
+            with slot.container():
+                st.caption("⚠️ Details konnten nicht rechtzeitig geladen werden.")
+                _render_details({}, job, refnr)
+
+
+def render_job_card(job, profile, ba, existing_feedback=None, on_save=None, details_store=None):
     """
     Zeigt eine Jobkarte mit Feedback-Steuerung.
     - existing_feedback: dict mit {'value': 1/-1/None, 'comment': '...'}
     - on_save: Callback-Funktion (job, feedback_value, comment) -> None
+    - details_store: optional DetailPrefetcher; Details kommen dann aus dem
+      Vorab-Abruf statt synchron von ba.get_details. Sind sie noch nicht da,
+      zeigt die Karte einen Platzhalter und gibt (slot, job, refnr) zurück –
+      fill_pending_details() füllt ihn später im selben Durchlauf.
     """
 
     refnr = job.get("refnr")
     job_key = f"{profile['id']}_{refnr}"
+    pending = None
 
     # --- Kopfbereich ---
     st.markdown(f"**{job.get('titel','')}**  \n_{job.get('arbeitgeber','')}_  \n📍 {job.get('ort','')}")
@@ -17,17 +58,17 @@ def render_job_card(job, profile, ba, existing_feedback=None, on_save=None):
 
     # --- Beschreibung ---
     with st.expander("🔎 Jobbeschreibung anzeigen / ausblenden"):
-        details = ba.get_details(refnr) if refnr else {}
-        beschreibung = (details.get("beschreibung") or "").strip()
-        if beschreibung and beschreibung.lower() != "keine details verfügbar.":
-            st.markdown(beschreibung)
+        if details_store is None:
+            _render_details(ba.get_details(refnr) if refnr else {}, job, refnr)
         else:
-            st.caption("Keine Details verfügbar.")
-        job_url = details.get("url") or job.get("url") or (
-            f"https://www.arbeitsagentur.de/jobsuche/suche?id={refnr}" if refnr else None
-        )
-        if job_url:
-            st.markdown(f"[🌐 Zur Jobseite auf der BA]({job_url})")
+            details = details_store.get(refnr, timeout=0)
+            slot = st.empty()
+            if details is None:
+                slot.caption("⏳ Details werden geladen …")
+                pending = (slot, job, refnr)
+            else:
+                with slot.container():
+                    _render_details(details, job, refnr)
 
     # --- Feedback-Auswahl ---
     st.markdown("#### 💬 Feedback")
@@ -61,4 +102,6 @@ def render_job_card(job, profile, ba, existing_feedback=None, on_save=None):
     if existing_feedback:
         val = existing_feedback.get("value")
         emoji = "✅" if val == 1 else "❌" if val == -1 else "💬"
-        st.caption(f"{emoji} Bereits bewertet am {existing_feedback.get('timestamp','(unbekannt)')}")
\ No newline at end of file
+        st.caption(f"{emoji} Bereits bewertet am {existing_feedback.get('timestamp','(unbekannt)')}")
+
+    return pending
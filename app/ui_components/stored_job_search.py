@@ -0,0 +1,40 @@
+import streamlit as st
+import pandas as pd
+
+from src.db_manager import search_jobs_fulltext
+
+
+def render_stored_job_search(db_path, key="stored_job_search", limit=50):
+    """
+    Suchfeld über die lokal gespeicherten Jobs (FTS5/BM25, ohne BA-API).
+    - db_path: Pfad zur career_agent.db der aufrufenden Seite
+    - key: eindeutiger Widget-Key je Seite
+    """
+    query = st.text_input(
+        "🔎 Gespeicherte Jobs durchsuchen",
+        key=key,
+        placeholder="z. B. Data Scientist Dresden, CRM, Python …",
+    )
+    if not query.strip():
+        return
+
+    hits = search_jobs_fulltext(query, limit=limit, db_path=db_path)
+    if not hits:
+        st.caption("Keine gespeicherten Jobs gefunden.")
+        return
+
+    st.caption(f"{len(hits)} Treffer (beste zuerst)")
+    df = pd.DataFrame(hits)
+    st.dataframe(
+        df[["title", "company", "location", "snippet", "url"]].rename(
+            columns={
+                "title": "Titel",
+                "company": "Arbeitgeber",
+                "location": "Ort",
+                "snippet": "Auszug",
+                "url": "Link",
+            }
+        ),
+        use_container_width=True,
+        hide_index=True,
+    )
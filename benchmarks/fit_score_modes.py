@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# fit_score_modes.py — Vergleich Full-Scan vs. Top-k (knn) für das gelernte Signal.
+# Usage:
+#   python benchmarks/fit_score_modes.py --sizes 1000 10000 100000 --jobs 50
+#
+# Synthetische Daten: Feedback-Vektoren liegen in Clustern, jeder Cluster hat
+# eine „wahre“ Präferenz (+1/-1, mit etwas Rauschen in den Labels). Gemessen werden
+# Latenz pro Job-Batch und Ranking-Qualität (AUC gegen die wahre Präferenz).
+# Optional (--chroma) läuft zusätzlich eine In-Memory-Chroma-Collection (HNSW).
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.feedback_matrix import FeedbackMatrix, neighbor_signal
+
+
+def make_data(n_feedback, n_jobs, dim, n_clusters, label_noise, rng):
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+    prefs = rng.choice([-1.0, 1.0], size=n_clusters)
+
+    fb_cluster = rng.integers(0, n_clusters, size=n_feedback)
+    fb_vecs = centers[fb_cluster] + 0.8 * rng.normal(size=(n_feedback, dim)).astype(np.float32)
+    fb_weights = prefs[fb_cluster].copy()
+    flip = rng.random(n_feedback) < label_noise
+    fb_weights[flip] *= -1
+
+    job_cluster = rng.integers(0, n_clusters, size=n_jobs)
+    job_vecs = centers[job_cluster] + 0.8 * rng.normal(size=(n_jobs, dim)).astype(np.float32)
+    truth = prefs[job_cluster]
+    return fb_vecs, fb_weights, job_vecs, truth
+
+
+def auc(scores, truth):
+    """ROC-AUC über Ränge (Mann-Whitney), ohne externe Abhängigkeiten."""
+    pos = truth > 0
+    n_pos, n_neg = pos.sum(), (~pos).sum()
+    if n_pos == 0 or n_neg == 0:
+        return float("nan")
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores)] = np.arange(1, len(scores) + 1)
+    return float((ranks[pos].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def chroma_signal(fb_vecs, fb_weights, job_vecs, k, min_similarity):
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    col = client.create_collection(f"bench_{len(fb_vecs)}", metadata={"hnsw:space": "cosine"})
+    step = 5000
+    for i in range(0, len(fb_vecs), step):
+        col.add(
+            ids=[str(j) for j in range(i, min(i + step, len(fb_vecs)))],
+            embeddings=fb_vecs[i:i + step].tolist(),
+            metadatas=[{"feedback_value": float(w)} for w in fb_weights[i:i + step]],
+        )
+
+    def run():
+        res = col.query(query_embeddings=job_vecs.tolist(), n_results=k, include=["distances", "metadatas"])
+        sims = 1.0 - np.asarray(res["distances"], dtype=np.float32)
+        weights = np.array([[m["feedback_value"] for m in row] for row in res["metadatas"]], dtype=np.float32)
+        return neighbor_signal(sims, weights, min_similarity)
+
+    return run
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark: Full-Scan vs. Top-k für predict_fit_scores.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--jobs", type=int, default=50, help="Jobs pro Batch (wie eine Suchseite)")
+    ap.add_argument("--dim", type=int, default=384, help="Embedding-Dimension (MiniLM: 384)")
+    ap.add_argument("--clusters", type=int, default=200)
+    ap.add_argument("--label-noise", type=float, default=0.1)
+    ap.add_argument("--k", type=int, default=20)
+    ap.add_argument("--min-similarity", type=float, default=0.3)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--chroma", action="store_true", help="zusätzlich Chroma-HNSW messen")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'Feedback':>9} | {'Modus':<12} | {'ms/Batch':>9} | {'AUC':>6} | Top-10-Overlap zu full")
+    print("-" * 72)
+    for n in args.sizes:
+        fb_vecs, fb_weights, job_vecs, truth = make_data(
+            n, args.jobs, args.dim, args.clusters, args.label_noise, rng
+        )
+        fm = FeedbackMatrix()
+        fm.load([str(i) for i in range(n)], fb_vecs, [{"feedback_value": float(w)} for w in fb_weights])
+
+        modes = {
+            "full": lambda: fm.learned_signal(job_vecs),
+            "knn-local": lambda: fm.knn_signal(job_vecs, k=args.k, min_similarity=args.min_similarity),
+        }
+        if args.chroma:
+            modes["knn-chroma"] = chroma_signal(fb_vecs, fb_weights, job_vecs, args.k, args.min_similarity)
+
+        top_full = None
+        for name, fn in modes.items():
+            secs, signal = timed(fn, args.repeat)
+            top = set(np.argsort(-signal)[:10])
+            if top_full is None:
+                top_full = top
+            overlap = len(top & top_full) / 10
+            print(f"{n:>9} | {name:<12} | {secs * 1000:>9.2f} | {auc(signal, truth):>6.3f} | {overlap:.1f}")
+        print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
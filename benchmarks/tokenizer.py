@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# tokenizer.py — Mikrobenchmark: bisherige normalize_txt/tokenize vs. src/tokenizer.py.
+# Usage:
+#   python benchmarks/tokenizer.py --n 200000 --unique 2000
+#
+# Eingabe sind Jobtitel und Orte mit realistischer Wiederholung (n Strings aus
+# `unique` verschiedenen). Gemessen wird einmal kalt (leerer Cache) und einmal
+# warm; vorab wird geprüft, dass beide Varianten identische Tokens liefern.
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src.tokenizer import (  # noqa: E402
+    ROLE_SYNONYMS,
+    STOPWORDS,
+    clear_tokenizer_cache,
+    normalize_txt,
+    tokenize,
+    tokenizer_stats,
+)
+
+WORDS = [
+    "Data", "Scientist", "Senior", "Junior", "Werkstudent", "Berater", "Entwickler", "Python",
+    "SQL", "Projektleiter", "KI", "Datenanalyst", "Bürokaufmann", "Sachbearbeiter", "Marketing",
+    "Manager", "Online-Marketing", "Kommunikation", "(m/w/d)", "für", "und", "im", "Vertrieb",
+    "Architekt", "Ingenieur", "Analyse", "Team", "Lead", "Homeoffice", "Remote", "C++", "C#",
+]
+PLACES = ["Berlin", "Dresden", "Görlitz", "München", "Köln", "Düsseldorf", "Leipzig", "Bautzen", "Remote"]
+
+
+# --------------------------------------------------
+# Bisherige Implementierung (Stand vor src/tokenizer.py)
+# --------------------------------------------------
+def legacy_normalize_txt(s):
+    if not s:
+        return ""
+    s = s.lower()
+    s = s.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    s = re.sub(r"[^a-z0-9+#]+", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def legacy_tokenize(s):
+    toks = [t for t in legacy_normalize_txt(s).split(" ") if t and t not in STOPWORDS]
+    return {ROLE_SYNONYMS.get(t, t) for t in toks}
+
+
+def make_inputs(n, unique, rng):
+    pool = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))) for _ in range(unique)]
+    pool += PLACES
+    return [rng.choice(pool) for _ in range(n)]
+
+
+def timed(fn, inputs):
+    t0 = time.perf_counter()
+    for s in inputs:
+        fn(s)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark: Tokenizer mit Cache vs. bisherige Funktionen.")
+    ap.add_argument("--n", type=int, default=200000, help="Anzahl Strings")
+    ap.add_argument("--unique", type=int, default=2000, help="davon verschiedene Titel")
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    inputs = make_inputs(args.n, args.unique, rng)
+
+    for s in set(inputs):
+        assert normalize_txt(s) == legacy_normalize_txt(s), s
+        assert tokenize(s) == legacy_tokenize(s), s
+    clear_tokenizer_cache()
+
+    rows = [
+        ("normalize (alt)", timed(legacy_normalize_txt, inputs)),
+        ("normalize (neu, kalt)", timed(normalize_txt, inputs)),
+        ("normalize (neu, warm)", timed(normalize_txt, inputs)),
+        ("tokenize (alt)", timed(legacy_tokenize, inputs)),
+    ]
+    clear_tokenizer_cache()
+    rows += [
+        ("tokenize (neu, kalt)", timed(tokenize, inputs)),
+        ("tokenize (neu, warm)", timed(tokenize, inputs)),
+    ]
+
+    base = {"normalize": rows[0][1], "tokenize": rows[3][1]}
+    print(f"{args.n} Strings, {len(set(inputs))} verschieden")
+    print(f"{'Variante':<24} | {'ms':>9} | {'µs/String':>9} | Speedup")
+    print("-" * 60)
+    for name, secs in rows:
+        speedup = base[name.split()[0]] / secs if secs else float("inf")
+        print(f"{name:<24} | {secs * 1000:>9.1f} | {secs * 1e6 / args.n:>9.2f} | {speedup:.1f}x")
+    print("-" * 60)
+    print("Cache:", tokenizer_stats())
+
+
+if __name__ == "__main__":
+    main()
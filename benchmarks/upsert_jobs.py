@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# upsert_jobs.py — Benchmark: db_manager.upsert_jobs für große Batches.
+# Usage:
+#   python benchmarks/upsert_jobs.py --n 10000 --repeat 3
+#
+# Misst auf einer frischen Temp-DB (alle Migrationen angewendet) vier Fälle:
+# - insert:  n neue Jobs
+# - update:  dieselben n Jobs erneut (Treffer über refnr, Inhalt unverändert)
+# - changed: dieselben n Jobs mit neuem Titel/Beschreibung (Token- und FTS-Index neu)
+# - mixed:   n Jobs, Hälfte bekannt, Hälfte neu (ohne refnr, Treffer über Titel/Firma/Ort)
+# Ziel laut Anforderung: 10k Jobs deutlich unter einer Sekunde.
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from src import db_manager as db  # noqa: E402
+
+WORDS = [
+    "Data", "Scientist", "Senior", "Werkstudent", "Berater", "Entwickler", "Python", "SQL",
+    "Projektleiter", "KI", "Datenanalyst", "Bürokaufmann", "Sachbearbeiter", "Marketing", "Manager",
+    "(m/w/d)", "Vertrieb", "Architekt", "Ingenieur", "Analyse", "Team", "Lead", "Remote",
+]
+PLACES = ["Berlin", "Dresden", "Görlitz", "München", "Köln", "Düsseldorf", "Leipzig", "Bautzen", "Remote"]
+
+
+def make_jobs(n, rng, offset=0, with_refnr=True):
+    return [
+        {
+            "titel": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))),
+            "arbeitgeber": f"Firma {rng.randint(1, n // 5 + 1)}",
+            "ort": rng.choice(PLACES),
+            "refnr": f"10000-{offset + i}-S" if with_refnr else None,
+            "url": f"https://example.invalid/{offset + i}",
+            "beschreibung": "",
+            "source": "Benchmark",
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run(n, seed):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        db.ensure_schema(path)
+        jobs = make_jobs(n, rng)
+        known = make_jobs(n // 2, rng, offset=n, with_refnr=False)
+        t_insert = timed(lambda: db.upsert_jobs(jobs, db_path=path))
+        t_update = timed(lambda: db.upsert_jobs(jobs, db_path=path))
+        changed = [dict(j, titel=f"Senior {j['titel']}", beschreibung=f"Neu: {j['titel']}") for j in jobs]
+        t_changed = timed(lambda: db.upsert_jobs(changed, db_path=path))
+        db.upsert_jobs(known, db_path=path)
+        mixed = known + make_jobs(n - len(known), rng, offset=2 * n, with_refnr=False)
+        t_mixed = timed(lambda: db.upsert_jobs(mixed, db_path=path))
+        db.close_connections()
+    return t_insert, t_update, t_changed, t_mixed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark für db_manager.upsert_jobs")
+    ap.add_argument("--n", type=int, default=10000, help="Jobs je Batch (default: 10000)")
+    ap.add_argument("--repeat", type=int, default=3, help="Wiederholungen, bester Wert zählt (default: 3)")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    results = [run(args.n, args.seed + r) for r in range(args.repeat)]
+    for name, values in zip(("insert", "update", "changed", "mixed"), zip(*results)):
+        best = min(values)
+        print(f"[Bench] {name:<7} {args.n:>6} Jobs: {best:.3f} s  ({args.n / best:,.0f} Jobs/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
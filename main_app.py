@@ -1,5 +1,6 @@
 import streamlit as st
 from pathlib import Path
+import os
 import sys
 
 # --------------------------------------------------
@@ -19,6 +20,15 @@ from app.pages import (
     dashboard_profiles
 )
 
+from src.db_manager import ensure_schema, SchemaOutdatedError
+
+# Modell + Chroma im Hintergrund vorladen (abschaltbar mit JOB_AGENT_WARMUP=0),
+# damit Dashboards sofort starten und die Job-Suche trotzdem nicht warten muss
+from src.learning_engine import warm_up
+
+if os.environ.get("JOB_AGENT_WARMUP", "1") != "0":
+    warm_up(background=True)
+
 # Writer Agent ist optional (noch nicht implementiert)
 try:
     from pages import writer_agent
@@ -36,6 +46,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --------------------------------------------------
+# DB-Schema: einmal pro Prozess migrieren bzw. mit
+# JOB_AGENT_SCHEMA_CHECK_ONLY=1 nur prüfen und bei veraltetem Schema abbrechen
+# --------------------------------------------------
+try:
+    ensure_schema(check_only=os.environ.get("JOB_AGENT_SCHEMA_CHECK_ONLY") == "1")
+except SchemaOutdatedError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+
 # --------------------------------------------------
 # Sidebar Navigation
 # --------------------------------------------------
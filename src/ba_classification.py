@@ -1,5 +1,50 @@
-import requests
-from typing import List, Dict, Any
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional
+
+from .cache import CACHE_DIR, SQLiteTTLCache
+from .http_client import http_get
+from .kldb_index import KldbIndex, get_kldb_index
+from .search_cache import normalize_query
+
+# --------------------------------------------------
+# Persistenter Cache für die Begriffserweiterung (KldB ändert sich selten)
+# --------------------------------------------------
+
+CLASSIFICATION_TTL = 30 * 24 * 3600
+CLASSIFICATION_NEGATIVE_TTL = 24 * 3600
+
+# "remote" (API + Cache), "local" (KldB-Index aus data/kldb2010.json) oder
+# "auto" (lokal, sobald ein Dump importiert ist, sonst remote)
+CLASSIFICATION_BACKENDS = ("remote", "local", "auto")
+DEFAULT_BACKEND = os.environ.get("JOB_AGENT_CLASSIFICATION_BACKEND", "auto")
+
+_classification_cache: Optional[SQLiteTTLCache] = None
+_classification_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> SQLiteTTLCache:
+    """Prozessweit geteilter Cache für Klassifikationsabfragen (data/cache/ba_classification.sqlite)."""
+    global _classification_cache
+    if _classification_cache is None:
+        with _classification_cache_lock:
+            if _classification_cache is None:
+                _classification_cache = SQLiteTTLCache(
+                    CACHE_DIR / "ba_classification.sqlite",
+                    ttl=CLASSIFICATION_TTL,
+                    negative_ttl=CLASSIFICATION_NEGATIVE_TTL,
+                    max_entries=20000,
+                )
+    return _classification_cache
+
+
+def classification_cache_key(suchbegriff: str, limit: int) -> str:
+    """Normalisierter Key: „Bürokaufmann “ und „bürokaufmann“ teilen sich einen Eintrag."""
+    return f"{normalize_query(suchbegriff)}|{int(limit)}"
+
 
 class BAClassification:
     """
@@ -10,14 +55,52 @@ class BAClassification:
     BASE_URL = "https://rest.arbeitsagentur.de/klassifikationen/berufe/v1/berufe"
     HEADERS = {"X-API-Key": "jobboerse-jobsuche"}
 
-    def classify_term(self, suchbegriff: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Liefert bis zu `limit` ähnliche/zugeordnete Berufseinträge."""
+    def __init__(self,
+                 cache: Optional[SQLiteTTLCache] = None,
+                 use_cache: bool = True,
+                 backend: Optional[str] = None,
+                 index: Optional[KldbIndex] = None):
+        """
+        cache: eigener Cache (z. B. für Tests); Default ist der geteilte Disk-Cache.
+        use_cache=False fragt immer die API ab.
+        backend: "remote" | "local" | "auto" (Default: JOB_AGENT_CLASSIFICATION_BACKEND, sonst "auto").
+        index: eigener KldbIndex; Default ist der geteilte Index aus data/kldb2010.json.
+        """
+        backend = backend or DEFAULT_BACKEND
+        if backend not in CLASSIFICATION_BACKENDS:
+            raise ValueError(f"Unbekanntes Klassifikations-Backend: {backend}")
+        self._cache = cache
+        self.use_cache = use_cache
+        self.backend = backend
+        self._index = index
+
+    @property
+    def cache(self) -> Optional[SQLiteTTLCache]:
+        if not self.use_cache:
+            return None
+        if self._cache is None:
+            self._cache = get_classification_cache()
+        return self._cache
+
+    @property
+    def index(self) -> Optional[KldbIndex]:
+        """Lokaler Index – nur bei backend "local"/"auto", sonst None."""
+        if self.backend == "remote":
+            return None
+        if self._index is None:
+            self._index = get_kldb_index()
+            if self._index is None and self.backend == "local":
+                print("[Klassifikation] ⚠️ Kein lokaler KldB-Index – `python -m src.kldb_index import <dump>` ausführen.")
+        return self._index
+
+    def _fetch(self, suchbegriff: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """API-Abfrage; None bei Fehlern (wird nicht gecacht), [] bei „kein Treffer“."""
         try:
             params = {"suchbegriff": suchbegriff, "page": 1, "size": limit}
-            r = requests.get(self.BASE_URL, headers=self.HEADERS, params=params, timeout=15)
+            r = http_get(self.BASE_URL, headers=self.HEADERS, params=params, timeout=15, endpoint="ba-berufe")
             if r.status_code != 200:
                 print(f"[Klassifikation] Fehler {r.status_code} bei '{suchbegriff}'")
-                return []
+                return None
 
             data = r.json()
             berufe = data.get("berufe", [])
@@ -33,4 +116,110 @@ class BAClassification:
 
         except Exception as e:
             print(f"[Klassifikation] Fehler bei '{suchbegriff}': {e}")
-            return []
\ No newline at end of file
+            return None
+
+    def classify_term(self, suchbegriff: str, limit: int = 5, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Liefert bis zu `limit` ähnliche/zugeordnete Berufseinträge.
+        Treffer bleiben 30 Tage im Cache, „kein Treffer“ einen Tag, Fehler gar nicht.
+        refresh=True ignoriert den Cache und schreibt ihn neu.
+        Mit lokalem Index (backend "local"/"auto") ohne Netzwerk und ohne Cache.
+        """
+        index = self.index
+        if index is not None:
+            return index.lookup(suchbegriff, limit=limit)
+        if self.backend == "local":
+            return []
+
+        cache = self.cache
+        key = classification_cache_key(suchbegriff, limit)
+        if cache is not None and not refresh:
+            hit, value = cache.get(key)
+            if hit:
+                return list(value or [])
+
+        result = self._fetch(suchbegriff, limit)
+        if result is None:
+            return []
+        if cache is not None:
+            if result:
+                cache.put(key, result)
+            else:
+                cache.put_negative(key)
+        return result
+
+    def expand_terms(self, terms: Iterable[str], limit: int = 5) -> List[str]:
+        """Ausgangsbegriffe plus Berufsbezeichnungen der Klassifikation (ohne Duplikate, Reihenfolge stabil)."""
+        terms = [t for t in terms if t]
+        expanded = list(terms)
+        for q in terms:
+            expanded.extend(s["bezeichnung"] for s in self.classify_term(q, limit=limit) if s.get("bezeichnung"))
+        return list(dict.fromkeys(expanded))
+
+    def warm_up(self, terms: Iterable[str], limit: int = 5, max_workers: int = 4,
+                refresh: bool = False) -> Dict[str, Any]:
+        """
+        Füllt den Cache für alle Begriffe (parallel, begrenzt).
+        Bereits gecachte Begriffe kosten nur einen Lookup, außer bei refresh=True.
+        """
+        t0 = time.perf_counter()
+        # Duplikate über den normalisierten Key entfernen („A“ und „ a “ nur einmal abfragen)
+        terms = list({classification_cache_key(t, limit): t for t in terms if t}.values())
+        cache = self.cache
+        todo = terms
+        if self.index is not None or self.backend == "local":
+            todo = []  # lokaler Index braucht keinen Cache
+        elif cache is not None and not refresh:
+            todo = [t for t in terms if not cache.get(classification_cache_key(t, limit))[0]]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo) or 1))) as pool:
+            results = list(pool.map(lambda t: self.classify_term(t, limit=limit, refresh=True), todo))
+
+        return {
+            "terms": len(terms),
+            "fetched": len(todo),
+            "cached": len(terms) - len(todo),
+            "empty": sum(1 for r in results if not r),
+            "seconds": round(time.perf_counter() - t0, 2),
+        }
+
+
+# --------------------------------------------------
+# CLI: Cache für alle bekannten Profiltitel vorwärmen
+# --------------------------------------------------
+def known_query_terms(db_path=None) -> List[str]:
+    """Alle Ausgangsbegriffe aus TITLE_MAP und den gespeicherten Profilen."""
+    from .config import TITLE_MAP, query_terms
+    from .db_manager import DB_PATH
+    from .research_agent import load_profiles_for_user, profile_query
+
+    terms = [t for values in TITLE_MAP.values() for t in values]
+    try:
+        for p in load_profiles_for_user(db_path or DB_PATH):
+            terms.extend(query_terms(profile_query(p)))
+    except Exception as e:
+        print(f"[Klassifikation] Profile nicht lesbar: {e}")
+    return list(dict.fromkeys(terms))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Klassifikations-Cache (KldB2010) vorwärmen.")
+    ap.add_argument("terms", nargs="*", help="zusätzliche Suchbegriffe")
+    ap.add_argument("--db", default=None, help="Pfad zur SQLite-DB (Profile)")
+    ap.add_argument("--limit", type=int, default=5, help="Einträge je Begriff (default: 5)")
+    ap.add_argument("--workers", type=int, default=4, help="parallele Anfragen (default: 4)")
+    ap.add_argument("--refresh", action="store_true", help="auch gecachte Begriffe neu abfragen")
+    args = ap.parse_args(argv)
+
+    terms = known_query_terms(args.db) + list(args.terms)
+    # vorgewärmt wird immer der Remote-Cache (Fallback, falls der lokale Index fehlt)
+    classifier = BAClassification(backend="remote")
+    stats = classifier.warm_up(terms, limit=args.limit, max_workers=args.workers, refresh=args.refresh)
+    print(f"[Klassifikation] {stats['terms']} Begriffe: {stats['fetched']} abgefragt, "
+          f"{stats['cached']} aus dem Cache, {stats['empty']} ohne Treffer ({stats['seconds']} s)")
+    print("[Klassifikation] Cache:", classifier.cache.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
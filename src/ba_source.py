@@ -1,7 +1,32 @@
-import requests
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import urlencode, quote_plus
 from .base_source import JobSource
+from .cache import CACHE_DIR, SQLiteTTLCache
+from .http_client import http_get
+from .search_cache import SearchCache, get_search_cache, search_cache_key
+
+NO_DETAILS_STATUS = {204, 404, 410}
+
+_detail_cache: Optional[SQLiteTTLCache] = None
+_detail_cache_lock = threading.Lock()
+
+
+def get_detail_cache() -> SQLiteTTLCache:
+    """Prozessweit geteilter Cache für /jobdetails-Antworten (data/cache/ba_details.sqlite)."""
+    global _detail_cache
+    if _detail_cache is None:
+        with _detail_cache_lock:
+            if _detail_cache is None:
+                _detail_cache = SQLiteTTLCache(
+                    CACHE_DIR / "ba_details.sqlite",
+                    ttl=3 * 24 * 3600,
+                    negative_ttl=6 * 3600,
+                    max_entries=5000,
+                )
+    return _detail_cache
 
 
 class BAJobSource(JobSource):
@@ -13,6 +38,39 @@ class BAJobSource(JobSource):
     name = "Bundesagentur für Arbeit"
     BASE_URL = "https://rest.arbeitsagentur.de/jobboerse/jobsuche-service/pc/v4"
     HEADERS = {"X-API-Key": "jobboerse-jobsuche"}
+    MAX_PAGE_SIZE = 100  # Obergrenze der BA-API pro Seite
+
+    def __init__(self,
+                 detail_cache: Optional[SQLiteTTLCache] = None,
+                 use_detail_cache: bool = True,
+                 search_cache: Optional[SearchCache] = None,
+                 use_search_cache: bool = True):
+        """
+        detail_cache: eigener Cache (z. B. für Tests); Default ist der geteilte Disk-Cache.
+        use_detail_cache=False schaltet das Caching der Detailabfragen ab.
+        search_cache: eigener Suchcache (z. B. SearchCache(backend="disk"));
+        Default ist der geteilte In-Memory-Cache. use_search_cache=False schaltet ihn ab.
+        """
+        self._detail_cache = detail_cache
+        self.use_detail_cache = use_detail_cache
+        self._search_cache = search_cache
+        self.use_search_cache = use_search_cache
+
+    @property
+    def search_cache(self) -> Optional[SearchCache]:
+        if not self.use_search_cache:
+            return None
+        if self._search_cache is None:
+            self._search_cache = get_search_cache()
+        return self._search_cache
+
+    @property
+    def detail_cache(self) -> Optional[SQLiteTTLCache]:
+        if not self.use_detail_cache:
+            return None
+        if self._detail_cache is None:
+            self._detail_cache = get_detail_cache()
+        return self._detail_cache
 
     # -------------------------------------------------------------
     # ID/Link-Hilfen
@@ -70,51 +128,85 @@ class BAJobSource(JobSource):
     # -------------------------------------------------------------
     # Suche (Freitext)
     # -------------------------------------------------------------
-    def search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+    def _parse_jobs(self, data: Dict[str, Any], query: str, ort: str, umkreis: int) -> List[Dict[str, Any]]:
+        """Wandelt die Rohantwort von /jobs in unser Job-Schema um."""
+        jobs: List[Dict[str, Any]] = []
+
+        for j in data.get("stellenangebote", []) or []:
+            titel = j.get("titel") or "Kein Titel"
+            arbeitgeber = (
+                j.get("arbeitgeber", {}).get("name")
+                if isinstance(j.get("arbeitgeber"), dict)
+                else j.get("arbeitgeber", "Unbekannt")
+            )
+            ort_name = (
+                j.get("arbeitsort", {}).get("ort")
+                if isinstance(j.get("arbeitsort"), dict)
+                else j.get("arbeitsort", "n/a")
+            )
+
+            job_id = self._extract_id(j)
+            link = j.get("link") or self._build_jobsuche_url(job_id, query, ort, umkreis)
+
+            jobs.append({
+                "titel": titel,
+                "arbeitgeber": arbeitgeber,
+                "ort": ort_name,
+                "refnr": j.get("refnr"),     # behalten wir informativ
+                "id": job_id,               # die „richtige“ ID für den Link
+                "source": self.name,
+                "url": link,
+            })
+        return jobs
+
+    def search_page(self, query: str, ort: str, umkreis: int, page: int = 1, size: int = 10) -> Dict[str, Any]:
+        """
+        Lädt genau eine Ergebnisseite von /jobs und wirft bei Fehlern eine Exception.
+        Gibt {"jobs": [...], "page": page, "size": size, "total": maxErgebnisse} zurück.
+        """
         url = f"{self.BASE_URL}/jobs"
         params = {
             "was": query,
             "wo": ort,
             "umkreis": min(umkreis, 200),
-            "page": 1,
-            "size": size,
+            "page": page,
+            "size": min(size, self.MAX_PAGE_SIZE),
         }
 
-        try:
-            r = requests.get(url, headers=self.HEADERS, params=params, timeout=30)
-            if r.status_code != 200:
-                print(f"[BA] Fehler {r.status_code}: {r.text[:200]}")
-                return []
-
-            data = r.json()
-            jobs: List[Dict[str, Any]] = []
-
-            for j in data.get("stellenangebote", []) or []:
-                titel = j.get("titel") or "Kein Titel"
-                arbeitgeber = (
-                    j.get("arbeitgeber", {}).get("name")
-                    if isinstance(j.get("arbeitgeber"), dict)
-                    else j.get("arbeitgeber", "Unbekannt")
-                )
-                ort_name = (
-                    j.get("arbeitsort", {}).get("ort")
-                    if isinstance(j.get("arbeitsort"), dict)
-                    else j.get("arbeitsort", "n/a")
-                )
+        r = http_get(url, headers=self.HEADERS, params=params, timeout=30, endpoint="ba-jobs")
+        if r.status_code != 200:
+            raise RuntimeError(f"HTTP {r.status_code}: {r.text[:200]}")
 
-                job_id = self._extract_id(j)
-                link = j.get("link") or self._build_jobsuche_url(job_id, query, ort, umkreis)
+        data = r.json()
+        total = data.get("maxErgebnisse")
+        return {
+            "jobs": self._parse_jobs(data, query, ort, umkreis),
+            "page": page,
+            "size": params["size"],
+            "total": int(total) if total is not None else None,
+        }
 
-                jobs.append({
-                    "titel": titel,
-                    "arbeitgeber": arbeitgeber,
-                    "ort": ort_name,
-                    "refnr": j.get("refnr"),     # behalten wir informativ
-                    "id": job_id,               # die „richtige“ ID für den Link
-                    "source": self.name,
-                    "url": link,
-                })
+    def _fetch_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        """
+        Führt eine Suche (erste Seite) aus und wirft bei Fehlern eine Exception
+        (statt still [] zu liefern) – Grundlage für search() und search_many().
+        """
+        return self.search_page(query, ort, umkreis, page=1, size=size)["jobs"]
 
+    def _cached_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Suche über den Ergebniscache. Gibt (jobs, cache_status) zurück,
+        cache_status ist "fresh", "stale", "miss" oder "off".
+        """
+        cache = self.search_cache
+        if cache is None:
+            return self._fetch_search(query, ort, umkreis, size), "off"
+        key = search_cache_key(query, ort, umkreis, size)
+        return cache.get_or_fetch(key, lambda: self._fetch_search(query, ort, umkreis, size))
+
+    def search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        try:
+            jobs, _ = self._cached_search(query, ort, umkreis, size)
             print(f"[BA] {len(jobs)} Treffer für '{query}' in {ort} (+{umkreis} km)")
             return jobs
 
@@ -122,27 +214,172 @@ class BAJobSource(JobSource):
             print(f"[BA] Fehler bei Suche ({query}): {e}")
             return []
 
+    # -------------------------------------------------------------
+    # Seitenweise Suche als Generator
+    # -------------------------------------------------------------
+    def iter_search(self,
+                    query: str,
+                    ort: str,
+                    umkreis: int,
+                    page_size: int = 50,
+                    max_results: Optional[int] = None,
+                    prefetch: bool = True,
+                    stop_when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    on_page: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert Treffer Job für Job und lädt Seiten erst bei Bedarf nach.
+
+        - prefetch=True lädt die nächste Seite im Hintergrund, während der
+          Aufrufer die aktuelle verarbeitet.
+        - max_results begrenzt die Gesamtzahl gelieferter Jobs.
+        - stop_when(job) -> True beendet die Suche nach diesem Job, z. B.
+          „genug Jobs mit BaseScore > X“ (Zähler im Closure des Aufrufers).
+        - on_page(meta) erhält pro Seite {"page", "count", "total"} –
+          darüber ist die Gesamttrefferzahl der API sichtbar.
+
+        Es wird immer nur eine Seite (plus ggf. die vorgeladene) im Speicher gehalten.
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        if max_results is not None:
+            page_size = max(1, min(page_size, max_results))
+
+        def _load(page: int) -> Dict[str, Any]:
+            return self.search_page(query, ort, umkreis, page=page, size=page_size)
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ba-prefetch") if prefetch else None
+        pending: Optional[Future] = None
+        delivered = 0
+        page = 1
+        try:
+            result = _load(page)
+            while True:
+                jobs = result["jobs"]
+                total = result["total"]
+                if on_page:
+                    on_page({"page": page, "count": len(jobs), "total": total})
+
+                has_more = len(jobs) == page_size and (total is None or page * page_size < total)
+                if max_results is not None and delivered + len(jobs) >= max_results:
+                    has_more = False
+                if pool and has_more:
+                    pending = pool.submit(_load, page + 1)
+
+                for job in jobs:
+                    yield job
+                    delivered += 1
+                    if max_results is not None and delivered >= max_results:
+                        return
+                    if stop_when and stop_when(job):
+                        return
+
+                if not has_more:
+                    return
+                page += 1
+                if pending is not None:
+                    result, pending = pending.result(), None
+                else:
+                    result = _load(page)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if pool:
+                pool.shutdown(wait=False)
+
+    # -------------------------------------------------------------
+    # Parallele Suche über mehrere Begriffe
+    # -------------------------------------------------------------
+    def search_one(self, query: str, ort: str, umkreis: int,
+                   size: int = 10) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Eine Suche über den Suchcache; entry wie in search_many (mit cache-Status)."""
+        t0 = time.perf_counter()
+        error = None
+        cache_status = None
+        try:
+            jobs, cache_status = self._cached_search(query, ort, umkreis, size)
+        except Exception as e:
+            jobs, error = [], str(e)
+        return jobs, {
+            "query": query,
+            "ort": ort,
+            "umkreis": umkreis,
+            "count": len(jobs),
+            "seconds": round(time.perf_counter() - t0, 3),
+            "error": error,
+            "cache": cache_status,
+        }
+
+    def search_many(self,
+                    queries: Sequence[Tuple[str, str, int]],
+                    size: int = 10,
+                    max_workers: int = 6) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Führt mehrere Suchen (query, ort, umkreis) parallel in einem Thread-Pool aus.
+
+        - max_workers begrenzt die Zahl gleichzeitiger Anfragen an die BA.
+        - Die Ergebnisse werden in der Reihenfolge von `queries` zusammengeführt
+          (innerhalb eines Begriffs in API-Reihenfolge) – unabhängig davon,
+          welche Anfrage zuerst fertig wird.
+
+        Gibt (jobs, report) zurück; report enthält pro Suchbegriff ein Dict
+        mit query, ort, umkreis, count, seconds, error (None bei Erfolg)
+        und cache (Status des Suchcaches).
+        """
+        queries = list(queries)
+        if not queries:
+            return [], []
+
+        workers = max(1, min(max_workers, len(queries)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ba-search") as pool:
+            results = list(pool.map(lambda q: self.search_one(*q, size=size), queries))
+
+        jobs_all: List[Dict[str, Any]] = []
+        report: List[Dict[str, Any]] = []
+        for jobs, entry in results:
+            jobs_all.extend(jobs)
+            report.append(entry)
+            if entry["error"]:
+                print(f"[BA] Fehler bei Suche ({entry['query']}): {entry['error']}")
+
+        failed = sum(1 for e in report if e["error"])
+        print(f"[BA] {len(jobs_all)} Treffer aus {len(queries)} Suchen "
+              f"({failed} fehlgeschlagen, {workers} parallel)")
+        return jobs_all, report
+
     # -------------------------------------------------------------
     # Details (mit Fallback)
     # -------------------------------------------------------------
+    def _no_details(self, job_id_or_ref: str) -> Dict[str, Any]:
+        return {
+            "beschreibung": "Keine Detailbeschreibung verfügbar.",
+            "url": self._build_jobsuche_url(job_id_or_ref),
+        }
+
     def get_details(self, job_id_or_ref: str) -> Dict[str, Any]:
         """
         Lädt Stellenbeschreibung über /jobdetails/{id_or_ref}.
         Wenn das fehlschlägt, liefern wir einen stabilen Link zur Jobsuche mit ?id=<...>.
+
+        Antworten landen im Detail-Cache (Key: refnr bzw. hashId). „Keine Details“
+        wird als negativer Eintrag gemerkt, Netzwerkfehler dagegen nicht.
         """
         try:
             if not job_id_or_ref:
                 return {"beschreibung": "Keine Referenznummer/ID vorhanden.", "url": None}
 
+            cache = self.detail_cache
+            if cache is not None:
+                hit, cached = cache.get(str(job_id_or_ref))
+                if hit:
+                    return cached if cached is not None else self._no_details(job_id_or_ref)
+
             detail_url = f"{self.BASE_URL}/jobdetails/{job_id_or_ref}"
-            r = requests.get(detail_url, headers=self.HEADERS, timeout=15)
+            r = http_get(detail_url, headers=self.HEADERS, timeout=15, endpoint="ba-jobdetails")
 
             if r.status_code != 200 or not r.text.strip():
                 print(f"[BA] Keine Details für {job_id_or_ref} – Fallback-Link.")
-                return {
-                    "beschreibung": "Keine Detailbeschreibung verfügbar.",
-                    "url": self._build_jobsuche_url(job_id_or_ref),
-                }
+                if cache is not None and (r.status_code in NO_DETAILS_STATUS or r.status_code == 200):
+                    cache.put_negative(str(job_id_or_ref))
+                return self._no_details(job_id_or_ref)
 
             d = r.json()
             beschr = (
@@ -160,7 +397,7 @@ class BAJobSource(JobSource):
                 else d.get("arbeitgeber", "Unbekannt")
             )
 
-            return {
+            details = {
                 "titel": d.get("titel", "n/a"),
                 "arbeitgeber": arbeitgeber,
                 "beschreibung": beschr,
@@ -170,9 +407,16 @@ class BAJobSource(JobSource):
                 "source": self.name,
             }
 
+            if cache is not None:
+                # unter allen bekannten IDs ablegen, damit refnr- und hashId-Lookups treffen
+                for key in {str(job_id_or_ref), str(details["refnr"]), str(best_id)}:
+                    cache.put(key, details)
+
+            return details
+
         except Exception as e:
             print(f"[BA] Fehler bei Details ({job_id_or_ref}): {e}")
             return {
                 "beschreibung": "Fehler beim Laden der Beschreibung.",
                 "url": self._build_jobsuche_url(job_id_or_ref),
-            }
\ No newline at end of file
+            }
@@ -1,18 +1,34 @@
-import requests
+from .ba_classification import BAClassification, get_classification_cache
+from .http_client import http_get
+from .search_cache import normalize_query
 
-def resolve_job_title_to_code(job_title: str) -> dict:
+def resolve_job_title_to_code(job_title: str, use_cache: bool = True, backend: str = None) -> dict:
     """
     Sucht über die Klassifikations-API der Bundesagentur für Arbeit
     nach dem passenden Berufscode (berufId) für eine Berufsbezeichnung.
 
     Gibt ein Dictionary mit 'bezeichnung' und 'berufId' zurück.
+    Ergebnisse liegen im geteilten Klassifikations-Cache (30 Tage, „kein Treffer“ 1 Tag).
+    backend wie bei BAClassification: mit lokalem KldB-Index ohne Netzwerk.
     """
 
+    classifier = BAClassification(backend=backend)
+    if classifier.index is not None or classifier.backend == "local":
+        hits = classifier.classify_term(job_title, limit=1)
+        return dict(hits[0], berufId=hits[0].get("berufsId")) if hits else {}
+
+    cache = get_classification_cache() if use_cache else None
+    key = f"code|{normalize_query(job_title)}"
+    if cache is not None:
+        hit, value = cache.get(key)
+        if hit:
+            return value or {}
+
     url = "https://rest.arbeitsagentur.de/klassifikationen/berufe/v1/berufe"
     headers = {"X-API-Key": "jobboerse-jobsuche"}
     params = {"suchbegriff": job_title}
 
-    r = requests.get(url, headers=headers, params=params)
+    r = http_get(url, headers=headers, params=params, timeout=15, endpoint="ba-berufe")
     print(f"→ Klassifikation-Abfrage: {r.url}")
     print("→ Status:", r.status_code)
 
@@ -23,8 +39,12 @@ def resolve_job_title_to_code(job_title: str) -> dict:
     data = r.json()
     if not data.get("berufe"):
         print(f"❌ Kein Treffer für '{job_title}'")
+        if cache is not None:
+            cache.put_negative(key)
         return {}
 
     result = data["berufe"][0]
     print(f"✅ '{job_title}' → {result['bezeichnung']} (Code: {result['berufId']})")
-    return result
\ No newline at end of file
+    if cache is not None:
+        cache.put(key, result)
+    return result
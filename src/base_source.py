@@ -1,5 +1,6 @@
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence, Tuple
 
 class JobSource(ABC):
     """Abstrakte Basis-Klasse für Jobportale."""
@@ -14,4 +15,43 @@ class JobSource(ABC):
     @abstractmethod
     def get_details(self, job_id: str) -> Dict[str, Any]:
         """Lädt Detaildaten für eine konkrete Stelle."""
-        pass
\ No newline at end of file
+        pass
+
+    def _fetch_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        """Wie search(), wirft aber bei Fehlern – Quellen mit eigener Fehlerbehandlung überschreiben das."""
+        return self.search(query, ort, umkreis, size)
+
+    def search_one(self, query: str, ort: str, umkreis: int,
+                   size: int = 10) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Eine Suche mit Report-Eintrag wie in search_many: (jobs, entry); Fehler landen in entry["error"]."""
+        t0 = time.perf_counter()
+        error = None
+        try:
+            jobs = self._fetch_search(query, ort, umkreis, size)
+        except Exception as e:
+            jobs, error = [], str(e)
+        return jobs, {
+            "query": query,
+            "ort": ort,
+            "umkreis": umkreis,
+            "count": len(jobs),
+            "seconds": round(time.perf_counter() - t0, 3),
+            "error": error,
+            "cache": None,
+        }
+
+    def search_many(self,
+                    queries: Sequence[Tuple[str, str, int]],
+                    size: int = 10,
+                    max_workers: int = 1) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Mehrere Suchen (query, ort, umkreis) nacheinander; gleiche Rückgabe wie
+        BAJobSource.search_many: (jobs in Reihenfolge der queries, report je Begriff).
+        """
+        jobs_all: List[Dict[str, Any]] = []
+        report: List[Dict[str, Any]] = []
+        for query, ort, umkreis in queries:
+            jobs, entry = self.search_one(query, ort, umkreis, size)
+            jobs_all.extend(jobs)
+            report.append(entry)
+        return jobs_all, report
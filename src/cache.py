@@ -0,0 +1,240 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# --------------------------------------------------
+# Persistenter Key/Value-Cache (SQLite) mit TTL + LRU
+# --------------------------------------------------
+
+CACHE_DIR = Path("data/cache")
+TOUCH_RESOLUTION = 60.0      # last_access nur nachziehen, wenn älter als das (Sekunden)
+TOUCH_FLUSH_INTERVAL = 30.0  # gesammelte Zugriffe spätestens nach so vielen Sekunden schreiben
+TOUCH_FLUSH_ENTRIES = 256    # … oder sobald so viele Zugriffe anstehen
+
+
+class SQLiteTTLCache:
+    """
+    Kleiner JSON-Cache auf SQLite-Basis.
+
+    - TTL pro Eintrag (positive und negative Einträge getrennt konfigurierbar)
+    - LRU-Begrenzung über `max_entries` (ältester Zugriff fliegt zuerst)
+    - negative Einträge („gibt es nicht“) werden als Treffer mit value=None geliefert
+    - Zähler für hits / misses / negative_hits
+    - Lesezugriffe schreiben nicht: last_access wird grob (TOUCH_RESOLUTION) im
+      Speicher gesammelt und gebündelt mit dem nächsten Schreibvorgang bzw.
+      spätestens nach TOUCH_FLUSH_INTERVAL / TOUCH_FLUSH_ENTRIES geschrieben
+    """
+
+    def __init__(self,
+                 path,
+                 ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 6 * 3600,
+                 max_entries: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._last_flush = time.time()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                negative INTEGER NOT NULL DEFAULT 0,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access);")
+        self._conn.commit()
+
+    # --------------------------------------------------
+    # Lesen / Schreiben
+    # --------------------------------------------------
+    def get(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Gibt (hit, value) zurück.
+        Bei negativen Einträgen ist hit=True und value=None.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, negative, expires_at, last_access FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if not row or row[2] < now:
+                self.misses += 1
+                return False, None
+            if now - row[3] >= TOUCH_RESOLUTION:
+                self._touched[key] = now
+                if (len(self._touched) >= TOUCH_FLUSH_ENTRIES
+                        or now - self._last_flush >= TOUCH_FLUSH_INTERVAL):
+                    self._flush_touches()
+                    self._conn.commit()
+            if row[1]:
+                self.negative_hits += 1
+                return True, None
+            self.hits += 1
+            return True, json.loads(row[0])
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._write(key, json.dumps(value, ensure_ascii=False), False, self.ttl if ttl is None else ttl)
+
+    def put_negative(self, key: str, ttl: Optional[float] = None) -> None:
+        """Merkt sich, dass es für `key` (vorerst) nichts gibt."""
+        self._write(key, None, True, self.negative_ttl if ttl is None else ttl)
+
+    def _write(self, key: str, value: Optional[str], negative: bool, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO cache (key, value, negative, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    negative = excluded.negative,
+                    expires_at = excluded.expires_at,
+                    last_access = excluded.last_access
+                """,
+                (key, value, int(negative), now + ttl, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touches()
+            self._evict()
+            self._conn.commit()
+
+    def _flush_touches(self) -> None:
+        """Schreibt gesammelte Zugriffszeiten (ohne commit – erledigt der Aufrufer)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET last_access = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_flush = time.time()
+
+    def flush(self) -> None:
+        """Ausstehende Zugriffszeiten sofort schreiben."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Entfernt abgelaufene Einträge und begrenzt auf max_entries (LRU)."""
+        self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    # --------------------------------------------------
+    # Statistik
+    # --------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            "size": size,
+        }
+
+
+# --------------------------------------------------
+# In-Memory-Variante mit identischer Schnittstelle
+# --------------------------------------------------
+class MemoryTTLCache:
+    """
+    Prozesslokaler Cache mit derselben Schnittstelle wie SQLiteTTLCache
+    (get/put/put_negative/delete/clear/stats). LRU über OrderedDict.
+    """
+
+    _NEGATIVE = object()
+
+    def __init__(self,
+                 ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 6 * 3600,
+                 max_entries: int = 5000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Tuple[bool, Optional[Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.time():
+                self._data.pop(key, None)
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            if entry[0] is self._NEGATIVE:
+                self.negative_hits += 1
+                return True, None
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._write(key, value, self.ttl if ttl is None else ttl)
+
+    def put_negative(self, key: str, ttl: Optional[float] = None) -> None:
+        self._write(key, self._NEGATIVE, self.negative_ttl if ttl is None else ttl)
+
+    def _write(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            "size": len(self._data),
+        }
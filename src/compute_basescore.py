@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # compute_basescore.py — Lightweight "BaseScore" computation without full job descriptions.
 # Usage:
-#   python compute_basescore.py --db data/career_agent.db
+#   python src/compute_basescore.py --db data/career_agent.db
 #
 # What it does:
 # 1) Detects active profile (user_profile or profiles).
@@ -10,31 +10,35 @@
 # 3) Scores each job using title/keywords/location only.
 # 4) Writes jobs.base_score, jobs.fit_score (if NULL), and jobs.why_base (short explanation).
 #
-# Safe to run multiple times.
+# Safe to run multiple times. Incremental by default: jobs.base_input_hash stores a hash of
+# (scorer/profile version, title, location); only new or changed jobs are rescored.
+#   --full          rescore everything
+#   --workers N     score chunks in N processes (large job tables)
+#   --chunk-size N  rows per read/write chunk (one transaction per chunk)
+#   --all-profiles  score every row of `profiles` in one sweep into job_profile_scores
+#   --prefilter     with --all-profiles: use the job_tokens index, skip jobs without token overlap
 
 import argparse
-import re
+import hashlib
 import sqlite3
+import sys
 from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
 
-STOPWORDS = {
-    "und","oder","mit","für","der","die","das","den","dem","ein","eine",
-    "in","von","an","im","am","auf","bei","zu","aus","per","the","of","to",
-}
-
-NEGATIVE_LEVEL = {"werkstudent","praktikum","trainee"}
-POSITIVE_LEVEL = {"senior","lead","principal","head"}
-ROLE_SYNONYMS = {
-    "berater":"consultant",
-    "daten":"data",
-    "wissenschaftler":"scientist",
-    "ingenieur":"engineer",
-    "entwickler":"developer",
-    "analyse":"analytics",
-    "analyst":"analyst",
-    "architekt":"architect",
-}
-REMOTE_TOKENS = {"remote","homeoffice","home-office","home", "hybrid"}
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Tokenisierung + Formel liegen in src/scoring.py (Preset "cli")
+from src.db_manager import ensure_schema  # noqa: E402
+from src.scoring import ROLE_TOKENS, prepare_profile, score_jobs, tokenize_jobs  # noqa: E402
+from src.tokenizer import normalize_txt, tokenize  # noqa: E402
+
+PRESET = "cli"
+SCORER_VERSION = 1        # erhöhen, wenn sich die Formel ändert → alle Jobs neu bewerten
+DEFAULT_CHUNK_SIZE = 2000
+PROFILE_FIELDS = ("skills", "summary", "region", "preferred_region", "role", "target_role", "title", "name")
 
 def table_exists(conn, name):
     cur = conn.cursor()
@@ -46,41 +50,6 @@ def get_columns(conn, table):
     cur.execute(f"PRAGMA table_info({table})")
     return [row[1] for row in cur.fetchall()]
 
-def normalize_txt(s):
-    if not s:
-        return ""
-    s = s.lower()
-    # normalize german umlauts very lightly (optional)
-    s = s.replace("ä","ae").replace("ö","oe").replace("ü","ue").replace("ß","ss")
-    # keep letters, digits, +, #
-    s = re.sub(r"[^a-z0-9+#]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def tokenize(s):
-    toks = [t for t in normalize_txt(s).split(" ") if t and t not in STOPWORDS]
-    # map synonyms
-    mapped = []
-    for t in toks:
-        mapped.append(ROLE_SYNONYMS.get(t, t))
-    return set(mapped)
-
-def jaccard(a, b):
-    if not a or not b:
-        return 0.0
-    inter = len(a & b)
-    union = len(a | b)
-    return inter / union if union else 0.0
-
-def clamp01(x):
-    return max(0.0, min(1.0, float(x)))
-
-def detect_remote(tokens, location_txt):
-    loc_tokens = tokenize(location_txt or "")
-    if REMOTE_TOKENS & tokens or REMOTE_TOKENS & loc_tokens:
-        return True
-    return False
-
 def pick_active_profile(conn):
     # prefer 'user_profile', else 'profiles'
     profile_table = None
@@ -118,113 +87,297 @@ def ensure_job_columns(conn):
         cur.execute("ALTER TABLE jobs ADD COLUMN fit_score REAL")
     if "why_base" not in cols:
         cur.execute("ALTER TABLE jobs ADD COLUMN why_base TEXT")
+    if "base_input_hash" not in cols:
+        cur.execute("ALTER TABLE jobs ADD COLUMN base_input_hash TEXT")
     conn.commit()
 
-def fetch_jobs(conn):
-    cur = conn.cursor()
-    # guess available columns
-    cols = get_columns(conn, "jobs")
-    fields = ["id"]
-    for f in ("title","location","company","description","keywords","source","url"):
-        if f in cols:
-            fields.append(f)
-    cur.execute(f"SELECT {', '.join(fields)} FROM jobs")
-    colnames = [d[0] for d in cur.description]
-    rows = [dict(zip(colnames, r)) for r in cur.fetchall()]
-    return rows
+def profile_version(profile):
+    """Fingerprint der Profilfelder, die in den Score eingehen (+ Preset/Formel-Version)."""
+    parts = [PRESET, str(SCORER_VERSION)] + [str(profile.get(k) or "") for k in PROFILE_FIELDS]
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+def input_hash(version, title, location):
+    return hashlib.sha1(f"{version}\0{title or ''}\0{location or ''}".encode("utf-8")).hexdigest()
+
+def iter_job_chunks(conn, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streamt (id, title, location, base_input_hash) in Blöcken per Keyset-Paging –
+    ohne description und ohne fetchall über die ganze Tabelle.
+    Als Near-Duplicate markierte Jobs (duplicate_of, src/near_dupes.py) werden übersprungen.
+    """
+    last_id = -1
+    while True:
+        rows = conn.execute(
+            "SELECT id, title, location, base_input_hash FROM jobs "
+            "WHERE id > ? AND duplicate_of IS NULL ORDER BY id LIMIT ?",
+            (last_id, chunk_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
 
 def compute_base_score(job, profile):
-    title = job.get("title","") or ""
-    location = job.get("location","") or ""
-    # profile fields (best-effort)
-    skills_txt = profile.get("skills","") or ""
-    summary = profile.get("summary","") or ""
-    region = profile.get("region","") or profile.get("preferred_region","") or ""
-
-    title_tokens = tokenize(title)
-    profile_skills = set([s.strip().lower() for s in re.split(r"[;,/|]", skills_txt)]) if skills_txt else set()
-    profile_skills = {normalize_txt(s) for s in profile_skills if s}
-    profile_skills = {ROLE_SYNONYMS.get(s, s) for s in profile_skills if s}
-    # add summary tokens lightly (acts as weak prior)
-    summary_tokens = tokenize(summary) if summary else set()
-
-    # 1) Skill overlap (title vs profile skills/summary)
-    ref_tokens = (profile_skills | summary_tokens)
-    skill_overlap = jaccard(title_tokens, ref_tokens)
-
-    # 2) Role match (any role-like token overlap; ensure consultant/analyst/architect etc. count)
-    role_match = 1.0 if ({"consultant","analyst","architect","engineer","scientist","developer"} & title_tokens) else 0.0
-    # If profile contains a role tag, this boosts role_match when aligned
-    prof_role_tokens = set()
-    for k in ("role","target_role","title","name"):
-        if profile.get(k):
-            prof_role_tokens |= tokenize(str(profile[k]))
-    if prof_role_tokens & title_tokens:
-        role_match = 1.0
-
-    # 3) Location match
-    location_match = 0.0
-    if region:
-        region_norm = normalize_txt(region)
-        if region_norm and region_norm in normalize_txt(location):
-            location_match = 1.0
-    if detect_remote(title_tokens, location):
-        location_match = max(location_match, 0.5)
-
-    # 4) Seniority / level nudges
-    level_bonus = 0.0
-    if NEGATIVE_LEVEL & title_tokens:
-        level_bonus -= 0.25
-    if POSITIVE_LEVEL & title_tokens:
-        level_bonus += 0.05
-
-    # Weighted combination
-    score = 0.55 * skill_overlap + 0.25 * role_match + 0.15 * location_match + 0.05 * (level_bonus + 0.5)
-    # Note: adding 0.5 inside last term keeps the small nudge centered; then clamp.
-    score = clamp01(score)
-
-    # Build why text (one-liner)
-    why_bits = []
-    if skill_overlap >= 0.25:
-        # list up to 2 overlapping tokens (human-friendly)
-        overlap = list((title_tokens & ref_tokens) - STOPWORDS)
-        overlap = [o for o in overlap if o and o not in NEGATIVE_LEVEL][:2]
-        if overlap:
-            why_bits.append("Skills: " + ", ".join(overlap))
-        else:
-            why_bits.append("Skills passen")
-    if role_match >= 1.0:
-        why_bits.append("Rolle passt")
-    if location_match >= 1.0:
-        why_bits.append("Region passt")
-    elif location_match >= 0.5:
-        why_bits.append("Remote/Hybrid möglich")
-    if level_bonus < 0:
-        why_bits.append("⚠️ Einstiegs-/Studierenden-Rolle")
-    elif level_bonus > 0.01:
-        why_bits.append("Senior/Lead möglich")
-
-    if not why_bits:
-        why_bits = ["Basis-Match aus Titel/Ort"]
-
-    why = " · ".join(why_bits)
-    return score, why
-
-def update_job_scores(conn, jobs, profile):
-    cur = conn.cursor()
-    updated = 0
-    for job in jobs:
-        score, why = compute_base_score(job, profile)
-        cur.execute("UPDATE jobs SET base_score=?, why_base=?, fit_score=COALESCE(fit_score, ?) WHERE id=?",
-                    (score, why, score, job["id"]))
-        updated += 1
-    conn.commit()
-    return updated
+    res = score_jobs([job], profile, preset="cli")
+    return float(res["score"][0]), res["why"][0]
+
+# --------------------------------------------------
+# Scoring je Block (auch in Worker-Prozessen)
+# --------------------------------------------------
+_worker_profile = None
+
+def _init_worker(prepared):
+    global _worker_profile
+    _worker_profile = prepared
+
+def score_chunk(jobs, prepared=None):
+    """jobs: Liste (id, title, location, hash) → Liste (score, why, score, hash, id) für executemany."""
+    prepared = prepared or _worker_profile
+    dicts = [{"title": title, "location": location} for _, title, location, _ in jobs]
+    res = score_jobs(dicts, prepared)
+    return [
+        (score, why, score, h, jid)
+        for (jid, _, _, h), score, why in zip(jobs, res["score"].tolist(), res["why"])
+    ]
+
+def _write_chunk(conn, rows):
+    # ein Block = eine Transaktion
+    with conn:
+        conn.executemany(
+            "UPDATE jobs SET base_score=?, why_base=?, fit_score=COALESCE(fit_score, ?), base_input_hash=? WHERE id=?",
+            rows,
+        )
+
+def _pending_chunks(conn, version, full, chunk_size, stats):
+    """Liefert nur Jobs, deren Eingabe-Hash sich geändert hat (bzw. alle bei full=True)."""
+    for chunk in iter_job_chunks(conn, chunk_size):
+        stats["seen"] += len(chunk)
+        todo = []
+        for jid, title, location, old_hash in chunk:
+            h = input_hash(version, title, location)
+            if full or h != old_hash:
+                todo.append((jid, title, location, h))
+        stats["skipped"] += len(chunk) - len(todo)
+        if todo:
+            yield todo
+
+def update_job_scores(conn, profile, full=False, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Bewertet neue/geänderte Jobs und schreibt blockweise per executemany.
+    Gibt {"seen", "scored", "skipped"} zurück.
+    """
+    version = profile_version(profile)
+    prepared = prepare_profile(profile, PRESET)
+    stats = {"seen": 0, "scored": 0, "skipped": 0}
+    pending = _pending_chunks(conn, version, full, chunk_size, stats)
+
+    if workers and workers > 1:
+        # Lesen/Schreiben bleibt im Hauptprozess (eine SQLite-Verbindung),
+        # nur das Scoring läuft parallel – in Fenstern von 2 Blöcken je Worker
+        with Pool(workers, initializer=_init_worker, initargs=(prepared,)) as pool:
+            window = []
+            for todo in pending:
+                window.append(todo)
+                if len(window) >= 2 * workers:
+                    for rows in pool.map(score_chunk, window):
+                        _write_chunk(conn, rows)
+                        stats["scored"] += len(rows)
+                    window = []
+            for rows in pool.map(score_chunk, window):
+                _write_chunk(conn, rows)
+                stats["scored"] += len(rows)
+    else:
+        for todo in pending:
+            rows = score_chunk(todo, prepared)
+            _write_chunk(conn, rows)
+            stats["scored"] += len(rows)
+    return stats
 
-def main():
+# --------------------------------------------------
+# Jobs × Profile (Tabelle job_profile_scores)
+# --------------------------------------------------
+def load_profiles(conn):
+    cur = conn.execute("SELECT * FROM profiles ORDER BY id")
+    colnames = [d[0] for d in cur.description]
+    return [scoring_profile(dict(zip(colnames, r))) for r in cur.fetchall()]
+
+def scoring_profile(profile):
+    """profiles-Zeilen haben description_text statt summary."""
+    p = dict(profile)
+    p["summary"] = p.get("summary") or p.get("description_text") or ""
+    return p
+
+def _score_profile_chunk(conn, chunk, profiles, versions, prepared, full, stats):
+    """Ein Job-Block gegen mehrere Profile: einmal tokenisieren, nur geänderte Paare schreiben."""
+    stored = {}
+    if not full:
+        stored = {
+            (jid, pid): h
+            for jid, pid, h in conn.execute(
+                "SELECT job_id, profile_id, input_hash FROM job_profile_scores WHERE job_id BETWEEN ? AND ?",
+                (chunk[0][0], chunk[-1][0]),
+            )
+        }
+    jobs = [{"title": title, "location": location} for _, title, location, _ in chunk]
+    tokens = None
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
+    for profile, version, prep in zip(profiles, versions, prepared):
+        hashes = [input_hash(version, title, location) for _, title, location, _ in chunk]
+        todo = [i for i, (row, h) in enumerate(zip(chunk, hashes))
+                if full or stored.get((row[0], profile["id"])) != h]
+        stats["seen"] += len(chunk)
+        stats["skipped"] += len(chunk) - len(todo)
+        if not todo:
+            continue
+        if tokens is None:
+            tokens = tokenize_jobs(jobs)
+        res = score_jobs(jobs, prep, tokens=tokens)
+        scores = res["score"].tolist()
+        rows.extend(
+            (chunk[i][0], profile["id"], scores[i], res["why"][i], hashes[i], now) for i in todo
+        )
+    if rows:
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO job_profile_scores (job_id, profile_id, base_score, why_base, input_hash, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id, profile_id) DO UPDATE SET
+                    base_score = excluded.base_score,
+                    why_base = excluded.why_base,
+                    input_hash = excluded.input_hash,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+        stats["scored"] += len(rows)
+
+def _candidate_tokens(prep):
+    """Titel-Tokens, die skill_overlap, role_match oder Remote (location_match) auslösen."""
+    return prep.ref_tokens | prep.role_tokens | ROLE_TOKENS | prep.preset.remote_tokens
+
+def _candidate_locations(conn, prep):
+    """Gespeicherte Orte, die Region oder Remote treffen (wenige verschiedene Werte, in Python geprüft)."""
+    remote = prep.preset.remote_tokens
+    return [
+        loc for (loc,) in conn.execute("SELECT DISTINCT location FROM jobs WHERE location IS NOT NULL")
+        if remote & tokenize(loc) or (prep.region_norm and prep.region_norm in normalize_txt(loc))
+    ]
+
+def _fill_candidates(conn, prep):
+    """
+    Kandidaten in die Temp-Tabelle _cand: Titel teilt ein Token aus _candidate_tokens
+    (per job_tokens) oder der Ort trifft Region/Remote. Genau diese Jobs haben
+    skill_overlap, role_match oder location_match > 0.
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _cand (job_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM _cand")
+    tokens = sorted(_candidate_tokens(prep))
+    for i in range(0, len(tokens), 500):
+        part = tokens[i:i + 500]
+        conn.execute(
+            f"INSERT OR IGNORE INTO _cand SELECT DISTINCT job_id FROM job_tokens WHERE token IN ({','.join('?' * len(part))})",
+            part,
+        )
+    locations = _candidate_locations(conn, prep)
+    for i in range(0, len(locations), 500):
+        part = locations[i:i + 500]
+        conn.execute(
+            f"INSERT OR IGNORE INTO _cand SELECT id FROM jobs WHERE location IN ({','.join('?' * len(part))})",
+            part,
+        )
+    return conn.execute("SELECT COUNT(*) FROM _cand").fetchone()[0]
+
+def iter_candidate_chunks(conn, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Wie iter_job_chunks, aber nur über die Jobs in _cand."""
+    last_id = -1
+    while True:
+        rows = conn.execute(
+            """
+            SELECT j.id, j.title, j.location, NULL
+            FROM _cand c JOIN jobs j ON j.id = c.job_id
+            WHERE c.job_id > ? AND j.duplicate_of IS NULL ORDER BY c.job_id LIMIT ?
+            """,
+            (last_id, chunk_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+def update_profile_matrix(conn, profiles, full=False, chunk_size=DEFAULT_CHUNK_SIZE, prefilter=False):
+    """
+    Bewertet alle Jobs gegen alle Profile in einem Durchlauf: jeder Job-Block wird
+    einmal tokenisiert und für jedes Profil wiederverwendet. Inkrementell über
+    job_profile_scores.input_hash. Gibt {"seen", "scored", "skipped"} (Paare) zurück.
+
+    prefilter=True nutzt den Token-Index (job_tokens): je Profil werden nur Jobs
+    bewertet, deren Titel ein Token mit Skills/Summary/Rollen des Profils, den
+    generischen Rollen (ROLE_TOKENS) oder den Remote-Tokens teilt bzw. deren Ort
+    Region/Remote trifft. Alle anderen hätten skill_overlap, role_match und
+    location_match = 0, also nur den Level-Sockel (≤ 0.0275) als Score; sie landen
+    nicht in job_profile_scores (alte Einträge dafür werden entfernt).
+    """
+    versions = [profile_version(p) for p in profiles]
+    prepared = [prepare_profile(p, PRESET) for p in profiles]
+    stats = {"seen": 0, "scored": 0, "skipped": 0}
+
+    if not prefilter:
+        for chunk in iter_job_chunks(conn, chunk_size):
+            _score_profile_chunk(conn, chunk, profiles, versions, prepared, full, stats)
+        return stats
+
+    (total,) = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()
+    for profile, version, prep in zip(profiles, versions, prepared):
+        n_cand = _fill_candidates(conn, prep)
+        stats["skipped"] += total - n_cand
+        for chunk in iter_candidate_chunks(conn, chunk_size):
+            _score_profile_chunk(conn, chunk, [profile], [version], [prep], full, stats)
+        with conn:
+            conn.execute(
+                "DELETE FROM job_profile_scores WHERE profile_id = ? AND job_id NOT IN (SELECT job_id FROM _cand)",
+                (profile["id"],),
+            )
+    stats["seen"] = total * len(profiles)
+    return stats
+
+def run_all_profiles(conn, args):
+    if not table_exists(conn, "profiles"):
+        raise RuntimeError("Tabelle 'profiles' fehlt in der Datenbank.")
+    profiles = load_profiles(conn)
+    if not profiles:
+        print("Keine Profile gefunden.")
+        return
+    stats = update_profile_matrix(conn, profiles, full=args.full, chunk_size=args.chunk_size,
+                                  prefilter=args.prefilter)
+    if not stats["seen"]:
+        print("Keine Jobs gefunden – bitte zuerst den Research-Prozess ausführen.")
+        return
+    for p in profiles:
+        top = conn.execute(
+            "SELECT base_score FROM job_profile_scores WHERE profile_id=? ORDER BY base_score DESC LIMIT 1",
+            (p["id"],),
+        ).fetchone()
+        print(f"[{p['id']:>3}] {p.get('name') or '-'}: Top-Score {top[0] if top else 0:0.3f}")
+    print(f"Aktualisiert: {stats['scored']} Job×Profil-Paare  •  unverändert: {stats['skipped']}  •  "
+          f"{len(profiles)} Profile  •  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+def main(argv=None):
     ap = argparse.ArgumentParser(description="Compute lightweight BaseScore for jobs using profile & title/loc only.")
     ap.add_argument("--db", default="data/career_agent.db", help="Path to SQLite DB (default: data/career_agent.db)")
-    args = ap.parse_args()
+    ap.add_argument("--full", action="store_true", help="Rescore all jobs, ignoring stored input hashes")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes for scoring (default: 1)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Rows per chunk/transaction (default: {DEFAULT_CHUNK_SIZE})")
+    ap.add_argument("--all-profiles", action="store_true", help="Score all profiles into job_profile_scores (jobs x profiles)")
+    ap.add_argument("--prefilter", action="store_true", help="With --all-profiles: only score jobs sharing a title token with the profile (job_tokens index)")
+    args = ap.parse_args(argv)
+    if args.prefilter and not args.all_profiles:
+        ap.error("--prefilter wirkt nur zusammen mit --all-profiles")
+
+    # Migrationen immer anwenden: beide Modi lesen jobs.duplicate_of (v7),
+    # --all-profiles zusätzlich job_profile_scores / job_tokens
+    ensure_schema(args.db)
 
     conn = sqlite3.connect(args.db)
     try:
@@ -233,35 +386,38 @@ def main():
             raise RuntimeError("Tabelle 'jobs' fehlt in der Datenbank.")
         ensure_job_columns(conn)
 
+        if args.all_profiles:
+            run_all_profiles(conn, args)
+            return
+
         # pick active profile
         profile = pick_active_profile(conn)
 
-        # fetch jobs
-        jobs = fetch_jobs(conn)
-        if not jobs:
+        # compute & update (gestreamt, nur neue/geänderte Jobs)
+        stats = update_job_scores(conn, profile, full=args.full,
+                                  workers=args.workers, chunk_size=args.chunk_size)
+        if not stats["seen"]:
             print("Keine Jobs gefunden – bitte zuerst den Research-Prozess ausführen.")
             return
 
-        # compute & update
-        n = update_job_scores(conn, jobs, profile)
-
         # Show preview Top-20
         cur = conn.cursor()
-        cur.execute(\"""
+        cur.execute("""
             SELECT id, title, location, base_score, why_base
             FROM jobs
             ORDER BY base_score DESC, id ASC
             LIMIT 20
-        \""")
+        """)
         rows = cur.fetchall()
-        print("\\nTop 20 nach BaseScore:")
+        print("\nTop 20 nach BaseScore:")
         print("-"*80)
         for r in rows:
             jid, title, location, score, why = r
             print(f"[{jid:>4}] {score:0.3f}  {title} — {location or '-'}")
             print(f"      {why}")
         print("-"*80)
-        print(f"Aktualisiert: {n} Jobs  •  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Aktualisiert: {stats['scored']} Jobs  •  unverändert: {stats['skipped']}  •  "
+              f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     finally:
         conn.close()
 
@@ -0,0 +1,16 @@
+from typing import Dict, List
+
+# --------------------------------------------------
+# Query-Erweiterung: Profiltitel → Ausgangsbegriffe für die Klassifikation
+# --------------------------------------------------
+
+TITLE_MAP: Dict[str, List[str]] = {
+    "KI-Enablement Manager": ["Datenanalyst", "Projektleiter KI", "Data Scientist"],
+    "Office & CRM Coordinator": ["Bürokaufmann", "Verwaltung", "Sachbearbeiter"],
+    "Marketing Operations & Content Manager": ["Marketing Manager", "Online-Marketing", "Kommunikation"],
+}
+
+
+def query_terms(profile_title: str) -> List[str]:
+    """Ausgangsbegriffe für einen Profiltitel (ohne Eintrag: der Titel selbst)."""
+    return list(TITLE_MAP.get(profile_title, [profile_title]))
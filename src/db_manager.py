@@ -1,111 +1,663 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+from .tokenizer import tokenize
+
+DB_PATH = "data/career_agent.db"
+
+# --------------------------------------------------
+# Verbindungsverwaltung (eine Verbindung pro Thread und DB-Datei)
+# --------------------------------------------------
+MMAP_SIZE = 256 * 1024 * 1024
+STATEMENT_CACHE_SIZE = 256
+
+_local = threading.local()
+
+
+def _configure(conn):
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA busy_timeout=5000;")
+
+
+def get_connection(db_path=DB_PATH):
+    """
+    Liefert die langlebige Verbindung des aktuellen Threads für `db_path`.
+    WAL, synchronous=NORMAL, mmap und Statement-Cache sind aktiv; die
+    Verbindung läuft im Autocommit-Modus – Schreibvorgänge über transaction().
+    Nicht schließen: sie wird beim nächsten Aufruf wiederverwendet.
+    """
+    key = os.path.abspath(str(db_path))
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(key)
+    if conn is None:
+        conn = sqlite3.connect(key, isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
+        _configure(conn)
+        conns[key] = conn
+    return conn
+
+
+@contextmanager
+def transaction(db_path=DB_PATH):
+    """
+    Transaktion auf der Thread-Verbindung: COMMIT bei Erfolg, ROLLBACK bei Exception.
+    Verschachtelte Aufrufe laufen in der äußeren Transaktion mit.
+    """
+    conn = get_connection(db_path)
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def close_connections():
+    """Schließt alle Verbindungen des aktuellen Threads (z. B. am Ende eines CLI-Laufs)."""
+    conns = getattr(_local, "conns", None) or {}
+    for conn in conns.values():
+        conn.close()
+    conns.clear()
+
 # --------------------------------------------------
-# Schema-Migration (führt sich beim App-Start einmal aus)
+# Schema-Migration (versioniert über Tabelle schema_version)
 # --------------------------------------------------
-def migrate_schema(db_path="data/career_agent.db"):
-    """Stellt sicher, dass alle benötigten Spalten existieren."""
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+def _col_exists(cur, table, col):
+    cur.execute(f"PRAGMA table_info({table});")
+    return any(r[1] == col for r in cur.fetchall())
+
 
-    def col_exists(table, col):
-        cur.execute(f"PRAGMA table_info({table});")
-        return any(r[1] == col for r in cur.fetchall())
+def _m001_base_columns(cur):
+    """Tabellen jobs/feedback und alle bisher nachgerüsteten Spalten."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            company TEXT,
+            location TEXT,
+            description TEXT,
+            url TEXT,
+            source TEXT,
+            fit_score REAL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER REFERENCES jobs(id),
+            profile_id INTEGER,
+            feedback_value INTEGER,
+            base_score REAL,
+            feedback_score REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
 
     # --- Tabelle jobs ---
-    if not col_exists("jobs", "match_score"):
+    if not _col_exists(cur, "jobs", "match_score"):
         cur.execute("ALTER TABLE jobs ADD COLUMN match_score REAL;")
-    if not col_exists("jobs", "matched_profile_id"):
+    if not _col_exists(cur, "jobs", "matched_profile_id"):
         cur.execute("ALTER TABLE jobs ADD COLUMN matched_profile_id INTEGER REFERENCES profiles(id);")
-    if not col_exists("jobs", "obsolete_user_profile_id"):
+    if not _col_exists(cur, "jobs", "obsolete_user_profile_id"):
         cur.execute("ALTER TABLE jobs ADD COLUMN obsolete_user_profile_id INTEGER;")
-    if not col_exists("jobs", "refnr"):
+    if not _col_exists(cur, "jobs", "refnr"):
         cur.execute("ALTER TABLE jobs ADD COLUMN refnr TEXT;")
-    if not col_exists("jobs", "date_posted"):
+    if not _col_exists(cur, "jobs", "date_posted"):
         cur.execute("ALTER TABLE jobs ADD COLUMN date_posted TEXT;")
 
     # --- Tabelle feedback ---
-    if not col_exists("feedback", "match_score"):
+    for col, typ in (("profile_id", "INTEGER"), ("feedback_value", "INTEGER"),
+                     ("base_score", "REAL"), ("feedback_score", "REAL")):
+        if not _col_exists(cur, "feedback", col):
+            cur.execute(f"ALTER TABLE feedback ADD COLUMN {col} {typ};")
+    if not _col_exists(cur, "feedback", "match_score"):
         cur.execute("ALTER TABLE feedback ADD COLUMN match_score REAL;")
-    if not col_exists("feedback", "comment"):
+    if not _col_exists(cur, "feedback", "comment"):
         cur.execute("ALTER TABLE feedback ADD COLUMN comment TEXT;")
 
-    conn.commit()
-    conn.close()
+
+def _m002_indexes_and_uniques(cur):
+    """
+    Indizes für die heißen Lookup-Pfade + Unique-Constraints für native Upserts.
+    Vorhandene Dubletten werden vorher zusammengeführt.
+    """
+    # jobs: pro refnr nur eine Zeile – Feedback auf die älteste Zeile umhängen
+    cur.execute("""
+        CREATE TEMP TABLE _job_dupes AS
+        SELECT j.id AS dup_id, k.keep_id
+        FROM jobs j
+        JOIN (SELECT refnr, MIN(id) AS keep_id FROM jobs
+              WHERE refnr IS NOT NULL GROUP BY refnr HAVING COUNT(*) > 1) k
+          ON j.refnr = k.refnr AND j.id <> k.keep_id
+    """)
+    cur.execute("""
+        UPDATE feedback
+        SET job_id = (SELECT keep_id FROM _job_dupes WHERE dup_id = feedback.job_id)
+        WHERE job_id IN (SELECT dup_id FROM _job_dupes)
+    """)
+    cur.execute("DELETE FROM jobs WHERE id IN (SELECT dup_id FROM _job_dupes)")
+    cur.execute("DROP TABLE _job_dupes")
+
+    # feedback: pro (job_id, profile_id) nur der neueste Eintrag. Zeilen mit NULL
+    # bleiben unangetastet – SQLite fasst NULLs in PARTITION BY zusammen, der
+    # Unique-Index erlaubt sie aber ohnehin mehrfach.
+    cur.execute("""
+        DELETE FROM feedback
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY job_id, profile_id ORDER BY timestamp DESC, id DESC
+                ) AS rn
+                FROM feedback
+                WHERE job_id IS NOT NULL AND profile_id IS NOT NULL
+            ) WHERE rn > 1
+        )
+    """)
+
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_refnr ON jobs(refnr) WHERE refnr IS NOT NULL;")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_jobs_title_company_location ON jobs(title, company, location);")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_feedback_job_profile ON feedback(job_id, profile_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_feedback_profile_ts ON feedback(profile_id, timestamp DESC);")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_feedback_ts ON feedback(timestamp DESC);")
+
+
+def _m003_job_profile_scores(cur):
+    # BaseScore je (Job, Profil) – Profilwechsel in der UI wird zum Lookup
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_profile_scores (
+            job_id INTEGER NOT NULL,
+            profile_id INTEGER NOT NULL,
+            base_score REAL,
+            why_base TEXT,
+            input_hash TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (job_id, profile_id)
+        ) WITHOUT ROWID
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS ix_job_profile_scores_profile "
+        "ON job_profile_scores(profile_id, base_score DESC);"
+    )
+
+
+def _m004_job_tokens(cur):
+    # Invertierter Index Titel-Token → Job (Vorfilter fürs Scoring)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_tokens (
+            token TEXT NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (token, job_id)
+        ) WITHOUT ROWID
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_job_tokens_job ON job_tokens(job_id);")
+    _index_job_tokens(cur, cur.execute("SELECT id, title FROM jobs").fetchall())
+
+
+def _m005_jobs_fts(cur):
+    # Volltextindex über jobs (External Content: keine doppelte Textspeicherung)
+    try:
+        cur.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, company, location, description,
+                content='jobs', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # SQLite ohne FTS5: search_jobs_fulltext fällt auf LIKE zurück
+        print(f"[DB] ⚠️ FTS5 nicht verfügbar, Volltextindex übersprungen: {e}")
+        return
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+            INSERT INTO jobs_fts(rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+    """)
+    cur.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def _m006_search_runs(cur):
+    # Läufe der Hintergrundsuche (src/discovery_daemon.py) + Ergebnisse je Profil
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS search_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            status TEXT NOT NULL DEFAULT 'running',
+            profiles INTEGER,
+            queries INTEGER,
+            jobs_found INTEGER,
+            jobs_new INTEGER,
+            errors INTEGER,
+            seconds REAL,
+            message TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS search_run_results (
+            run_id INTEGER NOT NULL,
+            profile_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            base_score REAL,
+            fit_score REAL,
+            why_base TEXT,
+            PRIMARY KEY (run_id, profile_id, job_id)
+        ) WITHOUT ROWID
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_search_runs_status ON search_runs(status, id DESC);")
+
+
+def _m007_near_duplicates(cur):
+    # Near-Duplicate-Erkennung (src/near_dupes.py): MinHash-Signatur je Job + Verweis aufs Original
+    if not _col_exists(cur, "jobs", "duplicate_of"):
+        cur.execute("ALTER TABLE jobs ADD COLUMN duplicate_of INTEGER;")
+    cur.execute("CREATE INDEX IF NOT EXISTS ix_jobs_duplicate_of ON jobs(duplicate_of);")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL,
+            checked INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # Signatur verwerfen, sobald sich der Inhalt ändert (Upserts mit gleichen Werten lösen nichts aus)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_minhash_au AFTER UPDATE OF title, company, location, description ON jobs
+        WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+          OR old.location IS NOT new.location OR old.description IS NOT new.description
+        BEGIN
+            DELETE FROM job_minhash WHERE job_id = old.id;
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_minhash_ad AFTER DELETE ON jobs BEGIN
+            DELETE FROM job_minhash WHERE job_id = old.id;
+        END
+    """)
+
+
+def _m008_fts_update_only_on_change(cur):
+    # jobs_fts_au lief bei jedem Upsert, auch wenn sich kein Textfeld ändert (Großteil der
+    # Update-Zeit): wie jobs_minhash_au nur noch bei tatsächlicher Änderung neu indexieren
+    if not cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'").fetchone():
+        return  # ohne FTS5 angelegt (siehe _m005_jobs_fts)
+    cur.execute("DROP TRIGGER IF EXISTS jobs_fts_au")
+    cur.execute("""
+        CREATE TRIGGER jobs_fts_au AFTER UPDATE OF title, company, location, description ON jobs
+        WHEN old.title IS NOT new.title OR old.company IS NOT new.company
+          OR old.location IS NOT new.location OR old.description IS NOT new.description
+        BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+            INSERT INTO jobs_fts(rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+    """)
+
+
+# (Version, Beschreibung, Funktion) – neue Migrationen nur hinten anhängen
+MIGRATIONS = [
+    (1, "Basistabellen und Spalten jobs/feedback", _m001_base_columns),
+    (2, "Indizes und Unique-Constraints für Lookups/Upserts", _m002_indexes_and_uniques),
+    (3, "Tabelle job_profile_scores (Jobs × Profile)", _m003_job_profile_scores),
+    (4, "Invertierter Token-Index job_tokens", _m004_job_tokens),
+    (5, "Volltextsuche jobs_fts (FTS5) mit Triggern", _m005_jobs_fts),
+    (6, "Tabellen search_runs/search_run_results (Hintergrundsuche)", _m006_search_runs),
+    (7, "Near-Duplicates: jobs.duplicate_of + job_minhash", _m007_near_duplicates),
+    (8, "jobs_fts_au nur bei geänderten Textfeldern", _m008_fts_update_only_on_change),
+]
+
+
+def get_schema_version(db_path=DB_PATH):
+    """Aktuell angewendete Schema-Version (0 = noch nie migriert)."""
+    cur = get_connection(db_path).cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_version'")
+    if not cur.fetchone():
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cur.fetchone()[0]
+
+
+def migrate_schema(db_path=DB_PATH):
+    """
+    Wendet alle noch fehlenden Migrationen an (jede in eigener Transaktion)
+    und protokolliert sie in schema_version. Gibt die neue Version zurück.
+    """
+    conn = get_connection(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    current = get_schema_version(db_path)
+    for version, name, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        with transaction(db_path) as conn:
+            cur = conn.cursor()
+            migrate(cur)
+            cur.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+        print(f"[DB] Migration {version} angewendet: {name}")
+        current = version
+    return current
+
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class SchemaOutdatedError(RuntimeError):
+    """Die Datenbank ist älter als der Code (Migration ausstehend)."""
+
+
+# abs. DB-Pfad → Fingerprint (SQLite-Schema-Cookie, eigene Version)
+_schema_fingerprints = {}
+_schema_lock = threading.Lock()
+
+
+def _schema_fingerprint(db_path):
+    cookie = get_connection(db_path).execute("PRAGMA schema_version;").fetchone()[0]
+    return cookie, get_schema_version(db_path)
+
+
+def ensure_schema(db_path=DB_PATH, check_only=False):
+    """
+    Migriert höchstens einmal pro Prozess und DB-Datei.
+
+    Folgeaufrufe kosten nur ein PRAGMA schema_version: solange sich das
+    Schema-Cookie nicht geändert hat, ist nichts zu tun. check_only=True
+    migriert nie, sondern wirft SchemaOutdatedError, wenn Migrationen fehlen.
+    """
+    key = os.path.abspath(str(db_path))
+    cached = _schema_fingerprints.get(key)
+    if cached is not None:
+        cookie = get_connection(db_path).execute("PRAGMA schema_version;").fetchone()[0]
+        if cookie == cached[0]:
+            return cached[1]
+
+    with _schema_lock:
+        cookie, version = _schema_fingerprint(db_path)
+        if version < LATEST_SCHEMA_VERSION:
+            if check_only:
+                raise SchemaOutdatedError(
+                    f"DB-Schema {version} < {LATEST_SCHEMA_VERSION} ({key}) – "
+                    f"bitte 'python -m src.db_manager migrate' ausführen."
+                )
+            migrate_schema(db_path)
+            cookie, version = _schema_fingerprint(db_path)
+        _schema_fingerprints[key] = (cookie, version)
+        return version
 
 
 # --------------------------------------------------
 # Jobverwaltung
 # --------------------------------------------------
-def ensure_job_exists(job, matched_profile_id=None, match_score=None, db_path="data/career_agent.db"):
+JOB_FIELDS = (
+    "title", "company", "location", "description", "source", "url",
+    "refnr", "date_posted", "matched_profile_id", "match_score",
+)
+
+
+# Beim Aktualisieren bleiben gespeicherte Werte erhalten, wenn der Eingang sie nicht
+# mitbringt (z. B. Suchtreffer ohne Beschreibung/Datum): leer bzw. None überschreibt nicht.
+_KEEP_IF_EMPTY = ("description", "source", "url")
+_KEEP_IF_NULL = ("refnr", "date_posted", "matched_profile_id", "match_score")
+
+
+def _update_expr(field, new):
+    """SQL-Ausdruck für SET field = … (new: 's.<field>' oder 'excluded.<field>')."""
+    if field in _KEEP_IF_EMPTY:
+        return f"COALESCE(NULLIF({new}, ''), jobs.{field})"
+    if field in _KEEP_IF_NULL:
+        return f"COALESCE({new}, jobs.{field})"
+    return new
+
+
+def _merge_job_rows(old, new):
+    """Zwei Zeilen desselben neuen Jobs im Batch: new gewinnt, außer bei leeren Werten (wie _update_expr)."""
+    merged = dict(new)
+    for f in _KEEP_IF_EMPTY + _KEEP_IF_NULL:
+        if merged[f] in (None, ""):
+            merged[f] = old[f]
+    return merged
+
+
+def _job_row(job, matched_profile_id=None, match_score=None):
+    """Bringt ein Job-Dict (BA- oder DB-Schlüssel) in die Spaltenform der Tabelle jobs."""
+    return {
+        "title": (job.get("titel") or job.get("title") or "").strip(),
+        "company": (job.get("arbeitgeber") or job.get("company") or "").strip(),
+        "location": (job.get("ort") or job.get("location") or "").strip(),
+        "description": job.get("beschreibung") or job.get("description") or "",
+        "source": job.get("source") or "",
+        "url": job.get("url") or "",
+        "refnr": job.get("refnr") or None,
+        "date_posted": job.get("date_posted") or None,  # Default (heute) nur beim Anlegen
+        "matched_profile_id": job.get("matched_profile_id", matched_profile_id),
+        "match_score": job.get("match_score", match_score),
+    }
+
+
+def _resolve_job_ids(cur, rows, pick="MIN", stored_titles=None, same_refnr=False):
     """
-    Legt einen Job an oder aktualisiert ihn.
-    Gibt job_id zurück (legt Datensatz notfalls neu an).
+    Sucht bestehende Job-IDs set-basiert: erst über refnr, dann über
+    (title, company, location) – letzteres nur bei Zeilen ohne oder mit
+    gleicher refnr. Gibt {position: job_id} zurück.
+    pick="MAX" bevorzugt bei Mehrdeutigkeit die neueste Zeile.
+    stored_titles (dict) wird mit {job_id: gespeicherter Titel} gefüllt.
+    same_refnr=True verlangt auch beim Titel-Abgleich identische refnr (frisch angelegte Jobs:
+    eine Zeile ohne refnr darf nicht auf eine gleichnamige neue Zeile mit refnr zeigen).
     """
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-
-    title = (job.get("titel") or "").strip()
-    company = (job.get("arbeitgeber") or "").strip()
-    location = (job.get("ort") or "").strip()
-    description = job.get("beschreibung") or ""
-    source = job.get("source") or ""
-    url = job.get("url") or ""
-    refnr = job.get("refnr") or None
-    date_posted = job.get("date_posted") or datetime.now().strftime("%Y-%m-%d")
-
-    print("\n=== ENSURE_JOB_EXISTS DEBUG ===")
-    print(f"title={title}, company={company}, location={location}, refnr={refnr}")
-
-    # Prüfen, ob Job existiert
-    row = None
-    if refnr:
-        cur.execute("SELECT id FROM jobs WHERE refnr = ?", (refnr,))
-        row = cur.fetchone()
-    if not row:
-        cur.execute(
-            "SELECT id FROM jobs WHERE title=? AND company=? AND location=?",
-            (title, company, location),
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS _job_keys (
+            pos INTEGER PRIMARY KEY, refnr TEXT, title TEXT, company TEXT, location TEXT
         )
-        row = cur.fetchone()
+    """)
+    cur.execute("DELETE FROM _job_keys")
+    cur.executemany(
+        "INSERT INTO _job_keys (pos, refnr, title, company, location) VALUES (?, ?, ?, ?, ?)",
+        [(i, r["refnr"], r["title"], r["company"], r["location"]) for i, r in enumerate(rows)],
+    )
+    found = {}
+    cur.execute(f"""
+        SELECT k.pos, {pick}(j.id), j.title FROM _job_keys k
+        JOIN jobs j ON j.refnr = k.refnr
+        WHERE k.refnr IS NOT NULL
+        GROUP BY k.pos
+    """)
+    hits = cur.fetchall()
+    # j.title gehört bei MIN/MAX in SQLite zur gewählten Zeile
+    cur.execute(f"""
+        SELECT k.pos, {pick}(j.id), j.title FROM _job_keys k
+        JOIN jobs j ON j.title = k.title AND j.company = k.company AND j.location = k.location
+        WHERE {"j.refnr IS k.refnr" if same_refnr else "j.refnr IS NULL OR k.refnr IS NULL OR j.refnr = k.refnr"}
+        GROUP BY k.pos
+    """)
+    hits += cur.fetchall()
+    for pos, job_id, title in hits:
+        if pos not in found:
+            found[pos] = job_id
+            if stored_titles is not None:
+                stored_titles[job_id] = title
+    cur.execute("DELETE FROM _job_keys")
+    return found
 
-    print(f"Bestehender Job: {row}")
 
-    if row:
-        job_id = row[0]
-        cur.execute(
-            """
-            UPDATE jobs
-            SET title=?, company=?, location=?, description=?, source=?, url=?,
-                refnr=?, date_posted=?, matched_profile_id=?, match_score=?
-            WHERE id=?
-            """,
-            (
-                title, company, location, description, source, url,
-                refnr, date_posted, matched_profile_id, match_score, job_id
-            ),
-        )
-        print(f"→ UPDATE Job-ID {job_id}")
-    else:
-        cur.execute(
-            """
-            INSERT INTO jobs
-            (title, company, location, description, source, url, refnr, date_posted, matched_profile_id, match_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                title, company, location, description, source, url,
-                refnr, date_posted, matched_profile_id, match_score
-            ),
+def _index_job_tokens(cur, id_titles, replace_ids=None):
+    """
+    Schreibt die Index-Einträge der übergebenen Jobs: [(job_id, title), ...].
+    Alte Einträge werden für replace_ids entfernt (Default: alle übergebenen IDs;
+    frisch angelegte Jobs haben noch keine).
+    """
+    id_titles = list(id_titles)
+    if not id_titles:
+        return
+    if replace_ids is None:
+        replace_ids = [job_id for job_id, _ in id_titles]
+    cur.executemany("DELETE FROM job_tokens WHERE job_id = ?", [(job_id,) for job_id in replace_ids])
+    cur.executemany(
+        "INSERT OR IGNORE INTO job_tokens (token, job_id) VALUES (?, ?)",
+        [(tok, job_id) for job_id, title in id_titles for tok in tokenize(title)],
+    )
+
+
+def upsert_jobs(jobs, matched_profile_id=None, match_score=None, db_path=DB_PATH):
+    """
+    Legt viele Jobs in einer Transaktion an oder aktualisiert sie.
+
+    - bestehende Jobs werden in einer set-basierten Abfrage gefunden
+      (refnr, sonst title/company/location) – wie bei ensure_job_exists
+    - Inserts und Updates laufen per executemany
+    - matched_profile_id / match_score gelten für alle Jobs, sofern ein Job
+      sie nicht selbst mitbringt
+
+    Gibt die Job-IDs in Eingabereihenfolge zurück (Position i ↔ jobs[i]).
+    """
+    rows = [_job_row(j, matched_profile_id, match_score) for j in jobs]
+    if not rows:
+        return []
+
+    with transaction(db_path) as conn:
+        cur = conn.cursor()
+        stored_titles = {}
+        existing = _resolve_job_ids(cur, rows, stored_titles=stored_titles)
+        # Eine neue refnr darf im Batch nur an einer bestehenden Zeile landen (ux_jobs_refnr):
+        # gleiche refnr → gleiche Zeile; eine Zeile, die schon eine andere neue refnr
+        # bekommt, wird nicht überschrieben – der Job wird stattdessen neu angelegt.
+        refnr_owner, owner_refnr = {}, {}
+        for i in sorted(existing):
+            refnr, job_id = rows[i]["refnr"], existing[i]
+            if not refnr:
+                continue
+            if refnr in refnr_owner:
+                existing[i] = refnr_owner[refnr]
+            elif owner_refnr.setdefault(job_id, refnr) != refnr:
+                del existing[i]
+            else:
+                refnr_owner[refnr] = job_id
+        (max_id_before,) = cur.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()
+
+        # Neue Jobs, die innerhalb des Batches mehrfach vorkommen, nur einmal anlegen
+        # (spätere Vorkommen überschreiben die Werte – wie aufeinanderfolgende Upserts)
+        inserts = {}           # Position des ersten Vorkommens → Zeile
+        alias = {}             # Position → Position des ersten Vorkommens
+        by_refnr, by_key = {}, {}
+        for i, r in enumerate(rows):
+            if i in existing:
+                continue
+            key = (r["title"], r["company"], r["location"])
+            first = by_refnr.get(r["refnr"]) if r["refnr"] else None
+            if first is None:
+                first = by_key.get(key)
+                # gleicher Inhalt, aber andere refnr → eigene Stelle
+                if first is not None and r["refnr"] and inserts[first]["refnr"] not in (None, r["refnr"]):
+                    first = None
+            if first is None:
+                first = i
+            else:
+                r = _merge_job_rows(inserts.pop(first), r)
+            inserts[first] = r
+            alias[i] = first
+            if r["refnr"]:
+                by_refnr.setdefault(r["refnr"], first)
+            by_key.setdefault(key, first)
+
+        # Mehrfache Updates derselben ID vorab zusammenführen (wie aufeinanderfolgende Upserts)
+        updates = {}
+        for i, job_id in sorted(existing.items()):
+            updates[job_id] = _merge_job_rows(updates[job_id], rows[i]) if job_id in updates else rows[i]
+
+        # Schreiben set-basiert über eine Staging-Tabelle: je eine Anweisung für alle
+        # Updates bzw. Inserts. Zeilenweise Anweisungen kosten vor allem in den
+        # FTS-Triggern ein Vielfaches (eigene Anweisung je Zeile im FTS5-Index).
+        cur.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS _job_rows (
+                job_id INTEGER, pos INTEGER, {', '.join(JOB_FIELDS)}
+            )
+        """)
+        cur.execute("DELETE FROM _job_rows")
+        cur.executemany(
+            f"INSERT INTO _job_rows (job_id, pos, {', '.join(JOB_FIELDS)}) "
+            f"VALUES ({', '.join('?' * (len(JOB_FIELDS) + 2))})",
+            [(job_id, None) + tuple(r[f] for f in JOB_FIELDS) for job_id, r in updates.items()]
+            + [(None, pos) + tuple(r[f] for f in JOB_FIELDS) for pos, r in inserts.items()],
         )
-        job_id = cur.lastrowid
-        print(f"→ INSERT Job-ID {job_id}")
+        if updates:
+            cur.execute(f"""
+                UPDATE jobs SET {', '.join(f'{f} = ' + _update_expr(f, f's.{f}') for f in JOB_FIELDS)}
+                FROM _job_rows s WHERE s.job_id = jobs.id
+            """)
+        if inserts:
+            # ON CONFLICT fängt refnr ab, die zwischenzeitlich ein anderer Prozess angelegt hat
+            cur.execute(f"""
+                INSERT INTO jobs ({', '.join(JOB_FIELDS)})
+                SELECT {', '.join(JOB_FIELDS)} FROM _job_rows WHERE job_id IS NULL ORDER BY pos
+                ON CONFLICT(refnr) WHERE refnr IS NOT NULL DO UPDATE SET
+                    {', '.join(f'{f} = ' + _update_expr(f, f'excluded.{f}') for f in JOB_FIELDS if f != 'refnr')}
+            """)
+            # neue Jobs ohne Datum: heute (erst nach dem INSERT, damit der ON-CONFLICT-Zweig
+            # kein gespeichertes Datum überschreibt)
+            cur.execute("UPDATE jobs SET date_posted = ? WHERE id > ? AND date_posted IS NULL",
+                        (datetime.now().strftime("%Y-%m-%d"), max_id_before))
+            # IDs der neuen Zeilen gezielt nachschlagen
+            firsts = list(inserts.keys())
+            new_ids = _resolve_job_ids(cur, [inserts[p] for p in firsts], pick="MAX", same_refnr=True)
+            inserted = {firsts[k]: job_id for k, job_id in new_ids.items()}
+            for i, first in alias.items():
+                existing[i] = inserted[first]
+        cur.execute("DELETE FROM _job_rows")
+
+        # Token-Index nur für neue Jobs und geänderte Titel nachziehen (letzter Titel je ID
+        # gewinnt). Neue IDs (> max_id_before) haben keine Einträge – außer bei
+        # wiederverwendeten IDs, die räumt ein einzelnes Range-DELETE ab.
+        id_titles = {existing[i]: rows[i]["title"] for i in range(len(rows))}
+        id_titles = {j: t for j, t in id_titles.items() if j > max_id_before or stored_titles.get(j) != t}
+        cur.execute("DELETE FROM job_tokens WHERE job_id > ?", (max_id_before,))
+        _index_job_tokens(cur, id_titles.items(), replace_ids=[j for j in id_titles if j <= max_id_before])
 
-    conn.commit()
-    conn.close()
-    print("✅ Job gespeichert\n")
-    return job_id
+    if len(rows) > 1:  # Einzel-Upserts (ensure_job_exists) loggen nicht je Job
+        print(f"[DB] {len(rows)} Jobs gespeichert ({len(inserts)} neu)")
+    return [existing[i] for i in range(len(rows))]
+
+
+def ensure_job_exists(job, matched_profile_id=None, match_score=None, db_path=DB_PATH):
+    """
+    Legt einen Job an oder aktualisiert ihn.
+    Gibt job_id zurück (legt Datensatz notfalls neu an).
+    """
+    job = dict(job, matched_profile_id=matched_profile_id, match_score=match_score)
+    return upsert_jobs([job], db_path=db_path)[0]
 
 # --------------------------------------------------
 # Feedbackverwaltung
@@ -118,7 +670,7 @@ def save_feedback(
     match_score=None,
     base_score=None,
     feedback_score=None,
-    db_path="data/career_agent.db"
+    db_path=DB_PATH
 ):
     """
     Speichert Feedback mit optionalem Kommentar und Score.
@@ -129,45 +681,25 @@ def save_feedback(
     - feedback_score: tatsächliche Bewertung nach Feedback
     """
     try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        cur.execute(
-            "SELECT id FROM feedback WHERE job_id=? AND profile_id=? ORDER BY timestamp DESC LIMIT 1",
-            (job_id, profile_id),
-        )
-        row = cur.fetchone()
-
-        if row:
-            feedback_id = row[0]
-            cur.execute(
-                """
-                UPDATE feedback
-                SET feedback_value = ?,
-                    comment = ?,
-                    match_score = ?,
-                    base_score = ?,
-                    feedback_score = ?,
-                    timestamp = ?
-                WHERE id = ?
-                """,
-                (feedback_value, comment, match_score, base_score, feedback_score, ts, feedback_id),
-            )
-        else:
-            cur.execute(
+        with transaction(db_path) as conn:
+            conn.execute(
                 """
                 INSERT INTO feedback
                     (job_id, profile_id, feedback_value, comment,
                      match_score, base_score, feedback_score, timestamp)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(job_id, profile_id) DO UPDATE SET
+                    feedback_value = excluded.feedback_value,
+                    comment = excluded.comment,
+                    match_score = excluded.match_score,
+                    base_score = excluded.base_score,
+                    feedback_score = excluded.feedback_score,
+                    timestamp = excluded.timestamp
                 """,
                 (job_id, profile_id, feedback_value, comment,
                  match_score, base_score, feedback_score, ts),
             )
-
-        conn.commit()
-        conn.close()
         return True
 
     except Exception as e:
@@ -178,22 +710,16 @@ def save_feedback(
 # --------------------------------------------------
 # Hilfsfunktionen zum Laden (optional für Analysen)
 # --------------------------------------------------
-def load_feedback_for_profile(profile_id, db_path="data/career_agent.db"):
+def load_feedback_for_profile(profile_id, db_path=DB_PATH):
     """Lädt Feedback-Einträge für ein Profil."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    cur = get_connection(db_path).cursor()
     cur.execute("SELECT * FROM feedback WHERE profile_id = ? ORDER BY timestamp DESC;", (profile_id,))
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [dict(r) for r in cur.fetchall()]
 
 
-def load_jobs_with_feedback(db_path="data/career_agent.db"):
+def load_jobs_with_feedback(db_path=DB_PATH):
     """Lädt Jobs mit Feedback-Zusammenhang (Join)."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    cur = get_connection(db_path).cursor()
     cur.execute(
         """
         SELECT j.id AS job_id, j.title, j.company, j.location, j.match_score,
@@ -203,6 +729,226 @@ def load_jobs_with_feedback(db_path="data/career_agent.db"):
         ORDER BY f.timestamp DESC
         """
     )
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
\ No newline at end of file
+    return [dict(r) for r in cur.fetchall()]
+
+
+def reindex_job_tokens(db_path=DB_PATH):
+    """Baut job_tokens komplett neu auf (z. B. nach Änderungen am Tokenizer)."""
+    with transaction(db_path) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM job_tokens")
+        _index_job_tokens(cur, cur.execute("SELECT id, title FROM jobs").fetchall())
+        (n,) = cur.execute("SELECT COUNT(*) FROM job_tokens").fetchone()
+    print(f"[DB] Token-Index neu aufgebaut ({n} Einträge)")
+    return n
+
+
+def load_job_profile_scores(profile_id, limit=None, min_score=None, db_path=DB_PATH):
+    """
+    Vorberechnete BaseScores eines Profils (siehe compute_basescore.py --all-profiles),
+    absteigend nach Score, inkl. Jobfeldern.
+    """
+    sql = """
+        SELECT s.job_id, s.base_score, s.why_base, s.updated_at,
+               j.title, j.company, j.location, j.url, j.refnr
+        FROM job_profile_scores s
+        JOIN jobs j ON j.id = s.job_id
+        WHERE s.profile_id = ? AND j.duplicate_of IS NULL
+    """
+    params = [profile_id]
+    if min_score is not None:
+        sql += " AND s.base_score >= ?"
+        params.append(min_score)
+    sql += " ORDER BY s.base_score DESC, s.job_id ASC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    cur = get_connection(db_path).cursor()
+    cur.execute(sql, params)
+    return [dict(r) for r in cur.fetchall()]
+
+
+# --------------------------------------------------
+# Hintergrundsuche: Läufe und vorberechnete Ergebnisse
+# --------------------------------------------------
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def start_search_run(db_path=DB_PATH):
+    """Legt einen Lauf mit status='running' an und gibt seine ID zurück."""
+    with transaction(db_path) as conn:
+        cur = conn.execute("INSERT INTO search_runs (started_at, status) VALUES (?, 'running')", (_now(),))
+        return cur.lastrowid
+
+
+def finish_search_run(run_id, status="ok", seconds=None, message=None, db_path=DB_PATH, **counts):
+    """Schließt einen Lauf ab; counts: profiles, queries, jobs_found, jobs_new, errors."""
+    fields = {k: v for k, v in counts.items() if k in ("profiles", "queries", "jobs_found", "jobs_new", "errors")}
+    sets = ", ".join(f"{k} = ?" for k in fields)
+    with transaction(db_path) as conn:
+        conn.execute(
+            f"UPDATE search_runs SET finished_at = ?, status = ?, seconds = ?, message = ?"
+            f"{', ' + sets if sets else ''} WHERE id = ?",
+            (_now(), status, seconds, message, *fields.values(), run_id),
+        )
+
+
+def save_search_run_results(run_id, profile_id, rows, db_path=DB_PATH):
+    """rows: [(job_id, base_score, fit_score, why_base), ...]"""
+    with transaction(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO search_run_results
+                (run_id, profile_id, job_id, base_score, fit_score, why_base)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [(run_id, profile_id, *r) for r in rows],
+        )
+
+
+def prune_search_runs(keep=20, db_path=DB_PATH):
+    """Behält nur die letzten `keep` Läufe (samt Ergebnissen)."""
+    with transaction(db_path) as conn:
+        conn.execute(
+            "DELETE FROM search_run_results WHERE run_id NOT IN (SELECT id FROM search_runs ORDER BY id DESC LIMIT ?)",
+            (keep,),
+        )
+        conn.execute("DELETE FROM search_runs WHERE id NOT IN (SELECT id FROM search_runs ORDER BY id DESC LIMIT ?)", (keep,))
+
+
+def load_search_runs(limit=10, db_path=DB_PATH):
+    cur = get_connection(db_path).execute("SELECT * FROM search_runs ORDER BY id DESC LIMIT ?", (limit,))
+    return [dict(r) for r in cur.fetchall()]
+
+
+def load_latest_run_results(profile_id, db_path=DB_PATH):
+    """
+    Ergebnisse des letzten erfolgreichen Laufs (status "ok" oder "partial") für ein
+    Profil, absteigend nach Fit-Score.
+    Gibt (run, jobs) zurück; run ist None, wenn es noch keinen Lauf gibt.
+    """
+    conn = get_connection(db_path)
+    run = conn.execute(
+        """
+        SELECT r.* FROM search_runs r
+        WHERE r.status IN ('ok', 'partial')
+          AND EXISTS (SELECT 1 FROM search_run_results x WHERE x.run_id = r.id AND x.profile_id = ?)
+        ORDER BY r.id DESC LIMIT 1
+        """,
+        (profile_id,),
+    ).fetchone()
+    if run is None:
+        return None, []
+    cur = conn.execute(
+        """
+        SELECT j.id AS job_id, j.title, j.company, j.location, j.url, j.refnr, j.source,
+               x.base_score, x.fit_score, x.why_base
+        FROM search_run_results x
+        JOIN jobs j ON j.id = x.job_id
+        WHERE x.run_id = ? AND x.profile_id = ? AND j.duplicate_of IS NULL
+        ORDER BY x.fit_score DESC, x.base_score DESC
+        """,
+        (run["id"], profile_id),
+    )
+    return dict(run), [dict(r) for r in cur.fetchall()]
+
+
+# --------------------------------------------------
+# Volltextsuche über gespeicherte Jobs (FTS5, BM25)
+# --------------------------------------------------
+FTS_WEIGHTS = (10.0, 3.0, 2.0, 1.0)  # title, company, location, description
+
+
+def _fts_query(text):
+    """Freitext → FTS5-Ausdruck: jedes Wort als Präfix-Phrase, alle Wörter müssen vorkommen."""
+    words = [w.replace('"', '""') for w in (text or "").split()]
+    return " ".join(f'"{w}"*' for w in words if w.strip('"'))
+
+
+def fts_available(db_path=DB_PATH):
+    row = get_connection(db_path).execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+    ).fetchone()
+    return row is not None
+
+
+def search_jobs_fulltext(query, limit=50, db_path=DB_PATH):
+    """
+    Sucht in title/company/location/description der gespeicherten Jobs.
+    Ranking per BM25 (Titel am stärksten gewichtet); `rank` ist kleiner = besser.
+    Gibt Dicts mit Jobfeldern, rank und snippet (Ausschnitt aus der Beschreibung) zurück.
+    """
+    match = _fts_query(query)
+    if not match:
+        return []
+    conn = get_connection(db_path)
+    if fts_available(db_path):
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        cur = conn.execute(
+            f"""
+            SELECT j.id AS job_id, j.title, j.company, j.location, j.url, j.refnr,
+                   j.source, j.date_posted,
+                   bm25(jobs_fts, {weights}) AS rank,
+                   snippet(jobs_fts, 3, '**', '**', ' … ', 16) AS snippet
+            FROM jobs_fts
+            JOIN jobs j ON j.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH ? AND j.duplicate_of IS NULL
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (match, int(limit)),
+        )
+        return [dict(r) for r in cur.fetchall()]
+
+    # Fallback ohne FTS5: alle Wörter per LIKE, ohne Ranking
+    words = (query or "").split()
+    where = " AND ".join(
+        "(title LIKE ? OR company LIKE ? OR location LIKE ? OR description LIKE ?)" for _ in words
+    )
+    params = [f"%{w}%" for w in words for _ in range(4)]
+    cur = conn.execute(
+        f"""
+        SELECT id AS job_id, title, company, location, url, refnr, source, date_posted,
+               NULL AS rank, substr(description, 1, 160) AS snippet
+        FROM jobs WHERE duplicate_of IS NULL AND {where} ORDER BY id DESC LIMIT ?
+        """,
+        params + [int(limit)],
+    )
+    return [dict(r) for r in cur.fetchall()]
+
+
+# --------------------------------------------------
+# CLI: Migration vorab ausführen bzw. prüfen
+# --------------------------------------------------
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Schema-Migrationen für die career_agent-DB.")
+    ap.add_argument("command", choices=["migrate", "check", "reindex"],
+                    help="migrate: fehlende Migrationen anwenden · check: nur prüfen (Exit-Code 1, wenn veraltet) · "
+                         "reindex: Token-Index job_tokens neu aufbauen")
+    ap.add_argument("--db", default=DB_PATH, help=f"Pfad zur SQLite-DB (default: {DB_PATH})")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.command == "migrate":
+            version = migrate_schema(args.db)
+            print(f"[DB] Schema-Version {version} (aktuell: {LATEST_SCHEMA_VERSION})")
+            return 0
+        if args.command == "reindex":
+            ensure_schema(args.db)
+            reindex_job_tokens(args.db)
+            return 0
+        version = get_schema_version(args.db)
+        if version < LATEST_SCHEMA_VERSION:
+            print(f"[DB] Schema veraltet: {version} < {LATEST_SCHEMA_VERSION}")
+            return 1
+        print(f"[DB] Schema aktuell (Version {version})")
+        return 0
+    finally:
+        close_connections()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
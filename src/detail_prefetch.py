@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# --------------------------------------------------
+# Detail-Prefetch: Jobdetails parallel vorladen (geteilter Speicher)
+# --------------------------------------------------
+
+DEFAULT_WORKERS = 6        # gleichzeitige Detail-Anfragen an die BA
+DEFAULT_TOP_N = 30         # so viele Karten werden typischerweise angezeigt
+MAX_ENTRIES = 500          # Futures im Speicher (Details selbst liegen zusätzlich im Detail-Cache)
+
+
+class DetailPrefetcher:
+    """
+    Lädt Jobdetails (BAJobSource.get_details) in einem begrenzten Thread-Pool
+    und hält die Ergebnisse als Futures je refnr vor.
+
+    - prefetch(refnrs) startet Anfragen für alle noch unbekannten refnrs
+    - get(refnr) liefert die Details, sobald sie da sind (sonst None)
+    - iter_completed(refnrs) liefert (refnr, details) in Fertigstellungsreihenfolge
+    Doppelte Anfragen für dieselbe refnr gibt es nicht, auch nicht über Reruns hinweg.
+    """
+
+    def __init__(self, ba, max_workers: int = DEFAULT_WORKERS, max_entries: int = MAX_ENTRIES):
+        self.ba = ba
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ba-details")
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fetch(self, refnr: str) -> Dict[str, Any]:
+        return self.ba.get_details(refnr) or {}
+
+    def future(self, refnr: str) -> Future:
+        """Future für refnr; startet die Anfrage, falls sie noch nicht läuft."""
+        with self._lock:
+            fut = self._futures.get(refnr)
+            if fut is not None:
+                self._futures.move_to_end(refnr)
+                # fehlgeschlagene Anfragen beim nächsten Zugriff erneut versuchen
+                if not (fut.done() and fut.exception() is not None):
+                    return fut
+            fut = self._pool.submit(self._fetch, refnr)
+            self._futures[refnr] = fut
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return fut
+
+    def prefetch(self, refnrs: Iterable[Optional[str]]) -> int:
+        """Startet Anfragen für alle refnrs (None/leer wird übersprungen). Gibt die Anzahl zurück."""
+        n = 0
+        for refnr in dict.fromkeys(r for r in refnrs if r):
+            self.future(refnr)
+            n += 1
+        return n
+
+    def status(self, refnr: str) -> str:
+        """"missing" | "pending" | "done" | "error"."""
+        with self._lock:
+            fut = self._futures.get(refnr)
+        if fut is None:
+            return "missing"
+        if not fut.done():
+            return "pending"
+        return "error" if fut.exception() is not None else "done"
+
+    def get(self, refnr: Optional[str], timeout: Optional[float] = 0) -> Optional[Dict[str, Any]]:
+        """
+        Details für refnr oder None, solange die Anfrage läuft.
+        timeout=0 wartet nicht, timeout=None wartet bis zum Ende.
+        Fehler werden wie „keine Details“ behandelt ({}).
+        """
+        if not refnr:
+            return {}
+        fut = self.future(refnr)
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            return None
+        except Exception as e:
+            print(f"[BA] Detailabruf fehlgeschlagen ({refnr}): {e}")
+            return {}
+
+    def iter_completed(self, refnrs: Iterable[str], timeout: Optional[float] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(refnr, details) in der Reihenfolge, in der die Anfragen fertig werden."""
+        by_future: Dict[Future, List[str]] = {}
+        for refnr in dict.fromkeys(r for r in refnrs if r):
+            by_future.setdefault(self.future(refnr), []).append(refnr)
+        try:
+            for fut in as_completed(by_future, timeout=timeout):
+                try:
+                    details = fut.result() or {}
+                except Exception as e:
+                    print(f"[BA] Detailabruf fehlgeschlagen: {e}")
+                    details = {}
+                for refnr in by_future[fut]:
+                    yield refnr, details
+        except FutureTimeout:
+            return
+
+
+_prefetcher: Optional[DetailPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_detail_prefetcher(ba=None) -> DetailPrefetcher:
+    """Geteilte Instanz pro Prozess (überlebt Streamlit-Reruns)."""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                if ba is None:
+                    from .ba_source import BAJobSource
+                    ba = BAJobSource()
+                _prefetcher = DetailPrefetcher(ba)
+    return _prefetcher
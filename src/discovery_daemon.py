@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# discovery_daemon.py — Hintergrundsuche für alle gespeicherten Profile.
+# Usage:
+#   python -m src.discovery_daemon --once               # ein Lauf, z. B. per cron
+#   python -m src.discovery_daemon --interval 60        # alle 60 Minuten
+#
+# Ablauf je Lauf:
+# 1) Ort/Radius aus dem aktiven user_profile, ein Suchbegriff je Profil
+# 2) alle Begriffe parallel über alle Quellen (job_aggregator, JOB_AGENT_SOURCES)
+# 3) Dubletten je Profil entfernen, Jobs per upsert_jobs speichern (eine Transaktion je Profil)
+# 4) BaseScore (Batch) + Fit-Score (ein encode-Aufruf) vorberechnen
+# 5) Lauf + Ergebnisse in search_runs / search_run_results festhalten,
+#    neue Jobs gegen den Bestand auf Near-Duplicates prüfen (src/near_dupes.py)
+# Nebenbei wird der Klassifikations-Cache (Query-Erweiterung) vorgewärmt.
+# Die Job-Suche in der App zeigt danach sofort den letzten Lauf an.
+
+import argparse
+import time
+
+from .ba_classification import BAClassification
+from .config import query_terms
+from .db_manager import (
+    DB_PATH,
+    ensure_schema,
+    finish_search_run,
+    get_connection,
+    prune_search_runs,
+    save_search_run_results,
+    start_search_run,
+    upsert_jobs,
+)
+from .job_aggregator import get_aggregator
+from .near_dupes import dedupe_near_duplicates, mark_near_duplicates
+from .research_agent import (
+    build_scoring_profile,
+    load_active_user_profile,
+    load_profiles_for_user,
+    map_job_fields,
+    profile_query,
+    search_location,
+)
+from .scoring import apply_scores
+
+DEFAULT_INTERVAL_MIN = 60
+DEFAULT_PAGE_SIZE = 25
+KEEP_RUNS = 20
+
+
+def run_discovery(db_path=DB_PATH, size=DEFAULT_PAGE_SIZE, max_workers=6, with_fit=True, ba=None):
+    """
+    Führt einen kompletten Suchlauf für alle Profile aus.
+    Gibt die Kennzahlen des Laufs zurück (wie in search_runs gespeichert).
+    """
+    ensure_schema(db_path)
+    t0 = time.perf_counter()
+    run_id = start_search_run(db_path)
+    counts = {"profiles": 0, "queries": 0, "jobs_found": 0, "jobs_new": 0, "errors": 0}
+    try:
+        user_profile = load_active_user_profile(db_path)
+        if not user_profile:
+            raise RuntimeError("Kein aktives User-Profil gefunden.")
+        ort, radius = search_location(user_profile)
+        profiles = load_profiles_for_user(db_path)
+        counts["profiles"] = len(profiles)
+
+        # Ein Suchbegriff je Profil, gleiche Begriffe nur einmal abfragen
+        query_of = {p["id"]: profile_query(p) for p in profiles}
+        terms = list(dict.fromkeys(query_of.values()))
+        counts["queries"] = len(terms)
+
+        # Klassifikations-Cache für die Job-Suche der App warm halten (gecachte Begriffe kosten nichts)
+        BAClassification().warm_up(t for q in terms for t in query_terms(q))
+
+        ba = ba or get_aggregator()
+        jobs_found, report = ba.search_many([(t, ort, radius) for t in terms], size=size, max_workers=max_workers)
+        counts["errors"] = sum(1 for r in report if r["error"])
+        counts["jobs_found"] = len(jobs_found)
+
+        # search_many liefert in Reihenfolge der Begriffe, report[i]["count"] Treffer je Begriff
+        jobs_by_term, pos = {}, 0
+        for term, entry in zip(terms, report):
+            jobs_by_term[term] = [map_job_fields(j) for j in jobs_found[pos:pos + entry["count"]]]
+            pos += entry["count"]
+
+        (max_id_before,) = get_connection(db_path).execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()
+
+        predict_fit_scores = None
+        if with_fit:
+            # erst hier importieren: lädt Modell/Chroma (im Daemon gewollt, beim Import nicht)
+            from .learning_engine import predict_fit_scores
+
+        for p in profiles:
+            term = query_of[p["id"]]
+            # Kopien: dieselben BA-Treffer können zu mehreren Profilen gehören
+            jobs = [dict(j) for j in jobs_by_term.get(term, [])]
+            jobs, _ = dedupe_near_duplicates(jobs)
+            if not jobs:
+                continue
+            apply_scores(jobs, build_scoring_profile(p, [term], ort), preset="research")
+            bases = [j["base_score"] for j in jobs]
+            fits = predict_fit_scores(jobs, bases) if predict_fit_scores else bases
+            for job, fit in zip(jobs, fits):
+                job["fit_score"] = fit
+
+            job_ids = upsert_jobs(
+                [dict(j, match_score=j["fit_score"]) for j in jobs],
+                matched_profile_id=p["id"],
+                db_path=db_path,
+            )
+            save_search_run_results(
+                run_id,
+                p["id"],
+                [(jid, j["base_score"], j["fit_score"], j.get("why_base")) for jid, j in zip(job_ids, jobs)],
+                db_path=db_path,
+            )
+            counts["jobs_new"] += sum(1 for jid in set(job_ids) if jid > max_id_before)
+
+        # neue Jobs gegen den Bestand prüfen (jobs.duplicate_of), bevor Scoring/Anzeige sie sehen
+        mark_near_duplicates(db_path)
+
+        # einzelne fehlgeschlagene Begriffe/Quellen → "partial", alle Begriffe fehlgeschlagen → "failed"
+        if counts["queries"] and counts["errors"] >= counts["queries"]:
+            status = "failed"
+        elif counts["errors"] or any(r.get("partial") for r in report):
+            status = "partial"
+        else:
+            status = "ok"
+        finish_search_run(run_id, status=status, seconds=round(time.perf_counter() - t0, 2),
+                          db_path=db_path, **counts)
+    except Exception as e:
+        finish_search_run(run_id, status="failed", seconds=round(time.perf_counter() - t0, 2),
+                          message=str(e)[:500], db_path=db_path, **counts)
+        print(f"[Discovery] ❌ Lauf {run_id} fehlgeschlagen: {e}")
+        return dict(counts, run_id=run_id, status="failed")
+
+    prune_search_runs(KEEP_RUNS, db_path=db_path)
+    print(f"[Discovery] Lauf {run_id}: {counts['jobs_found']} Treffer, {counts['jobs_new']} neu, "
+          f"{counts['errors']} Fehler ({time.perf_counter() - t0:.1f} s)")
+    return dict(counts, run_id=run_id, status=status)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hintergrundsuche für alle Profile (periodisch oder einmalig).")
+    ap.add_argument("--db", default=DB_PATH, help=f"Pfad zur SQLite-DB (default: {DB_PATH})")
+    ap.add_argument("--once", action="store_true", help="nur einen Lauf ausführen")
+    ap.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_MIN,
+                    help=f"Minuten zwischen zwei Läufen (default: {DEFAULT_INTERVAL_MIN})")
+    ap.add_argument("--size", type=int, default=DEFAULT_PAGE_SIZE, help="Treffer je Suchbegriff")
+    ap.add_argument("--no-fit", action="store_true", help="ohne Fit-Score (kein Modell laden)")
+    args = ap.parse_args(argv)
+
+    while True:
+        started = time.monotonic()
+        run_discovery(args.db, size=args.size, with_fit=not args.no_fit)
+        if args.once:
+            return 0
+        pause = max(0.0, args.interval * 60 - (time.monotonic() - started))
+        print(f"[Discovery] nächster Lauf in {pause / 60:.1f} min")
+        try:
+            time.sleep(pause)
+        except KeyboardInterrupt:
+            print("[Discovery] beendet")
+            return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
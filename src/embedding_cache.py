@@ -0,0 +1,104 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# --------------------------------------------------
+# Persistenter Embedding-Cache (Content-Hash → Vektor)
+# --------------------------------------------------
+
+EMBEDDING_CACHE_PATH = Path("data/embedding_cache.sqlite")  # liegt neben data/chroma
+
+
+def content_hash(text: str, model_name: str) -> str:
+    """Stabiler Schlüssel aus Modellname + Text."""
+    return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Speichert float32-Vektoren in SQLite, Schlüssel ist der Content-Hash.
+    Unveränderte Titel/Beschreibungen werden so nie zweimal eingebettet.
+    """
+
+    _CHUNK = 500  # Obergrenze für IN (...)-Listen
+
+    def __init__(self, path=EMBEDDING_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                hash TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vec BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for i in range(0, len(unique), self._CHUNK):
+                chunk = unique[i:i + self._CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for h, dim, blob in self._conn.execute(
+                    f"SELECT hash, dim, vec FROM embeddings WHERE hash IN ({marks})", chunk
+                ):
+                    found[h] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = [(h, int(v.shape[0]), v.tobytes()) for h, v in zip(hashes, vectors)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, dim, vec) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+
+def embed_with_cache(encode, texts: List[str], model_name: str, cache: EmbeddingCache,
+                     batch_size: int = 64) -> np.ndarray:
+    """
+    Bettet `texts` ein und nutzt dabei den Cache.
+    `encode` ist z. B. SentenceTransformer.encode; fehlende Texte werden in
+    einem einzigen Aufruf (intern in batch_size-Blöcken) eingebettet.
+    Gibt ein float32-Array (len(texts), dim) in Eingabereihenfolge zurück.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    hashes = [content_hash(t, model_name) for t in texts]
+    known = cache.get_many(hashes)
+
+    missing: Dict[str, str] = {}
+    for h, t in zip(hashes, texts):
+        if h not in known and h not in missing:
+            missing[h] = t
+
+    if missing:
+        new_vecs = np.asarray(
+            encode(list(missing.values()), batch_size=batch_size, convert_to_numpy=True),
+            dtype=np.float32,
+        )
+        cache.put_many(list(missing.keys()), new_vecs)
+        known.update(zip(missing.keys(), new_vecs))
+
+    return np.vstack([known[h] for h in hashes]).astype(np.float32, copy=False)
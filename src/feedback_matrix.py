@@ -0,0 +1,144 @@
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# --------------------------------------------------
+# In-Process-Feedbackmatrix für die Fit-Score-Berechnung
+# --------------------------------------------------
+
+
+def _normalize_rows(m: np.ndarray) -> np.ndarray:
+    m = np.asarray(m, dtype=np.float32)
+    if m.ndim == 1:
+        m = m[None, :]
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / (norms + 1e-8)
+
+
+def neighbor_signal(sims: np.ndarray, weights: np.ndarray, min_similarity: float) -> np.ndarray:
+    """
+    Distanzgewichtetes Votum der Nachbarn je Zeile:
+    sum(sim * w) / sum(|w|) über alle Nachbarn mit sim >= min_similarity.
+    Nähere Nachbarn zählen damit stärker; ohne passende Nachbarn → 0 (neutral).
+    """
+    mask = sims >= min_similarity
+    num = np.sum(np.where(mask, sims * weights, 0.0), axis=1)
+    den = np.sum(np.where(mask, np.abs(weights), 0.0), axis=1)
+    return num / (den + 1e-6)
+
+
+class FeedbackMatrix:
+    """
+    Hält alle Feedback-Vektoren vornormiert (float32) plus Gewichte
+    (feedback_value) im Speicher.
+
+    - wird einmal aus Chroma geladen (load) und danach per upsert
+      inkrementell gepflegt – kein collection.get() pro Vorhersage
+    - learned_signal() bewertet einen ganzen Job-Batch mit einem
+      Matrix-Matrix-Produkt
+    """
+
+    def __init__(self, dim: Optional[int] = None):
+        self.dim = dim
+        self._ids: List[str] = []
+        self._row: Dict[str, int] = {}
+        self._vecs = np.zeros((0, dim or 0), dtype=np.float32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vecs[:self._n]
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._weights[:self._n]
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def load(self, ids: Sequence[str], embeddings, metadatas: Sequence[Optional[dict]]) -> None:
+        """Ersetzt den Inhalt komplett (z. B. Ergebnis von collection.get)."""
+        with self._lock:
+            if embeddings is None or len(embeddings) == 0:
+                self._ids, self._row, self._n = [], {}, 0
+                self._vecs = np.zeros((0, self.dim or 0), dtype=np.float32)
+                self._weights = np.zeros(0, dtype=np.float32)
+                return
+            vecs = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+            self.dim = vecs.shape[1]
+            self._ids = [str(i) for i in ids]
+            self._row = {doc_id: k for k, doc_id in enumerate(self._ids)}
+            self._vecs = vecs
+            self._weights = np.array(
+                [((m or {}).get("feedback_value") or 0) for m in metadatas], dtype=np.float32
+            )
+            self._n = len(self._ids)
+
+    def upsert(self, doc_id: str, embedding, feedback_value) -> None:
+        """Fügt einen Vektor hinzu oder ersetzt ihn (gleiche doc_id wie in Chroma)."""
+        vec = _normalize_rows(embedding)[0]
+        weight = np.float32(feedback_value or 0)
+        with self._lock:
+            if self.dim is None or self._n == 0:
+                self.dim = vec.shape[0]
+                if self._vecs.shape[1] != self.dim:
+                    self._vecs = np.zeros((0, self.dim), dtype=np.float32)
+            row = self._row.get(doc_id)
+            if row is None:
+                row = self._n
+                if row >= self._vecs.shape[0]:
+                    # Kapazität verdoppeln (amortisiert O(1) pro Einfügung)
+                    cap = max(16, 2 * self._vecs.shape[0])
+                    vecs = np.zeros((cap, self.dim), dtype=np.float32)
+                    vecs[:self._n] = self._vecs[:self._n]
+                    weights = np.zeros(cap, dtype=np.float32)
+                    weights[:self._n] = self._weights[:self._n]
+                    self._vecs, self._weights = vecs, weights
+                self._ids.append(doc_id)
+                self._row[doc_id] = row
+                self._n += 1
+            self._vecs[row] = vec
+            self._weights[row] = weight
+
+    def learned_signal(self, job_embeddings) -> Optional[np.ndarray]:
+        """
+        Gewichtete mittlere Kosinusähnlichkeit je Job (Wertebereich -1..1).
+        Gibt None zurück, wenn (noch) kein verwertbares Feedback existiert.
+        """
+        with self._lock:
+            vecs = self.vectors
+            weights = self.weights
+            total = float(np.sum(np.abs(weights)))
+            if self._n == 0:
+                return None
+            jobs = _normalize_rows(job_embeddings)
+            sims = jobs @ vecs.T
+        return (sims @ weights) / (total + 1e-6)
+
+    def knn_signal(self, job_embeddings, k: int = 20, min_similarity: float = 0.3) -> Optional[np.ndarray]:
+        """
+        Top-k-Variante von learned_signal: je Job zählen nur die k ähnlichsten
+        Feedback-Einträge oberhalb von min_similarity (exakte Suche im Speicher).
+        Entferntes, irrelevantes Feedback verwässert das Signal so nicht mehr.
+        """
+        with self._lock:
+            if self._n == 0:
+                return None
+            vecs = self.vectors
+            weights = self.weights
+            jobs = _normalize_rows(job_embeddings)
+            sims = jobs @ vecs.T
+        k = max(1, min(k, sims.shape[1]))
+        if k < sims.shape[1]:
+            idx = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.broadcast_to(np.arange(sims.shape[1]), sims.shape)
+        top_sims = np.take_along_axis(sims, idx, axis=1)
+        return neighbor_signal(top_sims, weights[idx], min_similarity)
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_source import JobSource
+from .job_schema import normalize_job
+from .tokenizer import normalize_txt, tokenize
+
+# --------------------------------------------------
+# Lokale Quelle: JSON-/JSONL-Feeds aus einem Verzeichnis (offline)
+# --------------------------------------------------
+
+FEED_DIR = Path(os.environ.get("JOB_AGENT_FEED_DIR", "data/feeds"))
+FEED_SUFFIXES = (".json", ".jsonl")
+NATIONWIDE = {"", "deutschland", "bundesweit"}
+
+
+class FileFeedSource(JobSource):
+    """
+    Jobs aus lokalen Feed-Dateien (*.json: Liste oder {"jobs": [...]}, *.jsonl: ein Job je Zeile).
+
+    - Feldnamen werden über job_schema.normalize_job vereinheitlicht
+    - Dateien werden nur neu gelesen, wenn sich ihre mtime ändert
+    - Suche: alle Query-Tokens müssen in Titel/Beschreibung vorkommen,
+      Ort als Teilstring (Umkreis wird mangels Geodaten ignoriert)
+    """
+
+    name = "Lokaler Feed"
+    key = "file"
+
+    def __init__(self, path=FEED_DIR):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._files: Dict[Path, Tuple[float, List[Dict[str, Any]]]] = {}
+
+    def _feed_files(self) -> List[Path]:
+        if self.path.is_file():
+            return [self.path]
+        if not self.path.is_dir():
+            return []
+        return sorted(p for p in self.path.iterdir() if p.suffix.lower() in FEED_SUFFIXES)
+
+    def _read(self, path: Path) -> List[Dict[str, Any]]:
+        with open(path, encoding="utf-8") as f:
+            if path.suffix.lower() == ".jsonl":
+                rows = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                rows = data.get("jobs", []) if isinstance(data, dict) else data
+        jobs = []
+        for r in rows:
+            job = normalize_job(r, self.name, self.key)
+            job["_tokens"] = tokenize(job["titel"]) | tokenize(job.get("beschreibung"))
+            job["_ort"] = normalize_txt(job["ort"])
+            jobs.append(job)
+        return jobs
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Alle Jobs aller Feed-Dateien (gecacht je Datei über mtime)."""
+        out: List[Dict[str, Any]] = []
+        with self._lock:
+            files = self._feed_files()
+            for path in files:
+                mtime = path.stat().st_mtime
+                cached = self._files.get(path)
+                if cached is None or cached[0] != mtime:
+                    try:
+                        cached = (mtime, self._read(path))
+                    except Exception as e:
+                        print(f"[Feed] Fehler beim Lesen von {path}: {e}")
+                        cached = (mtime, [])
+                    self._files[path] = cached
+                out.extend(cached[1])
+            for stale in set(self._files) - set(files):
+                del self._files[stale]
+        return out
+
+    @staticmethod
+    def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def _fetch_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        q_tokens = tokenize(query)
+        q_ort = normalize_txt(ort)
+        hits = []
+        for job in self.jobs():
+            if q_tokens and not q_tokens <= job["_tokens"]:
+                continue
+            if q_ort not in NATIONWIDE and q_ort not in job["_ort"]:
+                continue
+            hits.append(self._public(job))
+            if len(hits) >= size:
+                break
+        return hits
+
+    def search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        try:
+            jobs = self._fetch_search(query, ort, umkreis, size)
+            print(f"[Feed] {len(jobs)} Treffer für '{query}' in {ort}")
+            return jobs
+        except Exception as e:
+            print(f"[Feed] Fehler bei Suche ({query}): {e}")
+            return []
+
+    def get_details(self, job_id: str) -> Dict[str, Any]:
+        job = next((j for j in self.jobs() if job_id in (j["refnr"], j["id"])), None)
+        if job is None:
+            return {"beschreibung": "Keine Detailbeschreibung verfügbar.", "url": None}
+        return {
+            "beschreibung": job.get("beschreibung") or "Keine Beschreibung verfügbar.",
+            "url": job.get("url"),
+            "titel": job["titel"],
+            "arbeitgeber": job["arbeitgeber"],
+            "ort": job["ort"],
+            "refnr": job["refnr"],
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional["FileFeedSource"]:
+        """Quelle für die Registry – nur, wenn das Feed-Verzeichnis existiert."""
+        return cls(FEED_DIR) if FEED_DIR.exists() else None
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --------------------------------------------------
+# Gemeinsamer HTTP-Transport für alle BA-Module
+# (ba_source, ba_classification, ba_utils)
+# --------------------------------------------------
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 60.0  # Sekunden – längere Retry-After-Werte werden gekappt
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Liefert die prozessweit geteilte Session mit Keep-Alive-Connection-Pool."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                # Retries machen wir selbst (Backoff + Circuit Breaker), daher max_retries=0
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+class CircuitOpenError(RuntimeError):
+    """Wird geworfen, wenn der Circuit Breaker eines Endpunkts offen ist."""
+
+
+class CircuitBreaker:
+    """
+    Einfacher Circuit Breaker pro Endpunkt.
+    - closed: Anfragen laufen normal
+    - open: nach `failure_threshold` Fehlern in Folge werden Anfragen
+      für `reset_timeout` Sekunden sofort abgewiesen
+    - half-open: danach darf genau eine Probe-Anfrage durch
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probe_running:
+                self._probe_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Liefert (und erzeugt ggf.) den Circuit Breaker für einen Endpunkt."""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker()
+        return _breakers[endpoint]
+
+
+def _retry_after_seconds(r: requests.Response) -> Optional[float]:
+    """Wertet den Retry-After-Header aus (Sekunden oder HTTP-Datum)."""
+    value = r.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        pass
+    try:
+        delay = parsedate_to_datetime(value).timestamp() - time.time()
+        return min(max(delay, 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    """Exponentieller Backoff mit „Full Jitter“."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def http_get(url: str,
+             params: Optional[Dict[str, Any]] = None,
+             headers: Optional[Dict[str, str]] = None,
+             timeout: float = 15,
+             endpoint: Optional[str] = None,
+             max_retries: int = 3,
+             backoff_base: float = 0.5,
+             backoff_max: float = 10.0) -> requests.Response:
+    """
+    GET über die geteilte Session mit Retry und Circuit Breaker.
+
+    - Wiederholt bei Verbindungsfehlern/Timeouts und Status 429/5xx
+      (exponentieller Backoff mit Jitter, Retry-After wird respektiert).
+    - `endpoint` bestimmt den Circuit Breaker (Default: Host + Pfad).
+    - Nach ausgeschöpften Retries wird die letzte Response zurückgegeben
+      bzw. die letzte Exception weitergeworfen – Aufrufer prüfen wie bisher
+      `status_code`.
+    - Ist der Breaker offen, wird sofort CircuitOpenError geworfen.
+    """
+    if endpoint is None:
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+    breaker = get_breaker(endpoint)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit offen für {endpoint}")
+
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            r = session.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            retryable = isinstance(e, (requests.ConnectionError, requests.Timeout))
+            if not retryable or attempt >= max_retries:
+                breaker.record_failure()
+                raise
+            time.sleep(_backoff(attempt, backoff_base, backoff_max))
+            attempt += 1
+            continue
+
+        if r.status_code not in RETRY_STATUS:
+            breaker.record_success()
+            return r
+
+        if attempt >= max_retries:
+            breaker.record_failure()
+            return r
+
+        delay = _retry_after_seconds(r)
+        if delay is None:
+            delay = _backoff(attempt, backoff_base, backoff_max)
+        print(f"[HTTP] {r.status_code} von {endpoint} – Retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+        attempt += 1
@@ -0,0 +1,315 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .ba_source import BAJobSource
+from .base_source import JobSource
+from .file_source import FileFeedSource
+from .job_schema import dedupe_jobs, normalize_job
+from .mock_source import MockHTTPSource
+
+# --------------------------------------------------
+# Quellen-Registry
+# --------------------------------------------------
+
+SourceFactory = Callable[[], Optional[JobSource]]
+
+_REGISTRY: "OrderedDict[str, SourceFactory]" = OrderedDict()
+
+# Reihenfolge = Priorität beim Zusammenführen von Dubletten
+DEFAULT_SOURCES = os.environ.get("JOB_AGENT_SOURCES", "ba,file")
+DEFAULT_SOURCE_TIMEOUT = float(os.environ.get("JOB_AGENT_SOURCE_TIMEOUT", "20"))
+ORIGIN_MAX_ENTRIES = 20000
+
+
+def register_source(key: str, factory: Optional[SourceFactory] = None):
+    """
+    Registriert eine Quelle unter `key`. factory() liefert die Instanz oder None
+    (Quelle aktuell nicht verfügbar, z. B. kein Feed-Verzeichnis).
+    Auch als Decorator nutzbar: @register_source("xyz").
+    """
+    def _register(f: SourceFactory) -> SourceFactory:
+        _REGISTRY[key] = f
+        return f
+    return _register(factory) if factory is not None else _register
+
+
+def registered_sources() -> List[str]:
+    return list(_REGISTRY)
+
+
+def create_sources(keys: Optional[Iterable[str]] = None) -> "OrderedDict[str, JobSource]":
+    """Instanzen der gewünschten Quellen (Default: JOB_AGENT_SOURCES, sonst "ba,file")."""
+    if keys is None:
+        keys = [k.strip() for k in DEFAULT_SOURCES.split(",") if k.strip()]
+    sources: "OrderedDict[str, JobSource]" = OrderedDict()
+    for key in keys:
+        factory = _REGISTRY.get(key)
+        if factory is None:
+            print(f"[Quellen] ⚠️ Unbekannte Quelle '{key}' – verfügbar: {', '.join(_REGISTRY)}")
+            continue
+        source = factory()
+        if source is None:
+            print(f"[Quellen] Quelle '{key}' nicht verfügbar – übersprungen.")
+            continue
+        sources[key] = source
+    return sources
+
+
+register_source("ba", BAJobSource)
+register_source("file", FileFeedSource.from_env)
+register_source("mock", MockHTTPSource)
+
+
+# --------------------------------------------------
+# Aggregator
+# --------------------------------------------------
+class AggregationError(RuntimeError):
+    """Mindestens eine Quelle fehlte, obwohl allow_partial=False. Teilergebnisse hängen an."""
+
+    def __init__(self, message: str, jobs: List[Dict[str, Any]], report: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.jobs = jobs
+        self.report = report
+
+
+class SourceAggregator(JobSource):
+    """
+    Fragt alle Quellen parallel ab und führt die Treffer zusammen.
+
+    - timeout: Sekunden je Anfrage (Quelle × Begriff, ab Start der Anfrage);
+      langsamere Anfragen werden ignoriert und laufen im Hintergrund aus, fertige
+      Begriffe derselben Quelle bleiben erhalten
+    - je Quelle ein eigener Thread-Pool – hängende Anfragen blockieren andere Quellen nicht
+    - allow_partial=True liefert Teilergebnisse, wenn Quellen fehlen/ausfallen;
+      False wirft AggregationError (mit Teilergebnissen)
+    - Ergebnis im Schema von job_schema, Dubletten über refnr/Inhalt entfernt
+      (Priorität = Reihenfolge der Quellen)
+
+    Schnittstelle wie BAJobSource (search, search_many, get_details) – kann
+    überall eingesetzt werden, wo bisher BAJobSource verwendet wurde.
+    """
+
+    name = "Alle Quellen"
+
+    def __init__(self,
+                 sources: Optional[Dict[str, JobSource]] = None,
+                 timeout: float = DEFAULT_SOURCE_TIMEOUT,
+                 allow_partial: bool = True):
+        self.sources: "OrderedDict[str, JobSource]" = OrderedDict(sources if sources is not None else create_sources())
+        if not self.sources:
+            raise ValueError("Keine Jobquelle verfügbar.")
+        self.timeout = timeout
+        self.allow_partial = allow_partial
+        self.last_source_report: List[Dict[str, Any]] = []
+        self._pools: Dict[str, Tuple[ThreadPoolExecutor, int]] = {}
+        self._pools_lock = threading.Lock()
+        self._origin: "OrderedDict[str, str]" = OrderedDict()
+        self._origin_lock = threading.Lock()
+
+    # -------------------------------------------------------------
+    # Herkunft je refnr (für get_details)
+    # -------------------------------------------------------------
+    def _remember_origin(self, jobs: Iterable[Dict[str, Any]], key: str) -> None:
+        with self._origin_lock:
+            for job in jobs:
+                for ref in {job.get("refnr"), job.get("id")}:
+                    if ref:
+                        self._origin[str(ref)] = key
+                        self._origin.move_to_end(str(ref))
+            while len(self._origin) > ORIGIN_MAX_ENTRIES:
+                self._origin.popitem(last=False)
+
+    def source_for(self, job_id: str) -> JobSource:
+        """Quelle einer Stelle: bekannte Herkunft, sonst refnr-Präfix („mock:…“), sonst die erste Quelle."""
+        with self._origin_lock:
+            key = self._origin.get(str(job_id))
+        if key is None:
+            prefix = str(job_id).split(":", 1)[0] if ":" in str(job_id) else None
+            key = next((k for k, s in self.sources.items() if prefix and getattr(s, "key", None) == prefix), None)
+        return self.sources.get(key) or next(iter(self.sources.values()))
+
+    def _pool_for(self, key: str, max_workers: int) -> Tuple[ThreadPoolExecutor, int]:
+        """(Thread-Pool, Threads) einer Quelle – beim ersten Aufruf mit max_workers Threads angelegt."""
+        with self._pools_lock:
+            entry = self._pools.get(key)
+            if entry is None:
+                workers = max(1, max_workers)
+                entry = self._pools[key] = (ThreadPoolExecutor(max_workers=workers,
+                                                               thread_name_prefix=f"source-{key}"), workers)
+            return entry
+
+    def _wait_per_request(self, futures: Dict[Future, Any], started: Dict[Any, float], rounds: int) -> set:
+        """
+        Wartet, bis jede Anfrage fertig ist oder `timeout` Sekunden läuft. Noch nicht
+        gestartete Anfragen enden spätestens nach timeout × (Anzahl Runden im Pool).
+        Gibt die abgelaufenen Futures zurück (wartende werden storniert).
+        """
+        t0 = time.perf_counter()
+        deadline_all = t0 + self.timeout * rounds
+        pending, expired = set(futures), set()
+        while pending:
+            now = time.perf_counter()
+            for fut in list(pending):
+                start = started.get(futures[fut])
+                if (start is not None and now - start >= self.timeout) or now >= deadline_all:
+                    fut.cancel()
+                    expired.add(fut)
+                    pending.discard(fut)
+            if not pending:
+                break
+            deadlines = [started[futures[f]] + self.timeout for f in pending if futures[f] in started]
+            # kurz pollen, damit frisch gestartete Anfragen ihre Frist bekommen
+            step = min(deadlines + [deadline_all, now + 0.25]) - now
+            done, pending = wait(pending, timeout=max(step, 0.0), return_when=FIRST_COMPLETED)
+        return expired
+
+    # -------------------------------------------------------------
+    # Suche
+    # -------------------------------------------------------------
+    def search_many(self,
+                    queries: Sequence[Tuple[str, str, int]],
+                    size: int = 10,
+                    max_workers: int = 6) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Alle Begriffe bei allen Quellen, jede Anfrage (Quelle × Begriff) einzeln im
+        Pool der Quelle (max_workers Threads je Quelle). Rückgabe wie
+        BAJobSource.search_many ("seconds" = langsamste Quelle für den Begriff);
+        report je Begriff zusätzlich mit "sources" (Treffer je Quelle),
+        "duplicates" und "total_seconds" (Dauer der ganzen Aggregation).
+        last_source_report: status je Quelle "ok", "partial" (einzelne Begriffe
+        fehlgeschlagen), "timeout" oder "error".
+        """
+        queries = list(queries)
+        if not queries:
+            return [], []
+
+        t0 = time.perf_counter()
+        started: Dict[Tuple[str, int], float] = {}
+
+        def _run(source: JobSource, task: Tuple[str, int], q: Tuple[str, str, int]):
+            started[task] = time.perf_counter()
+            return source.search_one(*q, size=size)
+
+        futures: Dict[Future, Tuple[str, int]] = {}
+        rounds = 1
+        for key, source in self.sources.items():
+            pool, workers = self._pool_for(key, max_workers)
+            rounds = max(rounds, math.ceil(len(queries) / workers))
+            for i, q in enumerate(queries):
+                futures[pool.submit(_run, source, (key, i), q)] = (key, i)
+        expired = self._wait_per_request(futures, started, rounds)
+        result_of = {task: fut for fut, task in futures.items()}
+
+        per_query: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        per_query_src: List[Dict[str, int]] = [{} for _ in queries]
+        per_query_err: List[List[str]] = [[] for _ in queries]
+        per_query_cache: List[Optional[str]] = [None for _ in queries]
+        # Dauer je Begriff = langsamste Quelle (abgelaufene Anfragen zählen mit dem Timeout)
+        per_query_secs: List[float] = [0.0 for _ in queries]
+        source_report = []
+
+        for key, source in self.sources.items():
+            errors: List[str] = []
+            timeouts = count = 0
+            for i in range(len(queries)):
+                fut = result_of[(key, i)]
+                if fut in expired:
+                    error = f"Timeout nach {self.timeout:g} s"
+                    timeouts += 1
+                    per_query_secs[i] = max(per_query_secs[i], self.timeout)
+                else:
+                    try:
+                        jobs, rep = fut.result()
+                    except Exception as e:
+                        jobs, rep = [], {"error": str(e)}
+                    per_query_secs[i] = max(per_query_secs[i], rep.get("seconds") or 0.0)
+                    error = rep.get("error")
+                    if not error:
+                        part = [normalize_job(j, source.name, getattr(source, "key", None)) for j in jobs]
+                        self._remember_origin(part, key)
+                        per_query[i].extend(part)
+                        per_query_src[i][key] = len(part)
+                        per_query_cache[i] = per_query_cache[i] or rep.get("cache")
+                        count += len(part)
+                        continue
+                per_query_err[i].append(f"{key}: {error}")
+                errors.append(error)
+
+            if not errors:
+                status, error = "ok", None
+            elif len(errors) < len(queries):
+                status, error = "partial", f"{len(errors)}/{len(queries)} Begriffe ohne Ergebnis ({errors[0]})"
+            else:
+                status, error = ("timeout" if timeouts == len(queries) else "error"), errors[0]
+            source_report.append({"source": key, "status": status, "count": count, "error": error})
+
+        jobs_all: List[Dict[str, Any]] = []
+        report_all: List[Dict[str, Any]] = []
+        seconds = round(time.perf_counter() - t0, 3)
+        for (query, ort, umkreis), jobs, by_src, errs, cache, secs in zip(
+                queries, per_query, per_query_src, per_query_err, per_query_cache, per_query_secs):
+            kept, dropped = dedupe_jobs(jobs)
+            jobs_all.extend(kept)
+            report_all.append({
+                "query": query,
+                "ort": ort,
+                "umkreis": umkreis,
+                "count": len(kept),
+                "seconds": round(secs, 3),
+                "total_seconds": seconds,  # ganze Aggregation (alle Begriffe und Quellen)
+                # Fehler nur, wenn keine Quelle geliefert hat; sonst Teilergebnis
+                "error": "; ".join(errs) if errs and not by_src else None,
+                "partial": bool(errs) and bool(by_src),
+                "cache": cache,
+                "sources": by_src,
+                "duplicates": dropped,
+            })
+
+        self.last_source_report = source_report
+        missing = [e for e in source_report if e["status"] != "ok"]
+        print(f"[Quellen] {len(jobs_all)} Treffer aus {len(self.sources)} Quellen, "
+              f"{sum(r['duplicates'] for r in report_all)} Dubletten entfernt "
+              f"({len(missing)} unvollständig, {seconds:.1f} s)")
+        for e in missing:
+            print(f"[Quellen] ⚠️ {e['source']}: {e['error']}")
+        if missing and not self.allow_partial:
+            raise AggregationError(
+                f"{len(missing)} Quelle(n) unvollständig: {', '.join(e['source'] for e in missing)}",
+                jobs_all, report_all,
+            )
+        return jobs_all, report_all
+
+    def _fetch_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        jobs, report = self.search_many([(query, ort, umkreis)], size=size)
+        if report[0]["error"]:
+            raise RuntimeError(report[0]["error"])
+        return jobs
+
+    def search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        try:
+            return self._fetch_search(query, ort, umkreis, size)
+        except Exception as e:
+            print(f"[Quellen] Fehler bei Suche ({query}): {e}")
+            return []
+
+    def get_details(self, job_id: str) -> Dict[str, Any]:
+        return self.source_for(job_id).get_details(job_id)
+
+
+_aggregator: Optional[SourceAggregator] = None
+_aggregator_lock = threading.Lock()
+
+
+def get_aggregator() -> SourceAggregator:
+    """Prozessweit geteilter Aggregator über die Quellen aus JOB_AGENT_SOURCES."""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = SourceAggregator()
+    return _aggregator
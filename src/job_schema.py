@@ -0,0 +1,94 @@
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tokenizer import normalize_txt
+
+# --------------------------------------------------
+# Einheitliches Job-Schema für alle Quellen (Felder wie bei BAJobSource)
+# --------------------------------------------------
+
+JOB_FIELDS = ("titel", "arbeitgeber", "ort", "refnr", "id", "source", "url")
+OPTIONAL_FIELDS = ("beschreibung", "date_posted")
+
+# Feldnamen anderer Quellen/Feeds → Schema (erster vorhandener Wert gewinnt)
+FIELD_ALIASES = {
+    "titel": ("titel", "title", "position", "name", "jobtitle"),
+    "arbeitgeber": ("arbeitgeber", "company", "employer", "firma", "unternehmen"),
+    "ort": ("ort", "location", "arbeitsort", "city", "stadt"),
+    "refnr": ("refnr", "reference", "ref", "external_id"),
+    "id": ("id", "hashId", "job_id", "guid"),
+    "url": ("url", "link", "apply_url"),
+    "beschreibung": ("beschreibung", "description", "text", "summary"),
+    "date_posted": ("date_posted", "datePosted", "published", "date", "eintrittsdatum"),
+}
+# verschachtelte Angaben ({"name": ...} / {"ort": ...}) wie bei der BA
+NESTED_KEYS = ("name", "ort", "city", "bezeichnung")
+
+
+def _value(v: Any) -> Any:
+    if isinstance(v, dict):
+        v = next((v[k] for k in NESTED_KEYS if v.get(k)), None)
+    if isinstance(v, str):
+        v = v.strip()
+    return v if v not in ("", None) else None
+
+
+def content_key(job: Dict[str, Any]) -> str:
+    """Titel|Arbeitgeber|Ort normalisiert – erkennt dieselbe Stelle auch ohne gemeinsame refnr."""
+    return "|".join(normalize_txt(job.get(f) or "") for f in ("titel", "arbeitgeber", "ort"))
+
+
+def normalize_job(raw: Dict[str, Any], source: str, source_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bildet ein Jobdict einer beliebigen Quelle auf das Schema ab.
+    - fehlende refnr: stabiler Hash aus Quelle + Inhalt („<source_key>:<hash>“)
+    - refnr fremder Quellen wird mit source_key präfixiert, damit sie nicht mit BA-refnrs kollidiert
+    - unbekannte Zusatzfelder bleiben erhalten
+    """
+    job = dict(raw)
+    for field, aliases in FIELD_ALIASES.items():
+        job[field] = next((val for val in (_value(raw.get(a)) for a in aliases) if val is not None), None)
+    job["titel"] = job["titel"] or "Kein Titel"
+    job["arbeitgeber"] = job["arbeitgeber"] or "Unbekannt"
+    job["ort"] = job["ort"] or "n/a"
+    job["source"] = raw.get("source") or source
+
+    if source_key:
+        if job["refnr"] is None:
+            job["refnr"] = job["id"]
+        if job["refnr"] is None:
+            digest = hashlib.sha1(content_key(job).encode("utf-8")).hexdigest()[:16]
+            job["refnr"] = digest
+        if not str(job["refnr"]).startswith(f"{source_key}:"):
+            job["refnr"] = f"{source_key}:{job['refnr']}"
+        job["id"] = job["id"] or job["refnr"]
+        job["source_key"] = source_key
+    return job
+
+
+def dedupe_jobs(jobs: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Entfernt Dubletten über refnr und Inhalt (Titel/Arbeitgeber/Ort).
+    Der erste Treffer bleibt (Reihenfolge = Priorität der Quellen), weitere
+    Quellen werden unter "sources" vermerkt. Gibt (jobs, anzahl_entfernt) zurück.
+    """
+    kept: List[Dict[str, Any]] = []
+    by_key: Dict[str, Dict[str, Any]] = {}
+    dropped = 0
+    for job in jobs:
+        keys = [f"c:{content_key(job)}"]
+        if job.get("refnr"):
+            keys.append(f"r:{job['refnr']}")
+        first = next((by_key[k] for k in keys if k in by_key), None)
+        if first is not None:
+            dropped += 1
+            sources = first.setdefault("sources", [first.get("source")])
+            if job.get("source") not in sources:
+                sources.append(job.get("source"))
+            for k in keys:
+                by_key.setdefault(k, first)
+            continue
+        for k in keys:
+            by_key[k] = job
+        kept.append(job)
+    return kept, dropped
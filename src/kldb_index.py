@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# kldb_index.py — lokaler KldB2010-Index für die Begriffserweiterung (ohne Netzwerk).
+# Usage:
+#   python -m src.kldb_index import berufe.csv        # Dump (CSV/JSON) nach data/kldb2010.json übernehmen
+#   python -m src.kldb_index query "Data Scien"        # Lookup testen (mit Zeitmessung)
+#
+# Aufbau:
+# - Präfixindex: sortierte Schlüssel (Bezeichnung ab jeder Wortgrenze) + bisect
+#   → „data sc“ und „scien“ finden „Data Scientist“, O(log n) je Lookup
+# - Trigramm-Index: unscharfe Suche (Tippfehler, Wortvarianten) per Dice-Koeffizient
+# Ergebnisse haben dasselbe Format wie BAClassification.classify_term.
+
+import argparse
+import csv
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .tokenizer import normalize_txt
+
+KLDB_PATH = Path("data/kldb2010.json")
+
+FIELDS = ("bezeichnung", "berufsId", "kldb2010", "berufsgruppe")
+# Spaltennamen aus gängigen Exporten → interne Felder
+FIELD_ALIASES = {
+    "bezeichnung": "bezeichnung",
+    "berufsbezeichnung": "bezeichnung",
+    "bezeichnung_neutral": "bezeichnung",
+    "beruf": "bezeichnung",
+    "berufsid": "berufsId",
+    "berufid": "berufsId",
+    "id": "berufsId",
+    "kldb2010": "kldb2010",
+    "kldb_2010": "kldb2010",
+    "kldb": "kldb2010",
+    "code": "kldb2010",
+    "schluessel": "kldb2010",
+    "berufsgruppe": "berufsgruppe",
+    "gruppe": "berufsgruppe",
+}
+
+MAX_PREFIX_CANDIDATES = 200
+FUZZY_MIN_SIMILARITY = 0.45
+
+
+def _trigrams(norm: str) -> List[str]:
+    padded = f"  {norm} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _canonical(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Zeile aus CSV/JSON auf die internen Felder abbilden; ohne Bezeichnung → None."""
+    entry = {f: None for f in FIELDS}
+    for k, v in row.items():
+        field = FIELD_ALIASES.get(str(k).strip().lower().replace(" ", "_").replace("-", "_"))
+        if field and entry[field] in (None, "") and v not in (None, ""):
+            entry[field] = v.strip() if isinstance(v, str) else v
+    return entry if entry["bezeichnung"] else None
+
+
+def read_dump(path) -> List[Dict[str, Any]]:
+    """Liest einen KldB2010-Dump (CSV mit ; oder , getrennt, JSON-Liste oder {"berufe": [...]})."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rows = data.get("berufe", []) if isinstance(data, dict) else data
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+            rows = list(csv.DictReader(f, dialect=dialect))
+    entries = [e for e in (_canonical(r) for r in rows) if e]
+    # gleiche Bezeichnung + Code nur einmal
+    return list({(normalize_txt(e["bezeichnung"]), e["kldb2010"]): e for e in entries}.values())
+
+
+class KldbIndex:
+    """
+    In-Memory-Index über KldB2010-Berufsbezeichnungen.
+
+    - lookup(term, limit) → exakt, dann Präfix, dann unscharf (Trigramme)
+    - prefix(text, limit) / fuzzy(text, limit) einzeln nutzbar
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]]):
+        self.entries: List[Dict[str, Any]] = [dict(e) for e in entries]
+        self._norms: List[str] = [normalize_txt(e["bezeichnung"]) for e in self.entries]
+
+        keys: List[Tuple[str, int]] = []
+        for i, norm in enumerate(self._norms):
+            words = norm.split(" ")
+            for w in range(len(words)):
+                keys.append((" ".join(words[w:]), i))
+        keys.sort()
+        self._keys = [k for k, _ in keys]
+        self._key_ids = [i for _, i in keys]
+
+        grams: Dict[str, List[int]] = {}
+        self._gram_sets: List[frozenset] = []
+        for i, norm in enumerate(self._norms):
+            g = frozenset(_trigrams(norm))
+            self._gram_sets.append(g)
+            for t in g:
+                grams.setdefault(t, []).append(i)
+        self._grams = grams
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # --------------------------------------------------
+    # Lookups
+    # --------------------------------------------------
+    def prefix(self, text: str, limit: int = 5) -> List[int]:
+        """Entry-IDs, deren Bezeichnung (oder ein Wort darin) mit `text` beginnt."""
+        q = normalize_txt(text)
+        if not q:
+            return []
+        pos = bisect_left(self._keys, q)
+        seen: Dict[int, bool] = {}
+        while pos < len(self._keys) and self._keys[pos].startswith(q) and len(seen) < MAX_PREFIX_CANDIDATES:
+            i = self._key_ids[pos]
+            # Treffer am Anfang der Bezeichnung zählt mehr als an einer Wortgrenze
+            seen[i] = seen.get(i, False) or self._norms[i].startswith(q)
+            pos += 1
+        ranked = sorted(seen, key=lambda i: (self._norms[i] != q, not seen[i], len(self._norms[i]), self._norms[i]))
+        return ranked[:limit]
+
+    def fuzzy(self, text: str, limit: int = 5, min_similarity: float = FUZZY_MIN_SIMILARITY) -> List[Tuple[int, float]]:
+        """(Entry-ID, Ähnlichkeit) nach Dice-Koeffizient über Trigramme."""
+        q = normalize_txt(text)
+        if not q:
+            return []
+        q_grams = frozenset(_trigrams(q))
+        # Präfix-Filter: Dice >= t verlangt mindestens m gemeinsame Trigramme,
+        # also teilt jeder Treffer eines der (|q| - m + 1) seltensten Trigramme.
+        # Häufige Trigramme („er “, „  k“) werden so nie komplett durchlaufen.
+        m = max(1, math.ceil(min_similarity * len(q_grams) / (2 - min_similarity)))
+        rare = sorted(q_grams, key=lambda g: len(self._grams.get(g, ())))[:len(q_grams) - m + 1]
+        hits: Dict[int, int] = {}
+        for g in rare:
+            for i in self._grams.get(g, ()):
+                hits[i] = hits.get(i, 0) + 1
+        # Obergrenze (Treffer in den seltenen + alle übrigen Trigramme) vor der exakten Schnittmenge prüfen
+        rest = len(q_grams) - len(rare)
+        scored = []
+        for i, n in hits.items():
+            size = len(q_grams) + len(self._gram_sets[i])
+            if 2 * (n + rest) < min_similarity * size:
+                continue
+            scored.append((i, 2 * len(q_grams & self._gram_sets[i]) / size))
+        scored = [s for s in scored if s[1] >= min_similarity]
+        scored.sort(key=lambda s: (-s[1], len(self._norms[s[0]])))
+        return scored[:limit]
+
+    def lookup(self, term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Bis zu `limit` Einträge: Präfixtreffer zuerst, aufgefüllt mit unscharfen Treffern."""
+        ids = self.prefix(term, limit)
+        if len(ids) < limit:
+            for i, _ in self.fuzzy(term, limit):
+                if i not in ids:
+                    ids.append(i)
+                if len(ids) >= limit:
+                    break
+        return [dict(self.entries[i]) for i in ids]
+
+    # --------------------------------------------------
+    # Laden / Speichern
+    # --------------------------------------------------
+    @classmethod
+    def from_dump(cls, path) -> "KldbIndex":
+        return cls(read_dump(path))
+
+    def save(self, path=KLDB_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"berufe": self.entries}, f, ensure_ascii=False)
+
+
+_kldb_index: Optional[KldbIndex] = None
+_kldb_index_lock = threading.Lock()
+
+
+def kldb_index_available(path=KLDB_PATH) -> bool:
+    return Path(path).exists()
+
+
+def get_kldb_index(path=KLDB_PATH) -> Optional[KldbIndex]:
+    """Prozessweit geteilter Index aus data/kldb2010.json (None, wenn kein Dump importiert ist)."""
+    global _kldb_index
+    if _kldb_index is None:
+        with _kldb_index_lock:
+            if _kldb_index is None:
+                if not kldb_index_available(path):
+                    return None
+                t0 = time.perf_counter()
+                _kldb_index = KldbIndex.from_dump(path)
+                print(f"[KldB] Index geladen: {len(_kldb_index)} Bezeichnungen ({time.perf_counter() - t0:.2f} s)")
+    return _kldb_index
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Lokaler KldB2010-Index (Import / Abfrage).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_imp = sub.add_parser("import", help="Dump (CSV/JSON) importieren")
+    p_imp.add_argument("dump", help="Pfad zum KldB2010-Dump")
+    p_imp.add_argument("--out", default=str(KLDB_PATH), help=f"Zieldatei (default: {KLDB_PATH})")
+    p_q = sub.add_parser("query", help="Bezeichnungen nachschlagen")
+    p_q.add_argument("term")
+    p_q.add_argument("--limit", type=int, default=5)
+    p_q.add_argument("--index", default=str(KLDB_PATH), help=f"Indexdatei (default: {KLDB_PATH})")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "import":
+        index = KldbIndex.from_dump(args.dump)
+        if not len(index):
+            print(f"[KldB] ❌ Keine Bezeichnungen in {args.dump} gefunden.")
+            return 1
+        index.save(args.out)
+        print(f"[KldB] ✅ {len(index)} Bezeichnungen nach {args.out} importiert.")
+        return 0
+
+    if not kldb_index_available(args.index):
+        print(f"[KldB] ❌ Kein Index unter {args.index} – zuerst `import` ausführen.")
+        return 1
+    index = KldbIndex.from_dump(args.index)
+    t0 = time.perf_counter()
+    hits = index.lookup(args.term, limit=args.limit)
+    elapsed = (time.perf_counter() - t0) * 1e6
+    for h in hits:
+        print(f"  {h['kldb2010'] or '–':>6}  {h['bezeichnung']}")
+    print(f"[KldB] {len(hits)} Treffer in {elapsed:.0f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
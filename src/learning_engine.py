@@ -1,23 +1,188 @@
 # src/learning_engine.py
-from chromadb import Client
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
-import numpy as np
+import time
+_IMPORT_T0 = time.perf_counter()
+
+import threading
 
-import chromadb
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
-# Neuer Chroma-Client (seit v0.5)
-client = chromadb.PersistentClient(path="data/chroma")
-collection = client.get_or_create_collection(name="job_feedback")
+from .embedding_cache import EmbeddingCache, embed_with_cache
+from .feedback_matrix import FeedbackMatrix, neighbor_signal
+
+# --------------------------------------------------
+# Schwere Ressourcen werden lazy geladen
+# --------------------------------------------------
+# chromadb und sentence_transformers (inkl. torch) werden erst beim ersten
+# Zugriff importiert. Die Objekte leben als Modul-Globals im Streamlit-Prozess
+# und werden damit über Reruns und Sessions hinweg wiederverwendet.
+
+CHROMA_PATH = "data/chroma"
+COLLECTION_NAME = "job_feedback"
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+DEFAULT_BATCH_SIZE = 64
+
+# Scoring-Modi für das gelernte Signal
+SCORING_MODES = ("full", "knn")
+KNN_INDEXES = ("local", "chroma")
+DEFAULT_KNN_K = 20
+DEFAULT_MIN_SIMILARITY = 0.3
+
+_client = None
+_collection = None
+_embedder = None
+_embedding_cache = None
+_resource_lock = threading.RLock()
+
+# Ladezeiten der einzelnen Ressourcen (für timing_report)
+_timings = {}
+_warmup_thread = None
+
+# Feedback-Vektoren im Speicher (einmal aus Chroma geladen, danach inkrementell)
+_feedback_matrix = None
+_feedback_matrix_lock = threading.Lock()
+
+
+def _timed_load(name, loader):
+    t0 = time.perf_counter()
+    obj = loader()
+    _timings[name] = round(time.perf_counter() - t0, 3)
+    return obj
+
+
+def get_chroma_client():
+    """Chroma-Client (seit v0.5 PersistentClient), beim ersten Zugriff erzeugt."""
+    global _client
+    if _client is None:
+        with _resource_lock:
+            if _client is None:
+                def _load():
+                    import chromadb
+                    return chromadb.PersistentClient(path=CHROMA_PATH)
+                _client = _timed_load("chroma_client", _load)
+    return _client
+
+
+def get_collection():
+    """Collection mit den Feedback-Vektoren."""
+    global _collection
+    if _collection is None:
+        with _resource_lock:
+            if _collection is None:
+                client = get_chroma_client()
+                _collection = _timed_load(
+                    "chroma_collection", lambda: client.get_or_create_collection(name=COLLECTION_NAME)
+                )
+    return _collection
+
+
+def get_embedder():
+    """SentenceTransformer-Modell, beim ersten Zugriff geladen."""
+    global _embedder
+    if _embedder is None:
+        with _resource_lock:
+            if _embedder is None:
+                def _load():
+                    from sentence_transformers import SentenceTransformer
+                    return SentenceTransformer(MODEL_NAME)
+                _embedder = _timed_load("embedder", _load)
+    return _embedder
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Content-Hash → Vektor, persistiert neben data/chroma."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _resource_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache()
+    return _embedding_cache
+
+
+def __getattr__(name):
+    # Abwärtskompatibilität: frühere Modul-Globals client/collection/embedder
+    if name == "client":
+        return get_chroma_client()
+    if name == "collection":
+        return get_collection()
+    if name == "embedder":
+        return get_embedder()
+    if name == "embedding_cache":
+        return get_embedding_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def warm_up(background: bool = True):
+    """
+    Lädt Modell, Collection und Feedbackmatrix vorab.
+    background=True startet dafür (einmal pro Prozess) einen Daemon-Thread
+    und kehrt sofort zurück.
+    """
+    def _run():
+        try:
+            get_embedder()
+            get_feedback_matrix()
+            get_embedding_cache()
+        except Exception as e:
+            print(f"[Learning] Warm-up fehlgeschlagen: {e}")
+
+    global _warmup_thread
+    if not background:
+        _run()
+        return None
+    with _resource_lock:
+        # Streamlit führt main_app bei jedem Rerun aus – nur einmal pro Prozess starten
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_run, name="learning-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
 
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+
+def timing_report() -> dict:
+    """
+    Import- vs. Ladezeiten: `import_s` ist die Zeit für den (jetzt leichten)
+    Modulimport, `deferred_s` die Summe der bisher lazy geladenen Ressourcen –
+    also die Zeit, die ein eager Import beim App-Start gekostet hätte.
+    """
+    deferred = round(sum(_timings.values()), 3)
+    return {"import_s": IMPORT_SECONDS, "resources": dict(_timings), "deferred_s": deferred}
+
+
+def get_feedback_matrix() -> FeedbackMatrix:
+    """Lädt die Feedbackmatrix beim ersten Zugriff aus Chroma."""
+    global _feedback_matrix
+    if _feedback_matrix is None:
+        with _feedback_matrix_lock:
+            if _feedback_matrix is None:
+                fm = FeedbackMatrix()
+                all_data = get_collection().get(include=["embeddings", "metadatas"])
+                if isinstance(all_data, dict):
+                    fm.load(all_data.get("ids") or [],
+                            all_data.get("embeddings"),
+                            all_data.get("metadatas") or [])
+                _feedback_matrix = fm
+    return _feedback_matrix
+
+
+def embed_texts(texts, batch_size: int = DEFAULT_BATCH_SIZE) -> np.ndarray:
+    """
+    Bettet viele Texte in einem encode-Aufruf ein (float32, Zeilen in Eingabereihenfolge).
+    Bereits bekannte Texte kommen aus dem Embedding-Cache.
+    """
+    return embed_with_cache(get_embedder().encode, list(texts), MODEL_NAME, get_embedding_cache(), batch_size)
 
 
 def embed_text(text: str):
     """Erzeugt Vektor für beliebigen Text."""
-    return embedder.encode([text])[0].tolist()
+    return embed_texts([text])[0].tolist()
+
+
+def _job_text(job: dict) -> str:
+    """Text, mit dem ein Job für die Fit-Score-Vorhersage eingebettet wird."""
+    return " ".join([
+        job.get("titel") or job.get("title") or "",
+        job.get("beschreibung") or "",
+    ])
 
 
 def store_feedback(job: dict, profile_id: int, feedback_value: int, base_score: float, comment: str = None):
@@ -41,56 +206,103 @@ def store_feedback(job: dict, profile_id: int, feedback_value: int, base_score:
         "location": job.get("ort") or job.get("location"),
     }
 
-    collection.upsert(
+    get_collection().upsert(
         ids=[doc_id],
         embeddings=[embedding],
         documents=[text],
         metadatas=[metadata],
     )
+    # In-Process-Matrix nachziehen (nur falls schon geladen – sonst liest sie Chroma ohnehin frisch)
+    if _feedback_matrix is not None:
+        _feedback_matrix.upsert(doc_id, embedding, feedback_value)
     #client.persist()
 
 
-def predict_fit_score(job: dict, base_score: float):
-    """Berechnet persönlichen Fit-Score aus BaseScore + Chroma-Ähnlichkeiten."""
-    text = " ".join([
-        job.get("titel") or job.get("title") or "",
-        job.get("beschreibung") or "",
-    ])
-    emb = np.array(embed_text(text))
-
-    # Daten aus Chroma holen
-    all_data = collection.get(include=["embeddings", "metadatas"])
-    embeddings = None
-    metas = []
+def _chroma_knn_signal(job_embs: np.ndarray, k: int, min_similarity: float) -> np.ndarray:
+    """Top-k-Signal über den HNSW-Index von Chroma (sublinear in der Feedbackmenge)."""
+    collection = get_collection()
+    n = collection.count()
+    if n == 0:
+        return np.zeros(len(job_embs), dtype=np.float32)
+    res = collection.query(
+        query_embeddings=job_embs.tolist(),
+        n_results=min(k, n),
+        include=["embeddings", "metadatas"],
+    )
+    signal = np.zeros(len(job_embs), dtype=np.float32)
+    for i, job_vec in enumerate(job_embs):
+        neigh = np.asarray(res["embeddings"][i], dtype=np.float32)
+        if neigh.size == 0:
+            continue
+        # Kosinus exakt nachrechnen – unabhängig von der Distanzmetrik der Collection
+        sims = (neigh @ job_vec) / (np.linalg.norm(neigh, axis=1) * np.linalg.norm(job_vec) + 1e-8)
+        weights = np.array([(m or {}).get("feedback_value") or 0 for m in res["metadatas"][i]],
+                           dtype=np.float32)
+        signal[i] = neighbor_signal(sims[None, :], weights[None, :], min_similarity)[0]
+    return signal
 
-    if isinstance(all_data, dict):
-        embeddings = all_data.get("embeddings")
-        metas = all_data.get("metadatas", [])
 
-    # ✅ Sicher prüfen, ob wirklich Vektoren vorhanden sind
-    if embeddings is None:
-        return base_score
-    if isinstance(embeddings, list) and len(embeddings) == 0:
-        return base_score
-    if isinstance(embeddings, np.ndarray) and embeddings.size == 0:
-        return base_score
+def predict_fit_scores(jobs, base_scores, batch_size: int = DEFAULT_BATCH_SIZE,
+                       mode: str = "full", k: int = DEFAULT_KNN_K,
+                       min_similarity: float = DEFAULT_MIN_SIMILARITY, index: str = "local"):
+    """
+    Batch-Variante von predict_fit_score: alle Jobs werden in einem
+    encode-Aufruf eingebettet und gegen die vornormierte Feedbackmatrix
+    im Speicher gerechnet (Chroma wird nur beim ersten Aufruf gelesen).
+    Gibt eine Liste von Fit-Scores in Eingabereihenfolge zurück.
 
-    embs = np.array(embeddings)
-    if embs.ndim == 0 or embs.size == 0:
-        return base_score
+    mode="full": Mittel über alle Feedback-Einträge (bisheriges Verhalten).
+    mode="knn": nur die k nächsten Nachbarn mit Ähnlichkeit >= min_similarity,
+    distanzgewichtet; index="local" (Matrix im Speicher) oder "chroma" (HNSW,
+    lädt die Feedbackmatrix nicht).
+    """
+    if mode not in SCORING_MODES:
+        raise ValueError(f"Unbekannter Scoring-Modus: {mode}")
+    if index not in KNN_INDEXES:
+        raise ValueError(f"Unbekannter Nachbar-Index: {index}")
+    jobs = list(jobs)
+    base = np.asarray(list(base_scores), dtype=np.float64)
+    if not jobs:
+        return []
 
-    # Kosinusähnlichkeiten berechnen
-    norms = np.linalg.norm(embs, axis=1) * np.linalg.norm(emb)
-    sims = np.dot(embs, emb) / (norms + 1e-8)
-    sims = np.nan_to_num(sims)
+    # HNSW-Modus braucht die Feedbackmatrix nicht – kein Vollscan der Collection
+    use_chroma = mode == "knn" and index == "chroma"
+    if use_chroma:
+        if get_collection().count() == 0:
+            return [float(b) for b in base]
+    else:
+        fm = get_feedback_matrix()
+        if len(fm) == 0:
+            return [float(b) for b in base]
 
-    # Feedback-Werte
-    weights = np.array([m.get("feedback_value", 0) for m in metas])
-    if weights.size == 0:
-        return base_score
+    job_embs = embed_texts([_job_text(j) for j in jobs], batch_size=batch_size)
 
-    learned_signal = np.sum(sims * weights) / (np.sum(np.abs(weights)) + 1e-6)
+    if use_chroma:
+        learned_signal = _chroma_knn_signal(job_embs, k, min_similarity)
+    elif mode == "knn":
+        learned_signal = fm.knn_signal(job_embs, k=k, min_similarity=min_similarity)
+    else:
+        # Ein Matrixprodukt (Jobs × Feedback) für den ganzen Batch
+        learned_signal = fm.learned_signal(job_embs)
 
     # Kombinieren mit BaseScore
-    fit_score = 0.6 * base_score + 0.4 * (learned_signal + 1) / 2  # Normierung 0–1
-    return float(np.clip(fit_score, 0, 1))
\ No newline at end of file
+    fit = 0.6 * base + 0.4 * (learned_signal + 1) / 2  # Normierung 0–1
+    return [float(x) for x in np.clip(fit, 0, 1)]
+
+
+def predict_fit_score(job: dict, base_score: float, mode: str = "full", **kwargs):
+    """Berechnet persönlichen Fit-Score aus BaseScore + Chroma-Ähnlichkeiten."""
+    return predict_fit_scores([job], [base_score], mode=mode, **kwargs)[0]
+
+
+IMPORT_SECONDS = round(time.perf_counter() - _IMPORT_T0, 3)
+
+
+if __name__ == "__main__":
+    # python -m src.learning_engine  → Startzeit-Report
+    print(f"[Learning] Modulimport: {IMPORT_SECONDS:.3f} s")
+    warm_up(background=False)
+    report = timing_report()
+    for name, secs in report["resources"].items():
+        print(f"[Learning] {name:<18} {secs:.3f} s (lazy)")
+    print(f"[Learning] beim App-Start eingespart: {report['deferred_s']:.3f} s")
@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .base_source import JobSource
+from .job_schema import normalize_job
+from .tokenizer import normalize_txt, tokenize
+
+# --------------------------------------------------
+# Mock-HTTP-Quelle: simulierte Job-API (offline, für Tests/Lasttests)
+# --------------------------------------------------
+
+TITLES = [
+    "Data Scientist", "Datenanalyst", "Projektleiter KI", "Bürokaufmann", "Sachbearbeiter Verwaltung",
+    "Marketing Manager", "Online-Marketing Manager", "Kommunikation Referent", "Python Entwickler",
+    "CRM Coordinator", "Business Analyst", "Content Manager",
+]
+COMPANIES = ["Muster GmbH", "Beispiel AG", "Daten & Co. KG", "Nordlicht Consulting", "Lausitz Digital"]
+CITIES = ["Berlin", "Dresden", "Görlitz", "Leipzig", "München", "Köln", "Remote"]
+
+
+class MockResponse:
+    """Minimal wie requests.Response (status_code, json(), text)."""
+
+    def __init__(self, status_code: int, payload: Optional[Dict[str, Any]] = None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = "" if payload is None else "mock"
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+
+class MockHTTPSource(JobSource):
+    """
+    Simulierte Fremd-API mit eigenem Antwortformat ({"results": [...]},
+    verschachtelte Felder) – geht durch dieselbe Normalisierung wie echte Quellen.
+
+    - latency: Sekunden je Anfrage (Timeouts des Aggregators testen)
+    - error_rate: Anteil der Anfragen mit HTTP 503
+    - handler(path, params) -> MockResponse ersetzt die eingebaute API
+    """
+
+    name = "Mock-API"
+    key = "mock"
+
+    def __init__(self,
+                 latency: float = 0.05,
+                 error_rate: float = 0.0,
+                 seed: int = 0,
+                 total: int = 200,
+                 handler: Optional[Callable[[str, Dict[str, Any]], MockResponse]] = None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.handler = handler or self._default_handler
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        rng = random.Random(seed)
+        self._catalog = [
+            {
+                "id": f"m{i:05d}",
+                "title": rng.choice(TITLES),
+                "company": {"name": rng.choice(COMPANIES)},
+                "location": {"city": rng.choice(CITIES)},
+                "description": "Simulierte Stellenanzeige für Tests.",
+                "published": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "link": f"https://jobs.example.invalid/m{i:05d}",
+            }
+            for i in range(total)
+        ]
+        self._by_id = {j["id"]: j for j in self._catalog}
+
+    # -------------------------------------------------------------
+    # Simulierter Transport
+    # -------------------------------------------------------------
+    def _request(self, path: str, params: Dict[str, Any]) -> MockResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._rng_lock:
+            failed = self.error_rate and self._rng.random() < self.error_rate
+        if failed:
+            return MockResponse(503)
+        return self.handler(path, params)
+
+    def _default_handler(self, path: str, params: Dict[str, Any]) -> MockResponse:
+        if path == "/jobs":
+            q_tokens = tokenize(params.get("q"))
+            q_ort = normalize_txt(params.get("where"))
+            results = [
+                j for j in self._catalog
+                if (not q_tokens or q_tokens & tokenize(j["title"]))
+                and (not q_ort or q_ort == "deutschland" or q_ort in normalize_txt(j["location"]["city"]))
+            ]
+            return MockResponse(200, {"results": results[:params.get("limit", 10)], "total": len(results)})
+        if path.startswith("/jobs/"):
+            job = self._by_id.get(path.rsplit("/", 1)[-1])
+            return MockResponse(200, job) if job else MockResponse(404)
+        return MockResponse(404)
+
+    # -------------------------------------------------------------
+    # JobSource
+    # -------------------------------------------------------------
+    def _fetch_search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        r = self._request("/jobs", {"q": query, "where": ort, "radius": umkreis, "limit": size})
+        if r.status_code != 200:
+            raise RuntimeError(f"HTTP {r.status_code}")
+        return [normalize_job(j, self.name, self.key) for j in r.json().get("results", [])]
+
+    def search(self, query: str, ort: str, umkreis: int, size: int = 10) -> List[Dict[str, Any]]:
+        try:
+            return self._fetch_search(query, ort, umkreis, size)
+        except Exception as e:
+            print(f"[Mock] Fehler bei Suche ({query}): {e}")
+            return []
+
+    def get_details(self, job_id: str) -> Dict[str, Any]:
+        raw_id = str(job_id).split(":", 1)[-1]
+        r = self._request(f"/jobs/{raw_id}", {})
+        if r.status_code != 200:
+            return {"beschreibung": "Keine Detailbeschreibung verfügbar.", "url": None}
+        job = normalize_job(r.json(), self.name, self.key)
+        return {"beschreibung": job.get("beschreibung"), "url": job.get("url")}
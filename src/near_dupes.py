@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# near_dupes.py — Near-Duplicate-Erkennung für Stellenanzeigen (MinHash + LSH).
+# Usage:
+#   python -m src.near_dupes                  # neue Jobs gegen den Bestand prüfen (inkrementell)
+#   python -m src.near_dupes --full           # alle Signaturen + Markierungen neu berechnen
+#
+# Signatur je Job:
+# - Kopf: Zeichen-4-Gramme aus Titel | Arbeitgeber | Ort (Gender-Zusätze wie „m/w/d“ entfernt)
+# - Beschreibung: Wort-3-Gramme der ersten DESC_CHARS Zeichen (falls vorhanden)
+# Kandidaten kommen aus einem LSH-Index über die Kopf-Signatur (Bänder), geprüft wird
+# die geschätzte Jaccard-Ähnlichkeit von Kopf und – wenn beide eine haben – Beschreibung.
+# Fehlt die Beschreibung (z. B. BA-Suchtreffer), entscheidet nur der Kopf: dann gilt die
+# strengere HEAD_ONLY_THRESHOLD und die Titel-Wörter müssen übereinstimmen.
+# Im Bestand zeigt jobs.duplicate_of auf das Original (kleinste id); Scoring,
+# Volltextsuche und gespeicherte Ergebnislisten überspringen markierte Jobs.
+
+import argparse
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .db_manager import DB_PATH, ensure_schema, get_connection, transaction
+from .job_schema import dedupe_jobs
+from .scoring import NEGATIVE_LEVEL, POSITIVE_LEVEL
+from .tokenizer import normalize_txt, tokenize
+
+HEAD_PERM = 64             # MinHash-Funktionen für Titel/Arbeitgeber/Ort
+DESC_PERM = 32             # MinHash-Funktionen für die Beschreibung
+DESC_END = HEAD_PERM + DESC_PERM
+LEVEL_POS = DESC_END       # Level-Fingerprint (senior/junior/… müssen übereinstimmen)
+TITLE_POS = DESC_END + 1   # Fingerprint der Titel-Wörter (nur ohne Beschreibung geprüft)
+SIG_LEN = DESC_END + 2
+BANDS = 16                 # 16 Bänder × 4 Zeilen → Kandidat ab Jaccard ≈ 0.5
+HEAD_THRESHOLD = 0.7
+HEAD_ONLY_THRESHOLD = 0.9  # ohne Beschreibung auf einer Seite
+DESC_THRESHOLD = 0.6
+SHINGLE_CHARS = 4
+DESC_CHARS = 2000
+DEFAULT_CHUNK_SIZE = 2000
+
+_PRIME = 4294967291        # größte Primzahl < 2^32
+_EMPTY = np.uint32(0xFFFFFFFF)  # Platzhalter „keine Beschreibung“ (> alle Hashwerte)
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 2 ** 31, size=HEAD_PERM + DESC_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=HEAD_PERM + DESC_PERM).astype(np.uint64)
+
+LEVEL_TOKENS = NEGATIVE_LEVEL | POSITIVE_LEVEL | {"junior", "leiter", "leitung", "praktikant", "azubi", "ausbildung"}
+_DIGITS = re.compile(r"\d+")
+_GENDER = re.compile(r"\b(?:m|w|d|f|x|i|div|all|gender|genders)(?: (?:m|w|d|f|x|i|div|all|gender|genders))+\b")
+
+
+# --------------------------------------------------
+# Signaturen
+# --------------------------------------------------
+def _field(job: Dict[str, Any], *names: str) -> str:
+    return next((job[n] for n in names if job.get(n)), "") or ""
+
+
+def job_shingles(job: Dict[str, Any]) -> Tuple[Set[int], Set[int]]:
+    """(Kopf-Shingles, Beschreibungs-Shingles) als crc32-Hashes; akzeptiert BA- und DB-Feldnamen."""
+    title = _GENDER.sub(" ", normalize_txt(_field(job, "titel", "title")))
+    head = " | ".join((
+        " ".join(title.split()),
+        normalize_txt(_field(job, "arbeitgeber", "company")),
+        " ".join(_DIGITS.sub(" ", normalize_txt(_field(job, "ort", "location"))).split()),  # ohne PLZ
+    ))
+    head_sh = {zlib.crc32(head[i:i + SHINGLE_CHARS].encode("utf-8"))
+               for i in range(max(1, len(head) - SHINGLE_CHARS + 1))}
+    words = normalize_txt(_field(job, "beschreibung", "description")[:DESC_CHARS]).split()
+    desc_sh = {zlib.crc32(" ".join(words[i:i + 3]).encode("utf-8")) for i in range(len(words) - 2)}
+    return head_sh, desc_sh
+
+
+def _minhash(hashes: Set[int], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if not hashes:
+        return np.full(len(a), _EMPTY, dtype=np.uint32)
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    return ((np.outer(x, a) + b) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def _fingerprints(job: Dict[str, Any]) -> np.ndarray:
+    """(Level, Titel-Wörter) als crc32 – Titel ohne Gender-Zusätze, Reihenfolge egal."""
+    title = _GENDER.sub(" ", normalize_txt(_field(job, "titel", "title")))
+    tokens = tokenize(title)
+    levels = " ".join(sorted(tokens & LEVEL_TOKENS))
+    words = " ".join(sorted(tokens))
+    return np.array([zlib.crc32(levels.encode("utf-8")), zlib.crc32(words.encode("utf-8"))], dtype=np.uint32)
+
+
+def job_signature(job: Dict[str, Any]) -> np.ndarray:
+    """MinHash-Signatur (HEAD_PERM + DESC_PERM Werte + Level- und Titel-Fingerprint, uint32)."""
+    head_sh, desc_sh = job_shingles(job)
+    return np.concatenate((
+        _minhash(head_sh, _A[:HEAD_PERM], _B[:HEAD_PERM]),
+        _minhash(desc_sh, _A[HEAD_PERM:], _B[HEAD_PERM:]),
+        _fingerprints(job),
+    ))
+
+
+def similarity(s1: np.ndarray, s2: np.ndarray) -> Tuple[float, Optional[float]]:
+    """Geschätzte Jaccard-Ähnlichkeit (Kopf, Beschreibung oder None, wenn eine fehlt)."""
+    head = float(np.count_nonzero(s1[:HEAD_PERM] == s2[:HEAD_PERM])) / HEAD_PERM
+    d1, d2 = s1[HEAD_PERM:DESC_END], s2[HEAD_PERM:DESC_END]
+    if d1[0] == _EMPTY or d2[0] == _EMPTY:
+        return head, None
+    return head, float(np.count_nonzero(d1 == d2)) / DESC_PERM
+
+
+# --------------------------------------------------
+# LSH-Index
+# --------------------------------------------------
+class NearDuplicateIndex:
+    """
+    LSH über die Kopf-Signatur: jede Signatur landet in BANDS Buckets, Kandidaten
+    sind alle Einträge, die mindestens einen Bucket teilen (sub-linear statt paarweise).
+    Die Kandidaten werden gemeinsam als Matrix geprüft (ein numpy-Vergleich je Anfrage).
+    """
+
+    def __init__(self, head_threshold: float = HEAD_THRESHOLD, desc_threshold: float = DESC_THRESHOLD,
+                 bands: int = BANDS, head_only_threshold: float = HEAD_ONLY_THRESHOLD):
+        if HEAD_PERM % bands:
+            raise ValueError(f"HEAD_PERM ({HEAD_PERM}) muss durch bands ({bands}) teilbar sein.")
+        self.head_threshold = head_threshold
+        self.desc_threshold = desc_threshold
+        self.head_only_threshold = max(head_threshold, head_only_threshold)
+        self.bands = bands
+        self._rows = HEAD_PERM // bands
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._keys: List[Any] = []
+        self._mat = np.empty((1024, SIG_LEN), dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, sig: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for b in range(self.bands):
+            yield b, sig[b * self._rows:(b + 1) * self._rows].tobytes()
+
+    def add(self, key: Any, sig: np.ndarray) -> None:
+        row = len(self._keys)
+        if row == len(self._mat):
+            self._mat = np.concatenate((self._mat, np.empty_like(self._mat)))
+        self._mat[row] = sig
+        self._keys.append(key)
+        for bk in self._band_keys(sig):
+            self._buckets.setdefault(bk, []).append(row)
+
+    def candidates(self, sig: np.ndarray) -> Set[Any]:
+        return {self._keys[r] for r in self._candidate_rows(sig)}
+
+    def _candidate_rows(self, sig: np.ndarray) -> List[int]:
+        rows: Set[int] = set()
+        for bk in self._band_keys(sig):
+            rows.update(self._buckets.get(bk, ()))
+        return sorted(rows)
+
+    def is_duplicate(self, s1: np.ndarray, s2: np.ndarray) -> bool:
+        if s1[LEVEL_POS] != s2[LEVEL_POS]:  # unterschiedliches Level (z. B. „Senior“ vs. ohne)
+            return False
+        head, desc = similarity(s1, s2)
+        if desc is None:  # nur der Kopf: strenger, Titel-Wörter müssen gleich sein
+            return head >= self.head_only_threshold and s1[TITLE_POS] == s2[TITLE_POS]
+        return head >= self.head_threshold and desc >= self.desc_threshold
+
+    def match(self, sig: np.ndarray) -> Optional[Any]:
+        """Ähnlichster Eintrag über den Schwellen (bei Gleichstand der zuerst eingefügte) oder None."""
+        rows = self._candidate_rows(sig)
+        if not rows:
+            return None
+        cand = self._mat[rows]
+        head = np.count_nonzero(cand[:, :HEAD_PERM] == sig[:HEAD_PERM], axis=1) / HEAD_PERM
+        # ohne Beschreibung auf einer Seite zählt nur der Kopf – dann strenger und gleiche Titel-Wörter
+        head_only = (cand[:, HEAD_PERM] == _EMPTY) | (sig[HEAD_PERM] == _EMPTY)
+        ok = (cand[:, LEVEL_POS] == sig[LEVEL_POS]) & np.where(
+            head_only,
+            (head >= self.head_only_threshold) & (cand[:, TITLE_POS] == sig[TITLE_POS]),
+            head >= self.head_threshold,
+        )
+        if sig[HEAD_PERM] != _EMPTY:
+            desc_part = cand[:, HEAD_PERM:DESC_END]
+            desc = np.count_nonzero(desc_part == sig[HEAD_PERM:DESC_END], axis=1) / DESC_PERM
+            ok &= head_only | (desc >= self.desc_threshold)
+        if not ok.any():
+            return None
+        best = int(np.argmax(np.where(ok, head, -1.0)))  # argmax: erster bei Gleichstand
+        return self._keys[rows[best]]
+
+
+# --------------------------------------------------
+# Suchbatches
+# --------------------------------------------------
+def dedupe_near_duplicates(jobs: Iterable[Dict[str, Any]],
+                           head_threshold: float = HEAD_THRESHOLD,
+                           desc_threshold: float = DESC_THRESHOLD) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Entfernt exakte (refnr/Inhalt, job_schema.dedupe_jobs) und unscharfe Dubletten.
+    Jobs ohne refnr werden nicht zusammengelegt, nur weil die refnr fehlt.
+    Das erste Vorkommen bleibt; refnrs der Dubletten stehen unter "duplicates".
+    Gibt (jobs, anzahl_entfernt) zurück.
+    """
+    exact, dropped = dedupe_jobs(jobs)
+    index = NearDuplicateIndex(head_threshold, desc_threshold)
+    kept: List[Dict[str, Any]] = []
+    for job in exact:
+        sig = job_signature(job)
+        m = index.match(sig)
+        if m is None:
+            index.add(len(kept), sig)
+            kept.append(job)
+            continue
+        dropped += 1
+        first = kept[m]
+        first.setdefault("duplicates", []).append(job.get("refnr"))
+        sources = first.setdefault("sources", [first.get("source")])
+        for src in job.get("sources") or [job.get("source")]:
+            if src not in sources:
+                sources.append(src)
+    return kept, dropped
+
+
+# --------------------------------------------------
+# Bestand: jobs.duplicate_of pflegen
+# --------------------------------------------------
+def _iter_unsigned(conn, full: bool, chunk_size: int):
+    last_id = -1
+    # ohne Signatur oder mit Signatur eines älteren Formats (andere Länge)
+    where = "" if full else "AND (m.job_id IS NULL OR length(m.signature) <> ?)"
+    params = () if full else (SIG_LEN * 4,)
+    while True:
+        rows = conn.execute(
+            f"""
+            SELECT j.id, j.title, j.company, j.location, j.description
+            FROM jobs j LEFT JOIN job_minhash m ON m.job_id = j.id
+            WHERE j.id > ? {where} ORDER BY j.id LIMIT ?
+            """,
+            (last_id, *params, chunk_size),
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def update_signatures(db_path=DB_PATH, full: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Berechnet Signaturen für Jobs ohne (bzw. bei full für alle) sowie für Signaturen
+    eines älteren Formats. Neue Signaturen gelten als ungeprüft.
+    """
+    n = 0
+    conn = get_connection(db_path)
+    for rows in _iter_unsigned(conn, full, chunk_size):
+        data = [(r[0], job_signature(dict(r)).tobytes()) for r in rows]
+        with transaction(db_path) as tx:
+            tx.executemany(
+                """
+                INSERT INTO job_minhash (job_id, signature, checked) VALUES (?, ?, 0)
+                ON CONFLICT(job_id) DO UPDATE SET signature = excluded.signature, checked = 0
+                """,
+                data,
+            )
+        n += len(data)
+    return n
+
+
+def mark_near_duplicates(db_path=DB_PATH, full: bool = False,
+                         head_threshold: float = HEAD_THRESHOLD,
+                         desc_threshold: float = DESC_THRESHOLD) -> Dict[str, Any]:
+    """
+    Markiert Near-Duplicates im Bestand (jobs.duplicate_of → Original).
+
+    Inkrementell: nur ungeprüfte Signaturen (neue/geänderte Jobs) werden in id-Reihenfolge
+    gegen die Originale im Bestand geprüft – das Original ist also der zuerst gespeicherte
+    Job. Dubletten, deren Original neu geprüft wird oder nicht mehr existiert, werden
+    mitgeprüft (sonst bliebe duplicate_of veraltet). full=True berechnet alles neu und
+    setzt die Markierungen zurück. Für Dubletten werden vorberechnete Profil-Scores entfernt.
+    """
+    ensure_schema(db_path)
+    t0 = time.perf_counter()
+    signed = update_signatures(db_path, full=full)
+    conn = get_connection(db_path)
+    with transaction(db_path) as tx:
+        if full:
+            tx.execute("UPDATE jobs SET duplicate_of = NULL WHERE duplicate_of IS NOT NULL")
+        # Dubletten von neu zu prüfenden/gelöschten Originalen ebenfalls neu prüfen
+        # (Originale sind nie selbst Dublette – eine Ebene genügt)
+        tx.execute("""
+            UPDATE job_minhash SET checked = 0
+            WHERE checked = 1 AND job_id IN (
+                SELECT d.id FROM jobs d
+                LEFT JOIN job_minhash o ON o.job_id = d.duplicate_of
+                WHERE d.duplicate_of IS NOT NULL AND (o.job_id IS NULL OR o.checked = 0)
+            )
+        """)
+
+    index = NearDuplicateIndex(head_threshold, desc_threshold)
+    for job_id, blob in conn.execute(
+        """
+        SELECT m.job_id, m.signature FROM job_minhash m JOIN jobs j ON j.id = m.job_id
+        WHERE m.checked = 1 AND j.duplicate_of IS NULL ORDER BY m.job_id
+        """
+    ):
+        index.add(job_id, np.frombuffer(blob, dtype=np.uint32))
+
+    pending = conn.execute(
+        "SELECT job_id, signature FROM job_minhash WHERE checked = 0 ORDER BY job_id"
+    ).fetchall()
+    marks: List[Tuple[int, int]] = []
+    for job_id, blob in pending:
+        sig = np.frombuffer(blob, dtype=np.uint32)
+        m = index.match(sig)
+        if m is None:
+            index.add(job_id, sig)
+        else:
+            marks.append((m, job_id))
+
+    with transaction(db_path) as tx:
+        # geprüfte Jobs zuerst zurücksetzen (Inhalt kann sich geändert haben), dann markieren
+        tx.executemany("UPDATE jobs SET duplicate_of = NULL WHERE id = ?", [(r[0],) for r in pending])
+        tx.executemany("UPDATE jobs SET duplicate_of = ? WHERE id = ?", marks)
+        tx.executemany("DELETE FROM job_profile_scores WHERE job_id = ?", [(dup,) for _, dup in marks])
+        tx.executemany("UPDATE job_minhash SET checked = 1 WHERE job_id = ?", [(r[0],) for r in pending])
+
+    stats = {
+        "signed": signed,
+        "checked": len(pending),
+        "duplicates": len(marks),
+        "originals": len(index),
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+    print(f"[Dubletten] {stats['checked']} Jobs geprüft, {stats['duplicates']} als Dublette markiert "
+          f"({stats['originals']} Originale, {stats['seconds']} s)")
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Near-Duplicates im Job-Bestand markieren (MinHash + LSH).")
+    ap.add_argument("--db", default=DB_PATH, help=f"Pfad zur SQLite-DB (default: {DB_PATH})")
+    ap.add_argument("--full", action="store_true", help="alle Signaturen und Markierungen neu berechnen")
+    ap.add_argument("--threshold", type=float, default=HEAD_THRESHOLD,
+                    help=f"Mindest-Ähnlichkeit Titel/Arbeitgeber/Ort (default: {HEAD_THRESHOLD})")
+    args = ap.parse_args(argv)
+    mark_near_duplicates(args.db, full=args.full, head_threshold=args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,34 +1,25 @@
-import sqlite3, json
+import json
 
 
 
 from src.ba_source import BAJobSource
+from src.db_manager import DB_PATH, get_connection
+from src.scoring import apply_scores, score_jobs
 
-def load_active_user_profile(db_path="data/career_agent.db"):
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+def load_active_user_profile(db_path=DB_PATH):
+    cur = get_connection(db_path).cursor()
     cur.execute("SELECT * FROM user_profile WHERE is_active = 1;")
     row = cur.fetchone()
-    conn.close()
     return dict(row) if row else None
 
-def load_profiles_for_user(db_path="data/career_agent.db"):
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+def load_profiles_for_user(db_path=DB_PATH):
+    cur = get_connection(db_path).cursor()
     cur.execute("SELECT * FROM profiles;")
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [dict(r) for r in cur.fetchall()]
 
-def search_jobs_for_profiles():
-    user_profile = load_active_user_profile()
-    if not user_profile:
-        print("Kein aktives User-Profil gefunden.")
-        return []
-
-    prefs = json.loads(user_profile.get("preferences_json") or "{}")
+def search_location(user_profile):
+    """Ort und Radius aus den Präferenzen des User-Profils."""
+    prefs = json.loads((user_profile or {}).get("preferences_json") or "{}")
     work_modes = prefs.get("work_modes", {})
 
     # Basiseinstellungen (Ort, Radius)
@@ -38,88 +29,62 @@ def search_jobs_for_profiles():
     else:
         ort = work_modes.get("on_site", {}).get("location", "Görlitz")
         radius = work_modes.get("on_site", {}).get("radius_km", 30)
+    return ort, radius
+
+def profile_query(profile):
+    """Suchbegriff eines Profils („Profil – KI-Enablement Manager“ → „KI-Enablement Manager“)."""
+    return (profile.get("name") or "").split("–")[-1].strip() or "Data Analyst"
+
+def map_job_fields(job: dict) -> dict:
+    """BA-Felder (titel/arbeitgeber/ort) zusätzlich unter den DB-/Scoring-Namen ablegen."""
+    job["title"] = job.get("titel", job.get("title", "")) or ""
+    job["company"] = job.get("arbeitgeber", job.get("company", "")) or ""
+    job["location"] = job.get("ort", job.get("location", "")) or ""
+    return job
+
+def build_scoring_profile(profile: dict, terms: list, region: str) -> dict:
+    """Bereitet Profiltext für Scoring vor."""
+    p = dict(profile)
+    p["skills"] = profile.get("skills") or ", ".join(terms)
+    p["summary"] = profile.get("description_text", "") or profile.get("name", "")
+    p["region"] = region or profile.get("region", "")
+    return p
 
+def search_jobs_for_profiles():
+    user_profile = load_active_user_profile()
+    if not user_profile:
+        print("Kein aktives User-Profil gefunden.")
+        return []
+
+    ort, radius = search_location(user_profile)
     profiles = load_profiles_for_user()
     ba = BAJobSource()
 
     results = []
     for p in profiles:
-        query = p["name"] or "Data Analyst"
+        # gleicher Suchbegriff wie Hintergrundsuche und Cache-Warm-up
+        query = profile_query(p)
         desc = (p.get("description_text") or "")[:120]
         print(f"🔍 Suche für {query} ({ort}, {radius} km) ...")
 
         # --- Jobs von der Arbeitsagentur holen ---
         jobs = ba.search(query, ort, radius, size=10)
 
-        # --- NEU: Leichtgewicht-Scoring für jedes Job-Angebot ---
-        for job in jobs:
-            score, why = compute_basescore(job, p)
-            job["base_score"] = score
-            job["why_base"] = why
+        # --- Leichtgewicht-Scoring für den ganzen Batch ---
+        apply_scores(jobs, p, preset="research")
 
         # Optional: gleich sortieren
         jobs.sort(key=lambda j: j.get("base_score", 0), reverse=True)
 
         results.append({
-            "profile_name": query,
+            "profile_name": p["name"] or query,
             "description": desc,
             "jobs": jobs
         })
     return results
 
 # research_agent.py – Ausschnitt: Leichtgewicht-Scoring nach Job-Fetch
-import re
-
-STOPWORDS = {"und","oder","mit","für","der","die","das","den","dem","ein","eine","in","von","an","im","am","auf","bei","zu","aus","per","the","of","to"}
-ROLE_SYNONYMS = {
-    "berater":"consultant","daten":"data","wissenschaftler":"scientist",
-    "ingenieur":"engineer","entwickler":"developer","analyse":"analytics",
-    "architekt":"architect"
-}
-REMOTE_TOKENS = {"remote","homeoffice","home-office","hybrid"}
-
-def _norm(txt: str) -> str:
-    if not txt:
-        return ""
-    txt = txt.lower()
-    txt = txt.replace("ä","ae").replace("ö","oe").replace("ü","ue").replace("ß","ss")
-    txt = re.sub(r"[^a-z0-9+#]+"," ", txt)
-    return txt.strip()
-
-def _toks(txt: str) -> set:
-    return {ROLE_SYNONYMS.get(t, t) for t in _norm(txt).split() if t and t not in STOPWORDS}
-
-def _jaccard(a: set, b: set) -> float:
-    return 0.0 if not a or not b else len(a & b) / len(a | b)
-
 def compute_basescore(job: dict, profile: dict):
-    """Berechnet Basis-Score aus Jobtitel/Ort und Profilfeldern."""
-    title = job.get("title", "") or ""
-    location = job.get("location", "") or ""
-    skills_txt = profile.get("skills", "") or ""
-    summary = profile.get("summary", "") or ""
-    region = profile.get("region", "") or profile.get("preferred_region", "") or ""
-
-    t = _toks(title)
-    prof_skills = {s.strip().lower() for s in re.split(r"[;,/|]", skills_txt) if s.strip()}
-    prof_skills = {_norm(s) for s in prof_skills if s}
-    prof_skills = {ROLE_SYNONYMS.get(s, s) for s in prof_skills}
-    summary_toks = _toks(summary)
-
-    skill_overlap = _jaccard(t, prof_skills | summary_toks)
-    role_match = 1.0 if {"consultant","analyst","architect","engineer","scientist","developer"} & t else 0.0
-    location_match = 1.0 if (region and _norm(region) in _norm(location)) else (0.5 if REMOTE_TOKENS & (t | _toks(location)) else 0.0)
-
-    score = 0.55 * skill_overlap + 0.25 * role_match + 0.20 * location_match
-    score = max(0.0, min(1.0, score))
-
-    why = []
-    if skill_overlap >= 0.25:
-        overlap = list((t & (prof_skills | summary_toks)) - STOPWORDS)[:2]
-        why.append("Skills: " + ", ".join(overlap) if overlap else "Skills passen")
-    if role_match: why.append("Rolle passt")
-    if location_match == 1.0: why.append("Region passt")
-    elif location_match == 0.5: why.append("Remote/Hybrid möglich")
-    if not why: why = ["Basis-Match aus Titel/Ort"]
-
-    return round(score,3), " · ".join(why)
\ No newline at end of file
+    """Berechnet Basis-Score aus Jobtitel/Ort und Profilfeldern (Einzeljob, siehe src.scoring für Batches)."""
+    res = score_jobs([job], profile, preset="research")
+    return float(res["score"][0]), res["why"][0]
@@ -0,0 +1,245 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .tokenizer import ROLE_SYNONYMS, STOPWORDS, normalize_txt, tokenize
+
+# --------------------------------------------------
+# BaseScore: Batch-Scoring für Jobtitel/Ort gegen ein Profil
+# --------------------------------------------------
+
+ROLE_TOKENS = {"consultant", "analyst", "architect", "engineer", "scientist", "developer"}
+NEGATIVE_LEVEL = {"werkstudent", "praktikum", "trainee"}
+POSITIVE_LEVEL = {"senior", "lead", "principal", "head"}
+
+_SKILL_SPLIT = re.compile(r"[;,/|]")
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# --------------------------------------------------
+# Presets: die beiden bisherigen Formeln
+# --------------------------------------------------
+@dataclass(frozen=True)
+class ScoringPreset:
+    name: str
+    w_skill: float
+    w_role: float
+    w_location: float
+    w_level: float = 0.0                # Gewicht für (level_bonus + 0.5)
+    remote_tokens: FrozenSet[str] = frozenset({"remote", "homeoffice", "home-office", "hybrid"})
+    profile_roles: bool = False         # Rollen-Tokens aus role/target_role/title/name zählen als Treffer
+    level_nudges: bool = False          # Werkstudent/Praktikum abwerten, Senior/Lead leicht aufwerten
+    round_digits: Optional[int] = None
+
+
+PRESETS: Dict[str, ScoringPreset] = {
+    # Job-Suche (research_agent.compute_basescore)
+    "research": ScoringPreset("research", 0.55, 0.25, 0.20, round_digits=3),
+    # DB-Batchlauf (compute_basescore.py)
+    "cli": ScoringPreset(
+        "cli", 0.55, 0.25, 0.15, w_level=0.05,
+        remote_tokens=frozenset({"remote", "homeoffice", "home-office", "home", "hybrid"}),
+        profile_roles=True, level_nudges=True,
+    ),
+}
+
+
+def get_preset(preset: Union[str, ScoringPreset]) -> ScoringPreset:
+    if isinstance(preset, ScoringPreset):
+        return preset
+    try:
+        return PRESETS[preset]
+    except KeyError:
+        raise ValueError(f"Unbekanntes Scoring-Preset: {preset!r} (verfügbar: {', '.join(PRESETS)})")
+
+
+# --------------------------------------------------
+# Profil einmal pro Batch vorbereiten
+# --------------------------------------------------
+@dataclass(frozen=True)
+class PreparedProfile:
+    ref_tokens: FrozenSet[str]      # Skills ∪ Summary-Tokens
+    region_norm: str
+    role_tokens: FrozenSet[str]
+    preset: ScoringPreset
+
+
+def prepare_profile(profile: dict, preset: Union[str, ScoringPreset] = "research") -> PreparedProfile:
+    preset = get_preset(preset)
+    skills_txt = profile.get("skills", "") or ""
+    summary = profile.get("summary", "") or ""
+    region = profile.get("region", "") or profile.get("preferred_region", "") or ""
+
+    skills = {normalize_txt(s.strip().lower()) for s in _SKILL_SPLIT.split(skills_txt)} if skills_txt else set()
+    skills = {ROLE_SYNONYMS.get(s, s) for s in skills if s}
+
+    role_tokens = set()
+    if preset.profile_roles:
+        for k in ("role", "target_role", "title", "name"):
+            if profile.get(k):
+                role_tokens |= tokenize(str(profile[k]))
+
+    return PreparedProfile(
+        ref_tokens=frozenset(skills | tokenize(summary)),
+        region_norm=normalize_txt(region),
+        role_tokens=frozenset(role_tokens),
+        preset=preset,
+    )
+
+
+# --------------------------------------------------
+# Batch-Scoring
+# --------------------------------------------------
+def _why(title_tokens, prepared, skill, role, location, level) -> str:
+    bits = []
+    if skill >= 0.25:
+        # sortiert, damit die Begründung über Prozesse hinweg stabil ist (Set-Reihenfolge hängt vom Hash-Seed ab)
+        overlap = sorted((title_tokens & prepared.ref_tokens) - STOPWORDS)
+        if prepared.preset.level_nudges:
+            overlap = [o for o in overlap if o and o not in NEGATIVE_LEVEL]
+        overlap = overlap[:2]
+        bits.append("Skills: " + ", ".join(overlap) if overlap else "Skills passen")
+    if role >= 1.0:
+        bits.append("Rolle passt")
+    if location >= 1.0:
+        bits.append("Region passt")
+    elif location >= 0.5:
+        bits.append("Remote/Hybrid möglich")
+    if level < 0:
+        bits.append("⚠️ Einstiegs-/Studierenden-Rolle")
+    elif level > 0.01:
+        bits.append("Senior/Lead möglich")
+    return " · ".join(bits or ["Basis-Match aus Titel/Ort"])
+
+
+@dataclass(frozen=True)
+class JobTokens:
+    """Profilunabhängige Vorverarbeitung eines Job-Batches (für mehrere Profile wiederverwendbar)."""
+    titles: List[FrozenSet[str]]
+    loc_norms: List[str]
+    loc_tokens: List[FrozenSet[str]]
+    generic_role: np.ndarray          # Titel enthält eine generische Rolle (consultant, analyst, …)
+    level: np.ndarray                 # Werkstudent/Praktikum −0.25, Senior/Lead +0.05
+
+
+def tokenize_jobs(jobs: Sequence[dict]) -> JobTokens:
+    """Tokenisiert Titel/Orte einmal (wiederkehrende Strings kommen aus dem Tokenizer-Cache)."""
+    n = len(jobs)
+    titles, loc_norms, loc_tokens = [], [], []
+    generic_role = np.zeros(n, dtype=bool)
+    level = np.zeros(n, dtype=np.float64)
+
+    for i, job in enumerate(jobs):
+        t = tokenize(job.get("title", ""))
+        loc = job.get("location", "")
+        titles.append(t)
+        loc_tokens.append(tokenize(loc))
+        loc_norms.append(normalize_txt(loc))
+
+        generic_role[i] = bool(ROLE_TOKENS & t)
+        if NEGATIVE_LEVEL & t:
+            level[i] -= 0.25
+        if POSITIVE_LEVEL & t:
+            level[i] += 0.05
+
+    return JobTokens(titles, loc_norms, loc_tokens, generic_role, level)
+
+
+def score_jobs(jobs: Sequence[dict], profile: Union[dict, PreparedProfile],
+               preset: Union[str, ScoringPreset] = "research", with_why: bool = True,
+               tokens: Optional[JobTokens] = None) -> Dict[str, object]:
+    """
+    Bewertet einen ganzen Job-Batch gegen ein Profil.
+
+    Das Profil wird nur einmal vorbereitet (Token-Mengen, Region, Rollen),
+    die Jobs werden einmal tokenisiert (oder `tokens` aus tokenize_jobs
+    wiederverwendet). Rückgabe: NumPy-Arrays skill_overlap, role_match,
+    location_match, level_bonus, score (Eingabereihenfolge) plus die
+    Begründungen unter "why" (Liste, leer bei with_why=False).
+    """
+    prepared = profile if isinstance(profile, PreparedProfile) else prepare_profile(profile, preset)
+    p = prepared.preset
+    tokens = tokens if tokens is not None else tokenize_jobs(jobs)
+    n = len(tokens.titles)
+
+    ref = prepared.ref_tokens
+    skill = np.fromiter((jaccard(t, ref) for t in tokens.titles), dtype=np.float64, count=n)
+
+    role = tokens.generic_role.astype(np.float64)
+    if prepared.role_tokens:
+        role = np.maximum(role, np.fromiter(
+            (bool(prepared.role_tokens & t) for t in tokens.titles), dtype=np.float64, count=n
+        ))
+
+    remote = np.fromiter(
+        (bool(p.remote_tokens & t or p.remote_tokens & lt) for t, lt in zip(tokens.titles, tokens.loc_tokens)),
+        dtype=np.float64, count=n,
+    )
+    location = 0.5 * remote
+    if prepared.region_norm:
+        region_hit = np.fromiter(
+            (prepared.region_norm in ln for ln in tokens.loc_norms), dtype=bool, count=n
+        )
+        location[region_hit] = 1.0
+
+    level = tokens.level if p.level_nudges else np.zeros(n, dtype=np.float64)
+
+    score = p.w_skill * skill + p.w_role * role + p.w_location * location
+    if p.w_level:
+        score = score + p.w_level * (level + 0.5)
+    score = np.clip(score, 0.0, 1.0)
+    if p.round_digits is not None:
+        # Python-round statt np.round, damit die Werte exakt den bisherigen entsprechen
+        score = np.array([round(s, p.round_digits) for s in score.tolist()], dtype=np.float64)
+
+    why: List[str] = []
+    if with_why:
+        why = [
+            _why(tokens.titles[i], prepared, skill[i], role[i], location[i], level[i])
+            for i in range(n)
+        ]
+
+    return {
+        "skill_overlap": skill,
+        "role_match": role,
+        "location_match": location,
+        "level_bonus": level,
+        "score": score,
+        "why": why,
+    }
+
+
+def score_matrix(jobs: Sequence[dict], profiles: Sequence[dict],
+                 preset: Union[str, ScoringPreset] = "cli", with_why: bool = True,
+                 tokens: Optional[JobTokens] = None) -> Dict[str, object]:
+    """
+    Jobs × Profile in einem Durchlauf: Jobs werden einmal tokenisiert,
+    jedes Profil einmal vorbereitet. Rückgabe: "score" als Array
+    (len(jobs), len(profiles)) und "why" als Liste je Profil.
+    """
+    tokens = tokens if tokens is not None else tokenize_jobs(jobs)
+    scores = np.zeros((len(tokens.titles), len(profiles)), dtype=np.float64)
+    why: List[List[str]] = []
+    for k, profile in enumerate(profiles):
+        res = score_jobs(jobs, profile, preset, with_why=with_why, tokens=tokens)
+        scores[:, k] = res["score"]
+        why.append(res["why"])
+    return {"score": scores, "why": why}
+
+
+def apply_scores(jobs: Iterable[dict], profile: Union[dict, PreparedProfile],
+                 preset: Union[str, ScoringPreset] = "research") -> List[dict]:
+    """Schreibt base_score und why_base direkt in die Job-Dicts (in place)."""
+    jobs = list(jobs)
+    res = score_jobs(jobs, profile, preset)
+    for job, s, why in zip(jobs, res["score"].tolist(), res["why"]):
+        job["base_score"] = s
+        job["why_base"] = why
+    return jobs
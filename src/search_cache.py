@@ -0,0 +1,137 @@
+import copy
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .cache import CACHE_DIR, MemoryTTLCache, SQLiteTTLCache
+
+# --------------------------------------------------
+# Ergebnis-Cache für BAJobSource.search (mit Stale-While-Revalidate)
+# --------------------------------------------------
+
+MAX_UMKREIS = 200
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+def normalize_query(text: Optional[str]) -> str:
+    """Kleinschreibung, Umlaute transliterieren, Whitespace zusammenfassen."""
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", text.lower().translate(_UMLAUTS)).strip()
+
+
+def search_cache_key(was: str, wo: str, umkreis: int, size: int) -> str:
+    """Normalisierter Cache-Key für ein (was, wo, umkreis, size)-Tupel."""
+    try:
+        radius = min(int(umkreis), MAX_UMKREIS)
+    except (TypeError, ValueError):
+        radius = 0
+    return f"{normalize_query(was)}|{normalize_query(wo)}|{radius}|{int(size)}"
+
+
+class SearchCache:
+    """
+    TTL-Cache vor BAJobSource.search.
+
+    - backend="memory": prozessweit (überlebt Streamlit-Reruns und Sessions)
+    - backend="disk": SQLite unter data/cache/ba_search.sqlite (überlebt Neustarts)
+    - fresh_ttl: solange gilt ein Ergebnis als aktuell
+    - stale_ttl: bis dahin wird ein veraltetes Ergebnis sofort geliefert und
+      im Hintergrund aktualisiert (Stale-While-Revalidate)
+    """
+
+    def __init__(self,
+                 backend: str = "memory",
+                 fresh_ttl: float = 15 * 60,
+                 stale_ttl: float = 24 * 3600,
+                 max_entries: int = 2000,
+                 path=None,
+                 refresh_workers: int = 2):
+        if backend == "memory":
+            self._store = MemoryTTLCache(ttl=stale_ttl, max_entries=max_entries)
+        elif backend == "disk":
+            self._store = SQLiteTTLCache(path or CACHE_DIR / "ba_search.sqlite",
+                                         ttl=stale_ttl, max_entries=max_entries)
+        else:
+            raise ValueError(f"Unbekanntes Cache-Backend: {backend}")
+        self.backend = backend
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.stale_hits = 0
+        self.refreshes = 0
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers,
+                                                thread_name_prefix="search-cache-refresh")
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+
+    def get_or_fetch(self,
+                     key: str,
+                     fetch: Callable[[], List[Dict[str, Any]]],
+                     stale_while_revalidate: bool = True) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Liefert (jobs, status) mit status "fresh", "stale" oder "miss".
+        Bei "stale" läuft bereits eine Aktualisierung im Hintergrund.
+        Fehler von `fetch` werden nicht gecacht, sondern weitergereicht.
+        """
+        hit, entry = self._store.get(key)
+        if hit and entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age <= self.fresh_ttl:
+                return copy.deepcopy(entry["jobs"]), "fresh"
+            if stale_while_revalidate:
+                self.stale_hits += 1
+                self._refresh_in_background(key, fetch)
+                return copy.deepcopy(entry["jobs"]), "stale"
+
+        jobs = fetch()
+        self.put(key, jobs)
+        return copy.deepcopy(jobs), "miss"
+
+    def put(self, key: str, jobs: List[Dict[str, Any]]) -> None:
+        self._store.put(key, {"fetched_at": time.time(), "jobs": copy.deepcopy(jobs)})
+
+    def _refresh_in_background(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> None:
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+
+        def _run():
+            try:
+                self.put(key, fetch())
+                self.refreshes += 1
+            except Exception as e:
+                print(f"[Cache] Hintergrund-Aktualisierung fehlgeschlagen ({key}): {e}")
+            finally:
+                with self._inflight_lock:
+                    self._inflight.discard(key)
+
+        self._refresh_pool.submit(_run)
+
+    def invalidate(self, key: str) -> None:
+        self._store.delete(key)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        s = self._store.stats()
+        s.update({"backend": self.backend, "stale_hits": self.stale_hits, "refreshes": self.refreshes})
+        return s
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """Prozessweit geteilter In-Memory-Suchcache (Default für BAJobSource)."""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache(backend="memory")
+    return _search_cache
@@ -0,0 +1,98 @@
+import sys
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
+
+# --------------------------------------------------
+# Tokenizer für Titel/Orte/Profile (gemeinsam für alle Scoring-Pfade)
+# --------------------------------------------------
+
+STOPWORDS = frozenset({
+    "und", "oder", "mit", "für", "der", "die", "das", "den", "dem", "ein", "eine",
+    "in", "von", "an", "im", "am", "auf", "bei", "zu", "aus", "per", "the", "of", "to",
+})
+ROLE_SYNONYMS = {
+    "berater": "consultant",
+    "daten": "data",
+    "wissenschaftler": "scientist",
+    "ingenieur": "engineer",
+    "entwickler": "developer",
+    "analyse": "analytics",
+    "analyst": "analyst",
+    "architekt": "architect",
+}
+
+TOKEN_CACHE_SIZE = 65536
+
+_KEEP = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+_UMLAUTS = {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}
+
+
+class _TranslationTable(dict):
+    """
+    Tabelle für str.translate in einem Durchlauf: Kleinschreibung, Umlaute
+    auflösen, alles außer a-z0-9+# wird Leerzeichen. Einträge werden beim
+    ersten Auftreten eines Zeichens berechnet (__missing__) und gemerkt.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        out = []
+        for ch in chr(codepoint).lower():
+            ch = _UMLAUTS.get(ch, ch)
+            out.append(ch if all(c in _KEEP for c in ch) else " ")
+        value = "".join(out)
+        self[codepoint] = value
+        return value
+
+
+_TABLE = _TranslationTable()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _normalize(s: str) -> str:
+    return " ".join(s.translate(_TABLE).split())
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _tokenize(s: str) -> FrozenSet[str]:
+    return frozenset(
+        sys.intern(ROLE_SYNONYMS.get(t, t))
+        for t in _normalize(s).split(" ")
+        if t and t not in STOPWORDS
+    )
+
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def normalize_txt(s: Optional[str]) -> str:
+    """Kleinschreibung, Umlaute auflösen, nur a-z0-9+# behalten (gecacht)."""
+    return _normalize(s) if s else ""
+
+
+def tokenize(s: Optional[str]) -> FrozenSet[str]:
+    """
+    Tokens ohne Stoppwörter, Rollen-Synonyme auf Englisch abgebildet.
+    Gecacht je Rohstring; Rückgabe ist ein (geteiltes) frozenset internierter
+    Strings – nicht verändern, sondern mit | / & neue Mengen bilden.
+    """
+    return _tokenize(s) if s else _EMPTY
+
+
+def tokenizer_stats() -> Dict[str, Dict[str, float]]:
+    """Hit/Miss-Statistik der beiden Caches."""
+    out = {}
+    for name, fn in (("normalize", _normalize), ("tokenize", _tokenize)):
+        info = fn.cache_info()
+        total = info.hits + info.misses
+        out[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / total, 3) if total else 0.0,
+            "size": info.currsize,
+        }
+    return out
+
+
+def clear_tokenizer_cache() -> None:
+    _normalize.cache_clear()
+    _tokenize.cache_clear()
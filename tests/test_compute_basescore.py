@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+from src.compute_basescore import main
+
+
+def _legacy_db(path):
+    """DB im Stand vor den versionierten Migrationen: nur jobs + profiles, ohne duplicate_of."""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL, company TEXT, location TEXT, description TEXT,
+            url TEXT, source TEXT, fit_score REAL DEFAULT 0
+        );
+        CREATE TABLE profiles (
+            id INTEGER PRIMARY KEY, name TEXT, skills TEXT, summary TEXT, region TEXT
+        );
+        INSERT INTO jobs (title, company, location) VALUES
+            ('Data Scientist Python', 'Muster GmbH', 'Berlin'),
+            ('Bürokaufmann', 'Beispiel AG', 'Görlitz');
+        INSERT INTO profiles (id, name, skills, region) VALUES (1, 'Data Scientist', 'Python, SQL', 'Berlin');
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_default_mode_migrates_unmigrated_db(tmp_path):
+    db = str(tmp_path / "legacy.db")
+    _legacy_db(db)
+
+    main(["--db", db])
+
+    conn = sqlite3.connect(db)
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(jobs)")}
+    assert "duplicate_of" in cols
+    scores = dict(conn.execute("SELECT title, base_score FROM jobs"))
+    conn.close()
+    assert scores["Data Scientist Python"] > scores["Bürokaufmann"] > 0
+
+
+def test_prefilter_requires_all_profiles(tmp_path):
+    db = str(tmp_path / "legacy.db")
+    _legacy_db(db)
+    with pytest.raises(SystemExit) as exc:
+        main(["--db", db, "--prefilter"])
+    assert exc.value.code == 2
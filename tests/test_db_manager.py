@@ -0,0 +1,72 @@
+from src import db_manager as db
+
+
+def _job(db_path, job_id):
+    row = db.get_connection(db_path).execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row)
+
+
+def test_upsert_without_description_keeps_stored_values(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    db.ensure_schema(path)
+    full = {
+        "titel": "Data Scientist", "arbeitgeber": "Muster GmbH", "ort": "Berlin", "refnr": "10000-1",
+        "beschreibung": "Machine Learning mit Python und Spark", "url": "https://example.invalid/1",
+        "date_posted": "2024-05-01",
+    }
+    (job_id,) = db.upsert_jobs([full], matched_profile_id=1, db_path=path)
+
+    # Suchtreffer derselben Stelle ohne Beschreibung/Datum/URL (wie in der Hintergrundsuche)
+    hit = {"titel": "Data Scientist", "arbeitgeber": "Muster GmbH", "ort": "Berlin", "refnr": "10000-1"}
+    assert db.upsert_jobs([hit], db_path=path) == [job_id]
+
+    stored = _job(path, job_id)
+    assert stored["description"] == full["beschreibung"]
+    assert stored["date_posted"] == "2024-05-01"
+    assert stored["url"] == full["url"]
+    assert stored["matched_profile_id"] == 1
+    assert [r["job_id"] for r in db.search_jobs_fulltext("Spark", db_path=path)] == [job_id]
+
+
+def test_upsert_new_job_without_date_gets_today(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    db.ensure_schema(path)
+    (job_id,) = db.upsert_jobs([{"titel": "Bürokaufmann", "arbeitgeber": "Beispiel AG", "ort": "Görlitz"}],
+                               db_path=path)
+    assert _job(path, job_id)["date_posted"] == db.datetime.now().strftime("%Y-%m-%d")
+
+
+def _tokens(db_path, job_id):
+    conn = db.get_connection(db_path)
+    return {r[0] for r in conn.execute("SELECT token FROM job_tokens WHERE job_id = ?", (job_id,))}
+
+
+def test_upsert_batch_new_rows_with_and_without_refnr_get_own_ids(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    db.ensure_schema(path)
+    # 3. Zeile geht per refnr in die 2. auf und übernimmt deren Titel → zwei neue Zeilen mit gleichem
+    # Titel/Firma/Ort, eine ohne und eine mit refnr
+    ids = db.upsert_jobs([
+        {"titel": "Data Analyst", "arbeitgeber": "Muster GmbH", "ort": "Berlin"},
+        {"titel": "Data Scientist", "arbeitgeber": "Muster GmbH", "ort": "Berlin", "refnr": "10000-7"},
+        {"titel": "Data Analyst", "arbeitgeber": "Muster GmbH", "ort": "Berlin", "refnr": "10000-7"},
+    ], db_path=path)
+
+    assert ids[1] == ids[2] != ids[0]
+    assert _job(path, ids[0])["refnr"] is None
+    assert _tokens(path, ids[0]) == _tokens(path, ids[1]) == {"data", "analyst"}
+
+
+def test_upsert_reindexes_changed_title_and_description(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    db.ensure_schema(path)
+    job = {"titel": "Data Analyst", "arbeitgeber": "Muster GmbH", "ort": "Berlin", "refnr": "10000-1",
+           "beschreibung": "Reporting mit Excel"}
+    (job_id,) = db.upsert_jobs([job], db_path=path)
+    assert db.upsert_jobs([job], db_path=path) == [job_id]  # unverändert: Index bleibt
+    assert _tokens(path, job_id) == {"data", "analyst"}
+
+    db.upsert_jobs([dict(job, titel="Data Engineer", beschreibung="Pipelines mit Spark")], db_path=path)
+    assert _tokens(path, job_id) == {"data", "engineer"}
+    assert [r["job_id"] for r in db.search_jobs_fulltext("Spark", db_path=path)] == [job_id]
+    assert db.search_jobs_fulltext("Excel", db_path=path) == []
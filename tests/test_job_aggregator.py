@@ -0,0 +1,38 @@
+import time
+
+from src.job_aggregator import SourceAggregator
+from src.mock_source import MockHTTPSource
+
+
+def _slow_on(term, delay):
+    source = MockHTTPSource(latency=0.0)
+    builtin = source.handler
+
+    def handler(path, params):
+        if params.get("q") == term:
+            time.sleep(delay)
+        return builtin(path, params)
+
+    source.handler = handler
+    return source
+
+
+def test_report_seconds_per_query_not_total():
+    agg = SourceAggregator({"slow": _slow_on("Python", 0.3), "fast": MockHTTPSource(latency=0.0, seed=1)},
+                           timeout=5)
+    _, report = agg.search_many([("Data", "Deutschland", 50), ("Python", "Deutschland", 50)], size=5)
+    by_query = {r["query"]: r for r in report}
+
+    assert by_query["Python"]["seconds"] >= 0.3
+    assert by_query["Data"]["seconds"] < 0.2
+    assert by_query["Data"]["total_seconds"] == by_query["Python"]["total_seconds"] >= 0.3
+
+
+def test_timed_out_query_keeps_other_terms():
+    agg = SourceAggregator({"slow": _slow_on("Python", 1.0)}, timeout=0.2)
+    _, report = agg.search_many([("Data", "Deutschland", 50), ("Python", "Deutschland", 50)], size=5)
+    by_query = {r["query"]: r for r in report}
+
+    assert by_query["Data"]["sources"]["slow"] > 0 and by_query["Data"]["error"] is None
+    assert by_query["Python"]["error"] and by_query["Python"]["seconds"] == 0.2
+    assert agg.last_source_report[0]["status"] == "partial"
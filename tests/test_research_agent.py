@@ -0,0 +1,31 @@
+from src import research_agent
+
+
+class _FakeSource:
+    def __init__(self):
+        self.queries = []
+
+    def search(self, query, ort, umkreis, size=10):
+        self.queries.append((query, ort, umkreis))
+        return []
+
+
+def test_search_jobs_for_profiles_uses_profile_query(monkeypatch):
+    """Interaktive Suche fragt dieselben Begriffe ab wie Hintergrundsuche und Cache-Warm-up."""
+    source = _FakeSource()
+    profiles = [
+        {"id": 1, "name": "Profil 1 – KI-Enablement Manager"},
+        {"id": 2, "name": "Datenanalyst"},
+        {"id": 3, "name": None},
+    ]
+    monkeypatch.setattr(research_agent, "BAJobSource", lambda: source)
+    monkeypatch.setattr(research_agent, "load_active_user_profile", lambda: {"preferences_json": "{}"})
+    monkeypatch.setattr(research_agent, "load_profiles_for_user", lambda: profiles)
+
+    results = research_agent.search_jobs_for_profiles()
+
+    assert [q for q, _, _ in source.queries] == ["KI-Enablement Manager", "Datenanalyst", "Data Analyst"]
+    assert [q for q, _, _ in source.queries] == [research_agent.profile_query(p) for p in profiles]
+    assert [r["profile_name"] for r in results] == [
+        "Profil 1 – KI-Enablement Manager", "Datenanalyst", "Data Analyst",
+    ]
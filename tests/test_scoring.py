@@ -0,0 +1,222 @@
+import random
+import re
+
+import pytest
+
+from src.scoring import score_jobs
+
+# --------------------------------------------------
+# Eingefrorene Kopien der bisherigen Einzeljob-Formeln
+# (research_agent.compute_basescore / compute_basescore.compute_base_score vor src.scoring).
+# Einzige Anpassung: die Skill-Überlappung in der Begründung wird sortiert –
+# vorher hing ihre Reihenfolge vom Hash-Seed des Prozesses ab.
+# --------------------------------------------------
+
+STOPWORDS = {"und", "oder", "mit", "für", "der", "die", "das", "den", "dem", "ein", "eine", "in", "von",
+             "an", "im", "am", "auf", "bei", "zu", "aus", "per", "the", "of", "to"}
+ROLE_SYNONYMS = {
+    "berater": "consultant", "daten": "data", "wissenschaftler": "scientist",
+    "ingenieur": "engineer", "entwickler": "developer", "analyse": "analytics",
+    "analyst": "analyst", "architekt": "architect",
+}
+ROLES = {"consultant", "analyst", "architect", "engineer", "scientist", "developer"}
+NEGATIVE_LEVEL = {"werkstudent", "praktikum", "trainee"}
+POSITIVE_LEVEL = {"senior", "lead", "principal", "head"}
+
+
+def _norm(txt):
+    if not txt:
+        return ""
+    txt = txt.lower()
+    txt = txt.replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    txt = re.sub(r"[^a-z0-9+#]+", " ", txt)
+    return re.sub(r"\s+", " ", txt).strip()
+
+
+def _toks(txt):
+    return {ROLE_SYNONYMS.get(t, t) for t in _norm(txt).split(" ") if t and t not in STOPWORDS}
+
+
+def _jaccard(a, b):
+    return 0.0 if not a or not b else len(a & b) / len(a | b)
+
+
+def _profile_skills(profile):
+    skills_txt = profile.get("skills", "") or ""
+    skills = {s.strip().lower() for s in re.split(r"[;,/|]", skills_txt)} if skills_txt else set()
+    skills = {_norm(s) for s in skills if s}
+    return {ROLE_SYNONYMS.get(s, s) for s in skills if s}
+
+
+def old_research_basescore(job, profile):
+    title = job.get("title", "") or ""
+    location = job.get("location", "") or ""
+    summary = profile.get("summary", "") or ""
+    region = profile.get("region", "") or profile.get("preferred_region", "") or ""
+
+    t = _toks(title)
+    prof_skills = _profile_skills(profile)
+    summary_toks = _toks(summary)
+
+    skill_overlap = _jaccard(t, prof_skills | summary_toks)
+    role_match = 1.0 if ROLES & t else 0.0
+    location_match = 1.0 if (region and _norm(region) in _norm(location)) else (
+        0.5 if {"remote", "homeoffice", "home-office", "hybrid"} & (t | _toks(location)) else 0.0)
+
+    score = 0.55 * skill_overlap + 0.25 * role_match + 0.20 * location_match
+    score = max(0.0, min(1.0, score))
+
+    why = []
+    if skill_overlap >= 0.25:
+        overlap = sorted((t & (prof_skills | summary_toks)) - STOPWORDS)[:2]
+        why.append("Skills: " + ", ".join(overlap) if overlap else "Skills passen")
+    if role_match:
+        why.append("Rolle passt")
+    if location_match == 1.0:
+        why.append("Region passt")
+    elif location_match == 0.5:
+        why.append("Remote/Hybrid möglich")
+    if not why:
+        why = ["Basis-Match aus Titel/Ort"]
+    return round(score, 3), " · ".join(why)
+
+
+def old_cli_base_score(job, profile):
+    title = job.get("title", "") or ""
+    location = job.get("location", "") or ""
+    summary = profile.get("summary", "") or ""
+    region = profile.get("region", "") or profile.get("preferred_region", "") or ""
+
+    title_tokens = _toks(title)
+    ref_tokens = _profile_skills(profile) | (_toks(summary) if summary else set())
+    skill_overlap = _jaccard(title_tokens, ref_tokens)
+
+    role_match = 1.0 if ROLES & title_tokens else 0.0
+    prof_role_tokens = set()
+    for k in ("role", "target_role", "title", "name"):
+        if profile.get(k):
+            prof_role_tokens |= _toks(str(profile[k]))
+    if prof_role_tokens & title_tokens:
+        role_match = 1.0
+
+    location_match = 0.0
+    if region:
+        region_norm = _norm(region)
+        if region_norm and region_norm in _norm(location):
+            location_match = 1.0
+    remote = {"remote", "homeoffice", "home-office", "home", "hybrid"}
+    if remote & title_tokens or remote & _toks(location):
+        location_match = max(location_match, 0.5)
+
+    level_bonus = 0.0
+    if NEGATIVE_LEVEL & title_tokens:
+        level_bonus -= 0.25
+    if POSITIVE_LEVEL & title_tokens:
+        level_bonus += 0.05
+
+    score = 0.55 * skill_overlap + 0.25 * role_match + 0.15 * location_match + 0.05 * (level_bonus + 0.5)
+    score = max(0.0, min(1.0, float(score)))
+
+    why_bits = []
+    if skill_overlap >= 0.25:
+        overlap = sorted((title_tokens & ref_tokens) - STOPWORDS)
+        overlap = [o for o in overlap if o and o not in NEGATIVE_LEVEL][:2]
+        why_bits.append("Skills: " + ", ".join(overlap) if overlap else "Skills passen")
+    if role_match >= 1.0:
+        why_bits.append("Rolle passt")
+    if location_match >= 1.0:
+        why_bits.append("Region passt")
+    elif location_match >= 0.5:
+        why_bits.append("Remote/Hybrid möglich")
+    if level_bonus < 0:
+        why_bits.append("⚠️ Einstiegs-/Studierenden-Rolle")
+    elif level_bonus > 0.01:
+        why_bits.append("Senior/Lead möglich")
+    return score, " · ".join(why_bits or ["Basis-Match aus Titel/Ort"])
+
+
+# --------------------------------------------------
+# Fixture: feste Fälle + reproduzierbar zufällige Kombinationen
+# --------------------------------------------------
+TITLE_WORDS = [
+    "Data", "Daten", "Scientist", "Wissenschaftler", "Analyst", "Berater", "Consultant", "Entwickler",
+    "Python", "SQL", "Senior", "Lead", "Werkstudent", "Praktikum", "Trainee", "Head", "of", "und",
+    "Marketing", "Manager", "Ingenieur", "Architekt", "Cloud", "(m/w/d)", "Homeoffice", "Remote",
+    "Hybrid", "Bürokaufmann", "Sachbearbeiter", "für", "Projektleiter", "KI", "Analyse", "C++", "C#",
+]
+LOCATIONS = [
+    "Görlitz", "Berlin", "Dresden", "Leipzig", "München", "Remote", "Home-Office", "Berlin (Hybrid)",
+    "02826 Görlitz", "Köln / Homeoffice", "", "Frankfurt am Main", "Bad Homburg v. d. Höhe",
+]
+SKILLS = ["Python", "SQL", "Data", "Machine Learning", "Analyse", "Berater", "Cloud", "Marketing",
+          "C++", "Excel", "Projektleitung", "KI"]
+REGIONS = ["Görlitz", "Berlin", "Dresden", "", "Köln", "Frankfurt am Main", "Bad Homburg"]
+
+FIXED_JOBS = [
+    {"title": "Senior Data Scientist (m/w/d)", "location": "Berlin (Hybrid)"},
+    {"title": "Werkstudent Datenanalyse Python", "location": "02826 Görlitz"},
+    {"title": "Data Engineer", "location": "Dresden"},
+    {"title": "IT-Berater SAP", "location": "Remote"},
+    {"title": "Bürokaufmann / Bürokauffrau", "location": "Görlitz"},
+    {"title": "", "location": ""},
+    {"title": None, "location": None},
+]
+FIXED_PROFILES = [
+    {"name": "Data Scientist", "skills": "Python, SQL; Machine Learning", "summary": "Daten und Analyse",
+     "region": "Berlin"},
+    {"name": "Berater", "skills": "SAP/Beratung|Cloud", "preferred_region": "Görlitz"},
+    {"title": "Entwickler", "target_role": "Engineer", "skills": "", "summary": ""},
+    {},
+]
+
+
+def _random_cases(seed: int, n_profiles: int, n_jobs: int):
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(n_profiles):
+        p = {
+            "skills": rng.choice([", ", "; ", "/", " | "]).join(rng.sample(SKILLS, rng.randint(0, 5))),
+            "summary": " ".join(rng.sample(TITLE_WORDS, rng.randint(0, 6))),
+            rng.choice(["region", "preferred_region"]): rng.choice(REGIONS),
+        }
+        for key in ("name", "role", "target_role", "title"):
+            if rng.random() < 0.4:
+                p[key] = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 3)))
+        profiles.append(p)
+    jobs = [
+        {"title": " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 6))), "location": rng.choice(LOCATIONS)}
+        for _ in range(n_jobs)
+    ]
+    return profiles, jobs
+
+
+CASES = [(FIXED_PROFILES, FIXED_JOBS), _random_cases(7, 40, 150)]
+OLD_FORMULAS = {"research": old_research_basescore, "cli": old_cli_base_score}
+
+
+@pytest.mark.parametrize("preset", sorted(OLD_FORMULAS))
+@pytest.mark.parametrize("profiles, jobs", CASES)
+def test_score_jobs_matches_old_formula(preset, profiles, jobs):
+    old = OLD_FORMULAS[preset]
+    for profile in profiles:
+        res = score_jobs(jobs, profile, preset=preset)
+        for job, score, why in zip(jobs, res["score"].tolist(), res["why"]):
+            exp_score, exp_why = old(job, profile)
+            assert score == pytest.approx(exp_score, abs=1e-12), (preset, profile, job)
+            assert why == exp_why, (preset, profile, job)
+
+
+def test_research_empty_normalized_region_no_longer_matches():
+    """Dokumentierte Abweichung: eine Region, die leer normalisiert, zählt nicht mehr als Treffer."""
+    job = {"title": "Sachbearbeiter", "location": "Görlitz"}
+    profile = {"skills": "Excel", "region": " – "}
+
+    old_score, old_why = old_research_basescore(job, profile)
+    assert (old_score, old_why) == (0.2, "Region passt")
+
+    res = score_jobs([job], profile, preset="research")
+    assert res["location_match"][0] == 0.0
+    assert (float(res["score"][0]), res["why"][0]) == (0.0, "Basis-Match aus Titel/Ort")
+
+    # die cli-Formel hat leere Regionen schon immer ignoriert
+    assert old_cli_base_score(job, profile)[1] == score_jobs([job], profile, preset="cli")["why"][0]